@@ -1,64 +1,280 @@
-import os, json, base64, logging, asyncio, time, struct, re, html, unicodedata
+import time
+_IMPORT_T0 = time.perf_counter()
+import os, sys, gc, json, base64, logging, logging.handlers, queue, atexit, contextvars, random, weakref, hmac, asyncio, re, html, unicodedata, bisect, hashlib, importlib, threading, functools
+from collections import OrderedDict, deque, Counter
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from typing import Optional
 from dotenv import load_dotenv
-from quart import Quart, request, websocket
-from twilio.twiml.voice_response import VoiceResponse
-import azure.cognitiveservices.speech as speechsdk
-import httpx
 
-# ---- Excel (OpenPyXL) support ----
-try:
-    from openpyxl import Workbook, load_workbook
-    OPENPYXL_AVAILABLE = True
-except Exception:
-    OPENPYXL_AVAILABLE = False
+# ---------- Startup timing ----------
+# Import cost per phase, lazy imports as they happen, and time from process start to /ready.
+STARTUP = {"phases_ms": {}, "lazy_imports_ms": {}, "ready_ms": None}
+_phase_mark = [_IMPORT_T0]
+def _startup_phase(name: str):
+    now = time.perf_counter()
+    STARTUP["phases_ms"][name] = round((now - _phase_mark[0]) * 1000.0, 1)
+    _phase_mark[0] = now
+
+def _process_age_ms() -> float:
+    """Milliseconds since the OS started this process (Linux), else since this module was imported."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime_s = float(f.read().split()[0])
+        return (uptime_s - start_ticks / os.sysconf("SC_CLK_TCK")) * 1000.0
+    except Exception:
+        return (time.perf_counter() - _IMPORT_T0) * 1000.0
+
+_startup_phase("imports")
+
+# ---------- Lazy heavy dependencies ----------
+class _LazyModule:
+    """
+    Module proxy that imports on first attribute access. The warm-up task calls load() from a
+    worker thread right after the server starts, so calls normally find the module ready.
+    """
+    def __init__(self, name: str):
+        self._name = name
+        self._mod = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._mod is None:
+            with self._lock:
+                if self._mod is None:
+                    t0 = time.perf_counter()
+                    mod = importlib.import_module(self._name)
+                    STARTUP["lazy_imports_ms"][self._name] = round((time.perf_counter() - t0) * 1000.0, 1)
+                    self._mod = mod
+        return self._mod
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+speechsdk = _LazyModule("azure.cognitiveservices.speech")
+httpx = _LazyModule("httpx")
+_twiml = _LazyModule("twilio.twiml.voice_response")
+# ---- Excel (OpenPyXL) support: only needed once a lead is captured ----
+_openpyxl = _LazyModule("openpyxl")
+
+def VoiceResponse():
+    return _twiml.VoiceResponse()
+
+def _openpyxl_available() -> bool:
+    try:
+        _openpyxl.load(); return True
+    except Exception:
+        return False
+
+# ---------- Metrics (process-wide, exposed on /metrics) ----------
+METRICS: dict = {}
+def _metric_inc(name: str, n=1):
+    METRICS[name] = METRICS.get(name, 0) + n
+def _metric_observe(name: str, value: float):
+    m = METRICS.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+    m["count"] += 1; m["sum"] += value; m["max"] = max(m["max"], value)
 
 # ---------- Setup ----------
 load_dotenv()
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+_startup_phase("dotenv")
+
+# ---------- Logging pipeline ----------
+# The event loop only builds a LogRecord and puts it on a bounded queue; formatting and the
+# actual write happen on a listener thread. Inside a call, records carry callSid/turn; the ones
+# the handler does not write (below LOG_LEVEL down to LOG_RING_LEVEL, or dropped by the rate
+# limiter) are kept in a per-call ring buffer that is written out only if the call logs an error
+# or was sampled, so nothing is printed twice. Use %-style args so disabled levels cost nothing.
+LOG_LEVEL = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+# DEBUG buys more context on a flushed call, but every debug line then renders its dict args on the loop
+LOG_RING_LEVEL = getattr(logging, os.getenv("LOG_RING_LEVEL", "INFO").upper(), logging.INFO)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # text | json
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_RING_SIZE = int(os.getenv("LOG_RING_SIZE", "300"))
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.0"))  # fraction of calls whose ring is always written
+LOG_RATE_PER_S = float(os.getenv("LOG_RATE_PER_S", "5"))       # per message template, 0 = unlimited
+LOG_RATE_BURST = int(os.getenv("LOG_RATE_BURST", "20"))
+
+class CallLog:
+    """Per-call logging context: ids stamped on every record plus the ring buffer of unwritten records."""
+    __slots__ = ("call_sid", "turn", "ring", "errors", "sampled")
+    def __init__(self):
+        self.call_sid = "-"; self.turn = 0
+        self.ring = deque(maxlen=LOG_RING_SIZE) if LOG_RING_SIZE > 0 else None
+        self.errors = 0
+        self.sampled = random.random() < LOG_SAMPLE_RATE
+
+    def flush(self, reason: str = ""):
+        """Write out the buffered records (call errored or was sampled) and empty the ring."""
+        if not self.ring: return
+        reason = reason or ("error" if self.errors else "sampled" if self.sampled else "")
+        if not reason: self.ring.clear(); return
+        records = list(self.ring); self.ring.clear()
+        logger.warning("[LOG] %s: writing %d buffered records (%s)", self.call_sid, len(records), reason)
+        for rec in records:
+            # Copy: the original record may still be waiting in the queue for its normal write
+            rec = logging.makeLogRecord(rec.__dict__); rec.ring = True; _log_enqueue(rec)
+        _metric_inc("log_ring_flushes")
+
+_call_log: contextvars.ContextVar = contextvars.ContextVar("call_log", default=None)
+
+def _freeze_args(record: logging.LogRecord):
+    # Mutable args (e.g. the contact dict) are rendered now, or the listener would see later state
+    args = record.args
+    if not args: return
+    for a in (args if isinstance(args, tuple) else (args,)):
+        if isinstance(a, (dict, list, set)):
+            record.msg = record.getMessage(); record.args = None; return
+
+class _CallContextFilter(logging.Filter):
+    """Logger-level: stamps call ids and keeps records below LOG_LEVEL in the call's ring buffer."""
+    def filter(self, record):
+        cl = _call_log.get()
+        if cl is None:
+            record.call_sid = "-"; record.turn = 0; return True
+        record.call_sid = cl.call_sid; record.turn = cl.turn
+        if record.levelno >= logging.ERROR: cl.errors += 1
+        if cl.ring is not None and LOG_RING_LEVEL <= record.levelno < LOG_LEVEL:
+            _freeze_args(record); cl.ring.append(record)
+        return True
+
+class _RateLimitFilter(logging.Filter):
+    """Token bucket per call and message template; the next line that gets through reports what was dropped."""
+    def __init__(self, rate: float, burst: int):
+        super().__init__(); self.rate = rate; self.burst = burst
+        self._buckets: dict = {}  # template -> [tokens, last_t, suppressed]
+    def filter(self, record):
+        if self.rate <= 0: return True
+        key = (getattr(record, "call_sid", "-"), record.msg if isinstance(record.msg, str) else type(record.msg))
+        now = time.monotonic()
+        b = self._buckets.get(key)
+        if b is None:
+            if len(self._buckets) > 4096: self._buckets.clear()
+            b = self._buckets[key] = [float(self.burst), now, 0]
+        b[0] = min(float(self.burst), b[0] + (now - b[1]) * self.rate); b[1] = now
+        if b[0] < 1.0:
+            b[2] += 1; _metric_inc("log_rate_limited")
+            cl = _call_log.get()
+            if cl is not None and cl.ring is not None:
+                _freeze_args(record); cl.ring.append(record)  # not written now: keep it for a flush
+            return False
+        b[0] -= 1.0
+        if b[2]:
+            record.suppressed = b[2]; b[2] = 0
+        return True
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Leave formatting to the listener thread; third-party records get default call ids
+        _freeze_args(record)
+        if not hasattr(record, "call_sid"): record.call_sid = "-"; record.turn = 0
+        return record
+    def enqueue(self, record):
+        try: self.queue.put_nowait(record)
+        except queue.Full: _metric_inc("log_dropped")
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record):
+        line = super().format(record)
+        if getattr(record, "ring", False): line = "(ring) " + line
+        if getattr(record, "suppressed", 0): line += f" (+{record.suppressed} similar suppressed)"
+        return line
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record):
+        ev = {"ts": round(record.created, 3), "level": record.levelname, "logger": record.name,
+              "call": getattr(record, "call_sid", "-"), "turn": getattr(record, "turn", 0), "msg": record.getMessage()}
+        if getattr(record, "suppressed", 0): ev["suppressed"] = record.suppressed
+        if getattr(record, "ring", False): ev["ring"] = True
+        if record.exc_info: ev["exc"] = self.formatException(record.exc_info)
+        return json.dumps(ev, ensure_ascii=False)
+
+def _setup_logging():
+    q = queue.Queue(LOG_QUEUE_SIZE)
+    out = logging.StreamHandler()
+    out.setFormatter(_JsonFormatter() if LOG_FORMAT == "json" else
+                     _TextFormatter("%(asctime)s %(levelname)s [%(call_sid)s #%(turn)s] %(message)s"))
+    qh = _QueueHandler(q); qh.setLevel(LOG_LEVEL)
+    qh.addFilter(_RateLimitFilter(LOG_RATE_PER_S, LOG_RATE_BURST))
+    root = logging.getLogger(); root.handlers[:] = [qh]; root.setLevel(LOG_LEVEL)
+    listener = logging.handlers.QueueListener(q, out)
+    listener.start(); atexit.register(listener.stop)
+    return q, listener
+
+_log_queue, _log_listener = _setup_logging()
+def _log_enqueue(record: logging.LogRecord):
+    try: _log_queue.put_nowait(record)
+    except queue.Full: _metric_inc("log_dropped")
+
 logger = logging.getLogger("receptionist")
+logger.setLevel(min(LOG_LEVEL, LOG_RING_LEVEL) if LOG_RING_SIZE > 0 else LOG_LEVEL)
+logger.addFilter(_CallContextFilter())
+_startup_phase("logging")
+
+def _log_failure(what: str):
+    """Done-callback for fire-and-forget work (executor jobs): log its exception instead of losing it."""
+    def done(fut):
+        if not fut.cancelled() and fut.exception() is not None:
+            logger.error(f"{what} failed: {fut.exception()!r}")
+    return done
 
+from quart import Quart, request, websocket
 app = Quart(__name__)
+_startup_phase("quart")
 
 # ---------- μ-law helpers ----------
+# Inbound audio goes to Azure as μ-law (ASR_INGEST=mulaw) or expanded to 16-bit PCM (pcm). Either
+# way the hot path decodes through 256-entry tables; VAD reads energy straight off the μ-law bytes.
+ASR_INGEST = os.getenv("ASR_INGEST", "mulaw").strip().lower()  # mulaw | pcm
 MU_LAW_BIAS = 0x84
-EXP_LUT = [0,132,396,924,1980,4092,8316,16764]
 def mulaw_byte_to_pcm16(mu):
+    """G.711 μ-law expansion (same table as audioop.ulaw2lin)."""
     mu = ~mu & 0xFF
     sign = (mu & 0x80)
     exponent = (mu >> 4) & 0x07
     mantissa = mu & 0x0F
-    magnitude = EXP_LUT[exponent] + (mantissa << (exponent + 3))
-    sample = (magnitude - MU_LAW_BIAS)
-    if sign: sample = -sample
-    return max(-32768, min(32767, sample))
-def mulaw_b64_to_pcm16_bytes(b64):
-    raw = base64.b64decode(b64)
-    out = bytearray()
-    for b in raw:
-        s = mulaw_byte_to_pcm16(b)
-        out += int(s).to_bytes(2, "little", signed=True)
-    return bytes(out)
+    sample = (((mantissa << 3) + MU_LAW_BIAS) << exponent) - MU_LAW_BIAS
+    return -sample if sign else sample
+
+_PCM16_LE = [mulaw_byte_to_pcm16(b).to_bytes(2, "little", signed=True) for b in range(256)]
+# |sample| split into its high and low 7 bits, so a frame's energy is two translate() + sum() in C
+_ABS_HI = bytes(abs(mulaw_byte_to_pcm16(b)) >> 7 for b in range(256))
+_ABS_LO = bytes(abs(mulaw_byte_to_pcm16(b)) & 0x7F for b in range(256))
+
+def mulaw_to_pcm16(raw: bytes) -> bytes:
+    return b"".join(map(_PCM16_LE.__getitem__, raw))
+
+def mulaw_level(raw: bytes) -> float:
+    """Mean |sample| of a μ-law frame, without decoding it."""
+    if not raw: return 0.0
+    return (sum(raw.translate(_ABS_HI)) * 128 + sum(raw.translate(_ABS_LO))) / len(raw)
 
 # ---------- Simple VAD (adaptive) ----------
 _noise_floor = {"ema": 300.0}
-def is_speech(pcm16: bytes, margin=2.6):
-    if not pcm16:
-        return False
-    samples = struct.unpack("<" + "h"*(len(pcm16)//2), pcm16)
-    avg = sum(abs(s) for s in samples) / max(1, len(samples))
+def _vad_decide(avg: float, margin: float) -> bool:
     ema = _noise_floor["ema"] = 0.95 * _noise_floor["ema"] + 0.05 * avg
     thresh = ema * margin + 180
     return avg > thresh
 
+def is_speech_mulaw(raw: bytes, margin=2.6):
+    """Energy-only VAD on the raw μ-law frame (no PCM expansion)."""
+    if not raw:
+        return False
+    return _vad_decide(mulaw_level(raw), margin)
+
 # ---------- LLM client (HTTP/2) ----------
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-httpx_timeout = httpx.Timeout(connect=4.0, read=20.0, write=10.0, pool=4.0)
-httpx_client = httpx.AsyncClient(http2=True, timeout=httpx_timeout, headers={
-    "Authorization": f"Bearer {OPENAI_API_KEY}",
-})
+_llm_client = None
+def llm_http():
+    """Shared HTTP/2 client for the LLM, created on first use (the warm-up opens its connection)."""
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = httpx.AsyncClient(
+            http2=True, timeout=httpx.Timeout(connect=4.0, read=20.0, write=10.0, pool=4.0),
+            headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+        )
+    return _llm_client
 
 # ---------- Env helpers (UTF-8 safe) ----------
 def _env_text(name: str, default: Optional[str] = None) -> Optional[str]:
@@ -86,27 +302,422 @@ def _parse_env_list(var_name: str):
             logger.warning(f"[ENV] {var_name} JSON parse failed; falling back to CSV split.")
     return [x.strip() for x in val.split(",") if x.strip()]
 
+# ---------- Appointment slot engine ----------
+_WEEKDAYS_EN = ("monday","tuesday","wednesday","thursday","friday","saturday","sunday")
+SLOT_JOB_MIN = int(os.getenv("SLOT_JOB_MIN", "60"))
+SLOT_STEP_MIN = int(os.getenv("SLOT_STEP_MIN", "30"))
+SLOT_DAYS_OFFERED = int(os.getenv("SLOT_DAYS_OFFERED", "3"))
+_SLOT_EPOCH = datetime(2000, 1, 1)
+
+def _munich_tz():
+    try:
+        return ZoneInfo("Europe/Berlin")
+    except Exception:
+        return None
+
+def _to_min(dt: datetime) -> int:
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(_munich_tz())  # the calendar is in workshop wall-clock time
+    return int((dt.replace(tzinfo=None) - _SLOT_EPOCH).total_seconds() // 60)
+
+def _from_min(m: int) -> datetime:
+    return _SLOT_EPOCH + timedelta(minutes=m)
+
+class SlotEngine:
+    """
+    In-process workshop calendar built from the hours and rules in business_info.
+    Each mechanic has an interval index: two parallel sorted lists (starts, ends) of
+    non-overlapping bookings in minutes, buffer included. Conflict checks are one bisect,
+    free-slot search is a bisect plus a walk over that day's bookings. Past days are pruned
+    incrementally when the date rolls over, and the prompt summary is cached per
+    (date, calendar version) so building a turn's prompt costs nothing.
+    """
+    def __init__(self, business_info: str):
+        self._starts: dict = {}; self._ends: dict = {}
+        self._details: dict = {}  # (mechanic, start minute) -> who booked it (call_sid, name, phone)
+        self.buffer_min = None; self.version = 0
+        self.set_rules(business_info)
+        self.today = None
+        self._summary_key = None; self._summary = ""
+        self.path: Optional[str] = None
+        self._save_lock = threading.Lock(); self._saved_version = -1
+
+    def set_rules(self, business_info: str):
+        """(Re)read hours, mechanics and buffer from business_info; the bookings are kept."""
+        info = business_info or ""
+        hours_line = next((l for l in info.splitlines() if l.lower().startswith("business hours:")), "")
+        self.windows = [(int(h1) * 60 + int(m1), int(h2) * 60 + int(m2))
+                        for h1, m1, h2, m2 in re.findall(r"(\d{1,2}):(\d{2})\s*[–—-]\s*(\d{1,2}):(\d{2})", hours_line)]
+        if not self.windows:
+            self.windows = [(7 * 60 + 30, 12 * 60), (13 * 60, 17 * 60 + 30)]
+        m = re.search(r"(" + "|".join(_WEEKDAYS_EN) + r")\s*[–—-]\s*(" + "|".join(_WEEKDAYS_EN) + r")", hours_line, re.I)
+        self.workdays = set(range(_WEEKDAYS_EN.index(m.group(1).lower()), _WEEKDAYS_EN.index(m.group(2).lower()) + 1)) if m else set(range(5))
+        m = re.search(r"(\d+)\s*-?\s*minute buffer", info, re.I)
+        buffer_min = int(m.group(1)) if m else 10
+        m = re.search(r"(\d+)\s+mechanics?\s*\(([^)]*)\)", info, re.I)
+        names = [n.strip() for n in m.group(2).split(",") if n.strip()] if m else []
+        count = int(m.group(1)) if m else 1
+        self.mechanics = (names + [f"Mechanic {i + 1}" for i in range(len(names), count)])[:max(count, 1)]
+        m = re.search(r"Propose slots (\d+)", info, re.I)
+        self.lead_business_days = int(m.group(1)) if m else 3
+        for mech in self.mechanics:
+            self._starts.setdefault(mech, []); self._ends.setdefault(mech, [])
+        if self.buffer_min is not None and buffer_min != self.buffer_min:
+            self._ends = {mech: [e + buffer_min - self.buffer_min for e in ends] for mech, ends in self._ends.items()}
+        self.buffer_min = buffer_min
+        self.business_info = info
+        self.version += 1
+
+    # --- index primitives ---
+    def _is_free(self, mech: str, start: int, end: int) -> bool:
+        starts, ends = self._starts[mech], self._ends[mech]
+        i = bisect.bisect_left(starts, end)  # first booking starting at/after our end
+        return i == 0 or ends[i - 1] <= start
+
+    def _in_hours(self, start: int, end: int) -> bool:
+        day = _from_min(start)
+        if day.weekday() not in self.workdays: return False
+        base = _to_min(day.replace(hour=0, minute=0))
+        return any(base + w0 <= start and end <= base + w1 for w0, w1 in self.windows)
+
+    def book(self, start: datetime, minutes: int = SLOT_JOB_MIN, mechanic: Optional[str] = None,
+             details: Optional[dict] = None) -> Optional[str]:
+        """Book `minutes` (+ buffer) at `start`; returns the mechanic, or None on conflict / outside hours."""
+        s = _to_min(start); e = s + minutes + self.buffer_min
+        if not self._in_hours(s, s + minutes):
+            return None
+        for mech in ([mechanic] if mechanic else self.mechanics):
+            if mech in self._starts and self._is_free(mech, s, e):
+                i = bisect.bisect_left(self._starts[mech], s)
+                self._starts[mech].insert(i, s); self._ends[mech].insert(i, e)
+                if details: self._details[(mech, s)] = dict(details)
+                self.version += 1
+                return mech
+        return None
+
+    def annotate(self, start: datetime, mechanic: str, **fields):
+        """Add details (e.g. the caller's name, learned after the booking) to an existing booking."""
+        key = (mechanic, _to_min(start))
+        fields = {k: v for k, v in fields.items() if v}
+        if fields and self._details.get(key, {}).items() >= fields.items(): return
+        self._details.setdefault(key, {}).update(fields); self.version += 1
+
+    def free_slots(self, day, minutes: int = SLOT_JOB_MIN, limit: Optional[int] = None):
+        """Start times (on the SLOT_STEP_MIN grid) on `day` where any mechanic can take a `minutes` job."""
+        if day.weekday() not in self.workdays: return []
+        base = _to_min(datetime(day.year, day.month, day.day))
+        need = minutes + self.buffer_min
+        found = {}
+        for mech in self.mechanics:
+            starts, ends = self._starts[mech], self._ends[mech]
+            for w0, w1 in self.windows:
+                t, w_end = base + w0, base + w1
+                i = bisect.bisect_right(ends, t)  # first booking that ends after t
+                while t + minutes <= w_end:
+                    if i < len(starts) and starts[i] < t + need:
+                        # Collides with booking i: jump past it, realigned to the slot grid
+                        t = base + -(-(ends[i] - base) // SLOT_STEP_MIN) * SLOT_STEP_MIN; i += 1
+                        continue
+                    found.setdefault(t, mech); t += SLOT_STEP_MIN
+        return [(_from_min(t), found[t]) for t in sorted(found)[:limit]]
+
+    @staticmethod
+    def _ranges(starts) -> str:
+        """Collapse grid-adjacent start times into 'HH:MM–HH:MM' ranges."""
+        out, run = [], []
+        for t in starts:
+            if run and t - run[-1] != timedelta(minutes=SLOT_STEP_MIN):
+                out.append(run); run = []
+            run.append(t)
+        if run: out.append(run)
+        return ", ".join(r[0].strftime("%H:%M") if len(r) == 1 else f"{r[0]:%H:%M}–{r[-1]:%H:%M}" for r in out)
+
+    # --- day rollover ---
+    def roll(self, today):
+        """Drop bookings that ended before `today`; cheap no-op when the date hasn't changed."""
+        if today == self.today: return
+        self.today = today
+        cutoff = _to_min(datetime(today.year, today.month, today.day))
+        for mech in self._starts:  # includes mechanics dropped from business_info since
+            i = bisect.bisect_right(self._ends[mech], cutoff)
+            if i:
+                for st in self._starts[mech][:i]: self._details.pop((mech, st), None)
+                del self._starts[mech][:i]; del self._ends[mech][:i]
+        self.version += 1
+
+    def offer_days(self, today):
+        d, n = today, 0
+        while n < self.lead_business_days:
+            d += timedelta(days=1)
+            if d.weekday() in self.workdays: n += 1
+        days = []
+        while len(days) < SLOT_DAYS_OFFERED:
+            if d.weekday() in self.workdays: days.append(d)
+            d += timedelta(days=1)
+        return days
+
+    def summary(self) -> str:
+        """Compact availability block for the system prompt (cached per date and calendar version)."""
+        tz = _munich_tz()
+        today = datetime.now(tz).date() if tz else datetime.now().date()
+        self.roll(today)
+        key = (today, self.version)
+        if key == self._summary_key:
+            return self._summary
+        lines = [f"Live appointment availability (free start times for a {SLOT_JOB_MIN}-min job, {self.buffer_min}-min buffer included, no same-day):"]
+        for d in self.offer_days(today):
+            times = self._ranges([t for t, _m in self.free_slots(d)]) or "fully booked"
+            lines.append(f"- {d.strftime('%A %d %B %Y')}: {times}")
+        self._summary_key, self._summary = key, "\n".join(lines)
+        return self._summary
+
+    def load_bookings(self, path: str):
+        """
+        Optional JSON list of {"start": ISO datetime, "minutes": int, "mechanic": str} to seed the
+        calendar; any other fields (call_sid, name, phone) are kept with the booking.
+        """
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"[SLOTS] Failed to load {path}: {e}"); return
+        if not isinstance(items, list):
+            logger.error(f"[SLOTS] {path}: expected a JSON list of bookings, got {type(items).__name__}"); return
+        ok = 0
+        for n, it in enumerate(items):
+            try:
+                details = {k: v for k, v in it.items() if k not in ("start", "minutes", "mechanic")}
+                ok += bool(self.book(datetime.fromisoformat(it["start"]), int(it.get("minutes", SLOT_JOB_MIN)), it.get("mechanic"), details))
+            except (TypeError, ValueError, KeyError, AttributeError) as e:
+                logger.warning(f"[SLOTS] {path}: skipping booking #{n} ({e!r}): {it!r:.120}")
+        logger.info(f"[SLOTS] Loaded {ok}/{len(items)} bookings from {path}")
+
+    def dump(self) -> tuple:
+        """(version, JSON bytes) of the current bookings, in the load_bookings format."""
+        items = [{"start": _from_min(st).isoformat(timespec="minutes"), "minutes": en - st - self.buffer_min, "mechanic": mech,
+                  **self._details.get((mech, st), {})}
+                 for mech in self._starts for st, en in zip(self._starts[mech], self._ends[mech])]
+        items.sort(key=lambda it: it["start"])
+        return self.version, json.dumps(items, ensure_ascii=False, indent=1).encode("utf-8")
+
+    def write(self, version: int, data: bytes):
+        """Persist a dump() to the bookings file (atomic rename); older snapshots never overwrite newer ones."""
+        if not self.path: return
+        with self._save_lock:
+            if version <= self._saved_version: return
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+            self._saved_version = version
+
+# One live calendar per bookings file, shared by every compile generation of the profiles using it:
+# a profile reload swaps prompt and rules but never re-reads (and so never forks) the calendar.
+_slot_engines: dict = {}
+_slot_engines_lock = threading.Lock()  # profiles compile in worker threads
+
+def _slot_engine(path: str, business_info: str) -> SlotEngine:
+    with _slot_engines_lock:
+        eng = _slot_engines.get(os.path.abspath(path))
+        if eng is None:
+            eng = _slot_engines[os.path.abspath(path)] = SlotEngine(business_info)
+            eng.load_bookings(path)
+        return eng
+
+# ---------- Precompiled artifacts ----------
+# Content-addressed files under PRECOMPILED_DIR (synthesized audio). The key
+# covers every input, so a stale artifact is never read; writes are atomic via rename.
+PRECOMPILED_DIR = os.getenv("PRECOMPILED_DIR", ".precompiled")
+ARTIFACT_VERSION = 1
+
+def artifact_load(kind: str, key: str) -> Optional[bytes]:
+    try:
+        with open(os.path.join(PRECOMPILED_DIR, f"{kind}-{key}"), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def artifact_save(kind: str, key: str, data: bytes):
+    path = os.path.join(PRECOMPILED_DIR, f"{kind}-{key}")
+    try:
+        os.makedirs(PRECOMPILED_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"[ARTIFACT] Could not write {path}: {e}")
+
+# ---------- Speech endpoints (multi-region routing) ----------
+# AZURE_SPEECH_ENDPOINTS is a JSON list of {"name", "region", "key"} (or "host" for a container or
+# local endpoint); without it the single AZURE_SPEECH_KEY/AZURE_SPEECH_REGION pair is used. Each
+# call's recognizer and synthesizer go to the endpoint with the best latency/health score; a
+# cancelled or silent synthesis, or a recognizer error, moves that part of the call elsewhere.
+SPEECH_BREAKER_FAILS = int(os.getenv("SPEECH_BREAKER_FAILS", "3"))
+SPEECH_BREAKER_COOLDOWN_S = float(os.getenv("SPEECH_BREAKER_COOLDOWN_S", "30"))
+SPEECH_EXPLORE = float(os.getenv("SPEECH_EXPLORE", "0.05"))      # share of picks that go to another healthy endpoint
+SPEECH_TTFC_TIMEOUT_S = float(os.getenv("SPEECH_TTFC_TIMEOUT_S", "3"))  # no first audio chunk by then: fail over
+SPEECH_FAILOVERS_PER_CALL = int(os.getenv("SPEECH_FAILOVERS_PER_CALL", "3"))
+
+class SpeechEndpoint:
+    """
+    One Azure Speech resource. Latency per kind ("tts": synthesis time to first chunk, "asr":
+    end of caller speech to final result) is tracked as EWMA mean + mean deviation like
+    LLMEndpoint; consecutive failures open a circuit for SPEECH_BREAKER_COOLDOWN_S.
+    """
+    def __init__(self, name: str, region: Optional[str] = None, key: Optional[str] = None, host: Optional[str] = None):
+        self.name, self.region, self.key, self.host = name, region, key, host
+        self.lat: dict = {}  # kind -> [ewma_ms, dev_ms]
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.picks = 0
+
+    def speech_config(self):
+        if self.host:
+            return speechsdk.SpeechConfig(host=self.host, subscription=self.key) if self.key else speechsdk.SpeechConfig(host=self.host)
+        return speechsdk.SpeechConfig(subscription=self.key, region=self.region)
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    def record_latency(self, kind: str, ms: float):
+        est = self.lat.get(kind)
+        if est is None:
+            self.lat[kind] = [ms, ms / 2]
+        else:
+            est[1] = 0.75 * est[1] + 0.25 * abs(ms - est[0])
+            est[0] = 0.875 * est[0] + 0.125 * ms
+        _metric_observe(f"speech_{kind}_ms.{self.name}", ms)
+
+    def record_success(self):
+        if self.consecutive_failures >= SPEECH_BREAKER_FAILS:
+            logger.info("[SPEECH] %s: circuit closed again", self.name)
+        self.consecutive_failures = 0; self.open_until = 0.0
+
+    def record_failure(self, kind: str, err):
+        self.consecutive_failures += 1
+        _metric_inc(f"speech_{kind}_errors.{self.name}")
+        if self.consecutive_failures >= SPEECH_BREAKER_FAILS and self.available():
+            self.open_until = time.monotonic() + SPEECH_BREAKER_COOLDOWN_S
+            _metric_inc(f"speech_breaker_open.{self.name}")
+            logger.warning("[SPEECH] %s: circuit open for %.0fs after %d failures (%s)",
+                           self.name, SPEECH_BREAKER_COOLDOWN_S, self.consecutive_failures, err)
+
+    def score(self, kind: str) -> float:
+        """
+        Expected latency in ms, pessimistic (mean + 4 deviations), plus a penalty per recent failure.
+        An endpoint without samples scores 0 so it gets measured before it is ranked.
+        """
+        est = self.lat.get(kind)
+        base = est[0] + 4 * est[1] if est else 0.0
+        return base + 1000.0 * self.consecutive_failures
+
+    def stats(self) -> dict:
+        return {"region": self.region or self.host, "available": self.available(), "picks": self.picks,
+                "failures": self.consecutive_failures,
+                **{f"{k}_ms": round(v[0]) for k, v in self.lat.items()},
+                **{f"{k}_score": round(self.score(k)) for k in ("asr", "tts")}}
+
+class SpeechRouter:
+    def __init__(self, endpoints: list):
+        self.endpoints = endpoints
+
+    def pick(self, kind: str, exclude=()) -> SpeechEndpoint:
+        if not self.endpoints:
+            raise RuntimeError("Missing AZURE_SPEECH_KEY / AZURE_SPEECH_REGION (or AZURE_SPEECH_ENDPOINTS)")
+        others = [e for e in self.endpoints if e not in exclude] or self.endpoints
+        cands = [e for e in others if e.available()] or others
+        if len(cands) > 1 and random.random() < SPEECH_EXPLORE:
+            ep = random.choice(cands)  # keeps the other endpoints' latency fresh
+        else:
+            ep = min(cands, key=lambda e: (e.score(kind), e.picks))  # ties (unmeasured) round-robin
+        ep.picks += 1
+        return ep
+
+    def stats(self) -> dict:
+        return {e.name: e.stats() for e in self.endpoints}
+
+def _speech_endpoints_from_env() -> list:
+    raw = os.getenv("AZURE_SPEECH_ENDPOINTS", "").strip()
+    if raw:
+        try:
+            return [SpeechEndpoint(str(c.get("name") or c.get("region") or c.get("host") or i),
+                                   c.get("region"), c.get("key"), c.get("host"))
+                    for i, c in enumerate(json.loads(raw)) if c.get("host") or (c.get("region") and c.get("key"))]
+        except Exception as e:
+            logger.error(f"[SPEECH] AZURE_SPEECH_ENDPOINTS is not valid JSON ({e}); using AZURE_SPEECH_KEY/REGION")
+    key, region = os.getenv("AZURE_SPEECH_KEY"), os.getenv("AZURE_SPEECH_REGION")
+    return [SpeechEndpoint(region, region, key)] if key and region else []
+
+speech_router = SpeechRouter(_speech_endpoints_from_env())
+
 # ---------- Core ----------
 class LowLatencyReceptionist:
-    def __init__(self):
-        self.business_info = self._load_business_info()
-        self.business_info = self._inject_dynamic_date_context(self.business_info)
+    """
+    One compiled business profile: knowledge, prompt, slot engine, phrase list, voice.
+    The default profile is configured from env; tenant profiles (see TenantRegistry) pass a
+    config dict whose keys override the matching env vars.
+    """
+    def __init__(self, name: str = "default", config: Optional[dict] = None):
+        t0 = time.perf_counter()
+        self.name = name
+        self.config = dict(config or {})
+        self.business_info_file = self._cfg("business_info_file", "BUSINESS_INFO_FILE", "business_info.txt")
+
+        art = self._compile()
+        self.business_info, self.base_system_prompt, self.phrases = art["business_info"], art["base_system_prompt"], art["phrases"]
+        # Availability is computed per turn by the slot engine; its rules follow business_info on
+        # reload (see TenantRegistry._put) but its bookings live as long as the process
+        self.raw_business_info = art["raw_business_info"]
+        self.slots = _slot_engine(_bookings_path(name, self.config), self.raw_business_info)
+        # Returning callers are per tenant: a number known to one business means nothing to another
+        self.callers = _caller_directory(_callers_path(name, self.config))
+
+        self.voice = self._cfg("voice", "AZURE_TTS_VOICE", "de-DE-KatjaNeural")
+        self.asr_ingest = (self.config.get("asr_ingest") or ASR_INGEST).lower()
+        self.greeting = self.config.get("greeting") if self.config.get("greeting") is not None else _env_text("GREETING")
+        # Optional; "{name}" is replaced with the known caller's name
+        self.returning_greeting = self.config.get("returning_greeting") or _env_text("RETURNING_GREETING")
+        # Keyed by what determines the audio, not by compile generation: warm caches survive a reload
+        self.tts_cache_ns = f"{self.voice}|{os.getenv('AZURE_TTS_RATE', '+25%')}"
+        self.sources = {self.business_info_file: _mtime(self.business_info_file)}
+
+        self.compile_ms = (time.perf_counter() - t0) * 1000.0
+        self.approx_bytes = sum(sys.getsizeof(x) for x in (self.business_info, self.base_system_prompt, *self.phrases))
+        _metric_observe("tenant_compile_ms", self.compile_ms)
+        logger.info(f"[PROMPT] {name}: base_system_prompt chars={len(self.base_system_prompt)} "
+                    f"compiled in {self.compile_ms:.1f} ms (~{self.approx_bytes // 1024} KB)")
+
+    def _compile(self) -> dict:
+        raw_info = self._load_business_info()
+        business_info = self._inject_dynamic_date_context(raw_info)
 
         # Optional clamp to avoid very large prompts hurting latency
         MAX_BIZ = int(os.getenv("BUSINESS_INFO_MAX_CHARS", "12000"))
-        if len(self.business_info) > MAX_BIZ:
-            logger.warning(f"[PROMPT] BUSINESS_INFO truncated from {len(self.business_info)} to {MAX_BIZ} chars")
-            self.business_info = self.business_info[:MAX_BIZ]
+        if len(business_info) > MAX_BIZ:
+            logger.warning(f"[PROMPT] BUSINESS_INFO truncated from {len(business_info)} to {MAX_BIZ} chars")
+            business_info = business_info[:MAX_BIZ]
 
-        # BASE_SYSTEM_PROMPT comes ONLY from env; expand placeholders
-        raw = _env_text("BASE_SYSTEM_PROMPT", "") or ""
-        raw = raw.replace("{BUSINESS_INFO}", self.business_info)
-        raw = raw.replace("{COMPANY_NAME}", self._company_name())
-        self.base_system_prompt = raw
-        logger.info(f"[PROMPT] base_system_prompt chars={len(self.base_system_prompt)}")
+        # BASE_SYSTEM_PROMPT comes from env (or the tenant config); expand placeholders
+        raw = self.config.get("base_system_prompt")
+        if raw is None:
+            raw = _env_text("BASE_SYSTEM_PROMPT", "") or ""
+        raw = raw.replace("{BUSINESS_INFO}", business_info)
+        raw = raw.replace("{COMPANY_NAME}", self._company_name(business_info))
+
+        phrases = self.config.get("custom_phrases")
+        phrases = [str(p).strip() for p in phrases if str(p).strip()] if phrases is not None else _parse_env_list("CUSTOM_PHRASES")
+        return {"raw_business_info": raw_info, "business_info": business_info, "base_system_prompt": raw, "phrases": phrases}
+
+    def _cfg(self, key: str, env_name: str, default: str) -> str:
+        val = self.config.get(key)
+        return str(val) if val not in (None, "") else os.getenv(env_name, default)
 
     def _load_business_info(self):
-        fn = os.getenv("BUSINESS_INFO_FILE", "business_info.txt")
+        fn = self.business_info_file
         try:
             with open(fn, "r", encoding="utf-8") as f:
                 return f.read()
@@ -116,40 +727,12 @@ class LowLatencyReceptionist:
 
     def _inject_dynamic_date_context(self, text: str) -> str:
         """
-        Replace the 'Appointment availability:' line in business_info with
-        dynamic dates based on today's date in Munich.
-
-        We do NOT allow same-day appointments: the first date is at least
-        three business days in the future (respecting weekends), then the
-        following two business days.
+        Replace the static 'Appointment availability:' line in business_info with a
+        pointer to the live availability block that build_system_prompt_with_memory
+        appends on every turn (see SlotEngine.summary). Dates computed here at startup
+        would go stale after midnight in a long-running worker.
         """
-        try:
-            tz = ZoneInfo("Europe/Berlin")
-        except Exception:
-            tz = None
-
-        today = datetime.now(tz).date() if tz else datetime.now().date()
-
-        def _next_business_day(d):
-            # 0=Monday, 6=Sunday; skip Saturday/Sunday
-            while d.weekday() >= 5:
-                d += timedelta(days=1)
-            return d
-
-        # Earliest slot: at least 3 business days ahead of "today"
-        base = today + timedelta(days=3)
-        d1 = _next_business_day(base)
-        d2 = _next_business_day(d1 + timedelta(days=1))
-        d3 = _next_business_day(d2 + timedelta(days=1))
-
-        def _fmt(d):
-            # Example: "Tuesday 24 February 2026"
-            return d.strftime("%A %d %B %Y")
-
-        new_line = (
-            "Appointment availability: "
-            f"{_fmt(d1)}, {_fmt(d2)}, {_fmt(d3)}"
-        )
+        new_line = "Appointment availability: use the live appointment availability listed in the call context below."
 
         # If the marker line exists, replace it; otherwise append at the end.
         if "Appointment availability:" in text:
@@ -157,28 +740,37 @@ class LowLatencyReceptionist:
         else:
             return text.rstrip() + "\n" + new_line + "\n"
 
-    def _company_name(self):
-        for line in self.business_info.splitlines():
+    def _company_name(self, business_info: str):
+        for line in business_info.splitlines():
             if "Company Name:" in line:
                 return line.split("Company Name:")[1].strip()
         return "our company"
 
-    def make_asr(self):
-        key, region = os.getenv("AZURE_SPEECH_KEY"), os.getenv("AZURE_SPEECH_REGION")
-        if not key or not region:
-            raise RuntimeError("Missing AZURE_SPEECH_KEY / AZURE_SPEECH_REGION")
-        speech_config = speechsdk.SpeechConfig(subscription=key, region=region)
+    def make_asr(self, ep: Optional[SpeechEndpoint] = None):
+        ep = ep or speech_router.pick("asr")
+        speech_config = ep.speech_config()
         speech_config.speech_recognition_language = "de-DE"
         speech_config.set_property(speechsdk.PropertyId.SpeechServiceConnection_EndSilenceTimeoutMs, "200")
         speech_config.set_property(speechsdk.PropertyId.SpeechServiceConnection_InitialSilenceTimeoutMs, "5000")
-        fmt = speechsdk.audio.AudioStreamFormat(samples_per_second=8000, bits_per_sample=16, channels=1)
+        fmt = None
+        if self.asr_ingest == "mulaw":
+            try:
+                # Twilio's payload as-is: half the bytes of PCM, no expansion on our side
+                fmt = speechsdk.audio.AudioStreamFormat(samples_per_second=8000, bits_per_sample=8, channels=1,
+                                                        wave_stream_format=speechsdk.audio.AudioStreamWaveFormat.MULAW)
+            except (AttributeError, TypeError) as e:
+                logger.warning("[ASR] μ-law stream format unavailable (%s); falling back to PCM ingest", e)
+                self.asr_ingest = "pcm"
+        if fmt is None:
+            fmt = speechsdk.audio.AudioStreamFormat(samples_per_second=8000, bits_per_sample=16, channels=1)
         push_stream = speechsdk.audio.PushAudioInputStream(fmt)
         audio_in = speechsdk.audio.AudioConfig(stream=push_stream)
         recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_in)
+        recognizer.speech_endpoint = ep
 
-        # CUSTOM_PHRASES ONLY from env
+        # CUSTOM_PHRASES from env (or the tenant config), parsed once per profile
         try:
-            phrases = _parse_env_list("CUSTOM_PHRASES")
+            phrases = self.phrases
             logger.info(f"[ASR] Loaded {len(phrases)} custom phrases: {phrases[:10]}")
             if phrases:
                 phrase_list = speechsdk.PhraseListGrammar.from_recognizer(recognizer)
@@ -188,19 +780,225 @@ class LowLatencyReceptionist:
             logger.warning(f"Could not add custom phrases to ASR: {e}")
         return recognizer, push_stream
 
-    def make_tts(self):
-        key, region = os.getenv("AZURE_SPEECH_KEY"), os.getenv("AZURE_SPEECH_REGION")
-        if not key or not region:
-            raise RuntimeError("Missing AZURE_SPEECH_KEY / AZURE_SPEECH_REGION")
-        speech_config = speechsdk.SpeechConfig(subscription=key, region=region)
+    def make_tts(self, ep: Optional[SpeechEndpoint] = None):
+        ep = ep or speech_router.pick("tts")
+        speech_config = ep.speech_config()
         speech_config.set_speech_synthesis_output_format(
             speechsdk.SpeechSynthesisOutputFormat.Raw8Khz8BitMonoMULaw
         )
-        speech_config.speech_synthesis_voice_name = os.getenv("AZURE_TTS_VOICE", "de-DE-KatjaNeural")
+        speech_config.speech_synthesis_voice_name = self.voice
         synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+        synthesizer.speech_endpoint = ep
         return synthesizer
 
-state = LowLatencyReceptionist()
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+# ---------- Tenant profiles (multi-tenant routing) ----------
+TENANTS_FILE = os.getenv("TENANTS_FILE", "tenants.json")
+TENANT_CACHE_SIZE = int(os.getenv("TENANT_CACHE_SIZE", "8"))
+TENANT_RELOAD_CHECK_S = float(os.getenv("TENANT_RELOAD_CHECK_S", "5"))
+DEFAULT_TENANT = "default"
+
+def _tenant_file(tenant: str, config: Optional[dict], key: str, default: str) -> str:
+    """config[key], else `default` for the default tenant and <default stem>-<tenant><ext> beside it for others."""
+    if (config or {}).get(key):
+        return str(config[key])
+    if tenant == DEFAULT_TENANT:
+        return default
+    root, ext = os.path.splitext(default)
+    safe = re.sub(r"[^\w.-]", "_", tenant)
+    return f"{root}-{safe}{ext}"
+
+def _bookings_path(tenant: str, config: Optional[dict]) -> str:
+    return _tenant_file(tenant, config, "bookings_file", os.getenv("SLOT_BOOKINGS_FILE", "bookings.json"))
+
+def _callers_path(tenant: str, config: Optional[dict]) -> str:
+    return _tenant_file(tenant, config, "caller_directory_file", CALLER_DIRECTORY_FILE)
+
+def _number_key(number: Optional[str]) -> str:
+    digits = re.sub(r"\D", "", number or "")
+    return digits[2:] if digits.startswith("00") else digits
+
+class TenantRegistry:
+    """
+    Routes a called number (Twilio `To`) to a tenant profile.
+
+    TENANTS_FILE is JSON: {"<tenant>": {"numbers": ["+4989..."], "business_info_file": ...,
+    "bookings_file": ..., "base_system_prompt": ..., "custom_phrases": [...], "voice": ...,
+    "caller_directory_file": ..., "greeting": ...}}. Without "bookings_file" a tenant books into
+    bookings-<tenant>.json next to SLOT_BOOKINGS_FILE, and without "caller_directory_file" its leads
+    go to Record-<tenant>.xlsx next to CALLER_DIRECTORY_FILE; two tenants may not share either file.
+    Profiles are compiled on first use and held in a bounded LRU. Source files (the tenant
+    file and each profile's business_info) are re-stat'ed at most every TENANT_RELOAD_CHECK_S;
+    a change recompiles the profile in a worker thread while callers keep getting the current
+    one, then swaps it in with one assignment on the loop, so live calls keep the profile they
+    started with and nobody waits for a compile. The calendar is not a source: every generation
+    of a profile books into the same SlotEngine, which owns its bookings file while we run.
+    """
+    def __init__(self, path: str, capacity: int):
+        self.path = path
+        self.capacity = max(1, capacity)
+        self._configs: dict = {}
+        self._routes: dict = {}
+        self._routes_mtime: Optional[float] = None
+        self._routes_checked = 0.0
+        self._cache: "OrderedDict[str, LowLatencyReceptionist]" = OrderedDict()
+        self._checked: dict = {}
+        self._reloading: set = set()
+
+    def _refresh_routes(self):
+        now = time.monotonic()
+        if self._routes_checked and now - self._routes_checked < TENANT_RELOAD_CHECK_S:
+            return
+        self._routes_checked = now
+        mt = _mtime(self.path)
+        if mt == self._routes_mtime:
+            return
+        configs = {}
+        if mt is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    configs = json.load(f)
+            except Exception as e:
+                logger.error(f"[TENANT] Failed to load {self.path}: {e}; keeping previous routes"); return
+        owners = {}
+        for key in {DEFAULT_TENANT, *configs}:
+            for path in (_bookings_path(key, configs.get(key)), _callers_path(key, configs.get(key))):
+                path = os.path.abspath(path)
+                if path in owners:
+                    logger.error(f"[TENANT] {owners[path]} and {key} both use {path}; keeping previous routes"); return
+                owners[path] = key
+        self._routes_mtime = mt
+        routes = {}
+        for key, cfg in configs.items():
+            for num in cfg.get("numbers", []):
+                routes[_number_key(num)] = key
+        # Drop compiled profiles whose config changed (or vanished); they recompile on next use
+        for key in list(self._cache):
+            if key != DEFAULT_TENANT and configs.get(key) != self._configs.get(key):
+                self._cache.pop(key, None)
+        self._configs, self._routes = configs, routes
+        logger.info(f"[TENANT] {len(configs)} tenant(s), {len(routes)} routed number(s) from {self.path}")
+
+    def resolve(self, called_number: Optional[str]) -> str:
+        self._refresh_routes()
+        return self._routes.get(_number_key(called_number), DEFAULT_TENANT)
+
+    def _stale(self, key: str, prof: LowLatencyReceptionist) -> bool:
+        now = time.monotonic()
+        if now - self._checked.get(key, 0.0) < TENANT_RELOAD_CHECK_S:
+            return False
+        self._checked[key] = now
+        return any(_mtime(fn) != mt for fn, mt in prof.sources.items())
+
+    def get(self, key: str = DEFAULT_TENANT) -> LowLatencyReceptionist:
+        self._refresh_routes()
+        if key != DEFAULT_TENANT and key not in self._configs:
+            key = DEFAULT_TENANT
+        prof = self._cache.get(key)
+        if prof is not None:
+            if key not in self._reloading and self._stale(key, prof):
+                self._reload(key, prof)
+            self._cache.move_to_end(key)
+            return prof
+        return self._put(key, LowLatencyReceptionist(key, self._configs.get(key)))
+
+    def _put(self, key: str, prof: LowLatencyReceptionist) -> LowLatencyReceptionist:
+        if prof.slots.business_info != prof.raw_business_info:
+            prof.slots.set_rules(prof.raw_business_info)  # shared calendar: new hours/mechanics, same bookings
+        self._cache[key] = prof  # atomic swap; calls in flight hold the old object
+        self._cache.move_to_end(key)
+        self._checked[key] = time.monotonic()
+        while len(self._cache) > self.capacity:
+            evicted, _p = self._cache.popitem(last=False)
+            _metric_inc("tenant_evictions"); logger.info(f"[TENANT] evicted {evicted} (LRU, capacity {self.capacity})")
+        return prof
+
+    def _reload(self, key: str, old: LowLatencyReceptionist):
+        """Recompile `key` in a worker thread; `old` keeps serving until the new profile is swapped in."""
+        logger.info(f"[TENANT] {key}: source changed on disk; recompiling in the background")
+        _metric_inc("tenant_reloads")
+        config = self._configs.get(key)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._put(key, LowLatencyReceptionist(key, config)); return  # no loop yet (startup): nobody to block
+        self._reloading.add(key)
+        def swap(fut):
+            self._reloading.discard(key)
+            if fut.cancelled(): return
+            if fut.exception() is not None:
+                logger.error(f"[TENANT] {key}: recompile failed ({fut.exception()!r}); keeping the current profile"); return
+            if self._configs.get(key) != config or self._cache.get(key) is not old:
+                return  # config changed or evicted meanwhile: recompiles on next use
+            self._put(key, fut.result())
+        loop.run_in_executor(None, LowLatencyReceptionist, key, config).add_done_callback(swap)
+
+    def stats(self) -> dict:
+        return {k: {"compile_ms": round(p.compile_ms, 2), "approx_bytes": p.approx_bytes} for k, p in self._cache.items()}
+
+tenants = TenantRegistry(TENANTS_FILE, TENANT_CACHE_SIZE)
+
+# ---------- Speech synthesizer pool ----------
+SPEECH_POOL_SIZE = int(os.getenv("SPEECH_POOL_SIZE", "2"))
+
+class SpeechPool:
+    """
+    A few pre-connected synthesizers per voice and speech endpoint, so a new call doesn't pay
+    Azure's TLS/WebSocket handshake before its greeting. Taking one refills the pool in a worker thread.
+    """
+    def __init__(self, size: int):
+        self.size = max(0, size)
+        self._idle: dict = {}  # (tts_cache_ns, endpoint name) -> [synthesizer, ...]
+        self._lock = threading.Lock()
+        self._filling: set = set()
+
+    def _make(self, prof: LowLatencyReceptionist, ep: SpeechEndpoint):
+        synth = prof.make_tts(ep)
+        try:
+            conn = speechsdk.Connection.from_speech_synthesizer(synth)
+            conn.open(True)
+            synth.warm_connection = conn  # keep the connection object alive with its synthesizer
+        except Exception as e:
+            logger.warning(f"[SPEECH] pre-connect failed: {e}")
+        return synth
+
+    def fill(self, prof: LowLatencyReceptionist, ep: Optional[SpeechEndpoint] = None):
+        """Blocking; run in a worker thread. Fills for `ep`, else the endpoint TTS would pick now."""
+        ep = ep or speech_router.pick("tts")
+        key = (prof.tts_cache_ns, ep.name)
+        with self._lock:
+            if key in self._filling: return
+            self._filling.add(key)
+        try:
+            while len(self._idle.get(key, ())) < self.size:
+                synth = self._make(prof, ep)
+                with self._lock:
+                    self._idle.setdefault(key, []).append(synth)
+        finally:
+            with self._lock: self._filling.discard(key)
+
+    def take(self, prof: LowLatencyReceptionist, ep: Optional[SpeechEndpoint] = None):
+        ep = ep or speech_router.pick("tts")
+        with self._lock:
+            idle = self._idle.get((prof.tts_cache_ns, ep.name))
+            synth = idle.pop() if idle else None
+        _metric_inc("speech_pool_hit" if synth is not None else "speech_pool_miss")
+        if synth is None:
+            synth = prof.make_tts(ep)
+        if self.size:
+            fut = asyncio.get_running_loop().run_in_executor(None, self.fill, prof, ep)
+            fut.add_done_callback(_log_failure(f"[SPEECH] pool refill for {prof.tts_cache_ns} on {ep.name}"))
+        return synth
+
+    def ready(self, prof: LowLatencyReceptionist) -> bool:
+        return self.size == 0 or any(ns == prof.tts_cache_ns and idle for (ns, _ep), idle in self._idle.items())
+
+speech_pool = SpeechPool(SPEECH_POOL_SIZE)
 
 
 # ---------- Contact & address extraction ----------
@@ -256,28 +1054,28 @@ def _set_field(contact: dict, key: str, new_val: Optional[str], *, override: boo
             return
     contact[key] = new_val
     if old and old != new_val:
-        logger.info(f"[MEM] updated {label}: {old} -> {new_val}")
+        logger.info("[MEM] updated %s: %s -> %s", label, old, new_val)
     else:
-        logger.info(f"[MEM] captured {label}: {new_val}")
+        logger.info("[MEM] captured %s: %s", label, new_val)
 
 def _norm_strasse_case(s: str) -> str:
     return re.sub(r'(?i)strasse\b', 'straße', s)
 
 # ---- NEW: Excel append helper ----
-def _append_record_excel(name: str, phone: str, path: str = "Record.xlsx"):
-    if not OPENPYXL_AVAILABLE:
-        logger.error("[Excel] openpyxl not available; cannot write Record.xlsx")
+def _append_record_excel(name: str, phone: str, path: str):
+    if not _openpyxl_available():
+        logger.error(f"[Excel] openpyxl not available; cannot write {path}")
         return
     try:
         if os.path.exists(path):
-            wb = load_workbook(path)
+            wb = _openpyxl.load_workbook(path)
             ws = wb.active
             # If first row is empty or different headers, ensure headers exist once
             if ws.max_row == 0 or (ws.max_row == 1 and (ws.cell(row=1, column=1).value is None)):
                 ws.cell(row=1, column=1, value="Name")
                 ws.cell(row=1, column=2, value="Number")
         else:
-            wb = Workbook()
+            wb = _openpyxl.Workbook()
             ws = wb.active
             ws.title = "Sheet1"
             ws.cell(row=1, column=1, value="Name")
@@ -286,7 +1084,104 @@ def _append_record_excel(name: str, phone: str, path: str = "Record.xlsx"):
         wb.save(path)
         logger.info(f"[Excel] Appended to {path}: {name} | {phone}")
     except Exception as e:
-        logger.error(f"[Excel] Failed to write Record.xlsx: {e}")
+        logger.error(f"[Excel] Failed to write {path}: {e}")
+
+# ---------- Caller directory (returning callers) ----------
+# Leads from the tenant's Record.xlsx, indexed by normalized phone number and held in memory, so a
+# call from a known number starts with name and number already in memory. Each file is read when
+# its profile first compiles and re-read in the background when it changes; call-time lookups are
+# a dict hit. New leads are appended to the same file the directory reads.
+CALLER_DIRECTORY_FILE = os.getenv("CALLER_DIRECTORY_FILE", "Record.xlsx")
+CALLER_DIRECTORY_REFRESH_S = float(os.getenv("CALLER_DIRECTORY_REFRESH_S", "300"))
+CALLER_DEFAULT_CC = os.getenv("CALLER_DEFAULT_CC", "49")  # national numbers (0176...) -> +49 176...
+CALLER_FAST_PATH = os.getenv("CALLER_FAST_PATH", "1") == "1"
+
+def _caller_key(number: Optional[str]) -> str:
+    key = _number_key(number)
+    if key.startswith("0"): key = CALLER_DEFAULT_CC + key[1:]
+    return key if len(key) >= 7 else ""  # "anonymous", short codes etc. never match
+
+def _phone_cell(value) -> str:
+    """
+    A number cell as text. Typed into Excel by hand, phone numbers become int/float cells that have
+    lost the leading 0 (national) or + (international); put it back by length: a German national
+    number without its 0 has at most 11 digits, anything longer carries a country code.
+    """
+    if isinstance(value, float) and value.is_integer(): value = int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        digits = str(abs(value))
+        return ("+" if len(digits) >= 12 else "0") + digits
+    return str(value or "").strip()
+
+class CallerDirectory:
+    def __init__(self, path: str):
+        self.path = path
+        self._index: dict = {}  # caller key -> {"name": ..., "phone": ...}
+        self._mtime: Optional[float] = None
+        self.load_ms: Optional[float] = None
+
+    def load(self):
+        """Blocking (reads the workbook); run in a worker thread."""
+        mtime = _mtime(self.path)
+        if mtime is None or mtime == self._mtime: return
+        t0 = time.perf_counter()
+        try:
+            wb = _openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(c or "").strip().lower() for c in next(rows, ())]
+            i_name = header.index("name") if "name" in header else 0
+            i_num = header.index("number") if "number" in header else 1
+            index = {}
+            for row in rows:
+                if len(row) <= max(i_name, i_num): continue
+                name, phone = row[i_name], _phone_cell(row[i_num])
+                key = _caller_key(phone)
+                if key and name:
+                    index[key] = {"name": str(name).strip(), "phone": phone}  # later rows win
+            wb.close()
+        except Exception as e:
+            logger.error("[CALLER] Failed to load %s: %s", self.path, e); return
+        self._index, self._mtime = index, mtime
+        self.load_ms = round((time.perf_counter() - t0) * 1000.0, 1)
+        logger.info("[CALLER] %d known caller(s) from %s in %.1f ms", len(index), self.path, self.load_ms)
+
+    def remember(self, name: str, phone: str):
+        key = _caller_key(phone)
+        if key: self._index[key] = {"name": name, "phone": phone}
+
+    def lookup(self, number: Optional[str]) -> Optional[dict]:
+        return self._index.get(_caller_key(number)) if CALLER_FAST_PATH else None
+
+    def stats(self) -> dict:
+        return {"entries": len(self._index), "load_ms": self.load_ms}
+
+# One directory per file, shared by every compile generation of the profiles using it
+_caller_directories: dict = {}
+_caller_directories_lock = threading.Lock()
+
+def _caller_directory(path: str) -> CallerDirectory:
+    with _caller_directories_lock:
+        d = _caller_directories.get(os.path.abspath(path))
+        if d is not None: return d
+        d = _caller_directories[os.path.abspath(path)] = CallerDirectory(path)
+    try:
+        asyncio.get_running_loop().run_in_executor(None, d.load).add_done_callback(_log_failure(f"[CALLER] loading {path}"))
+    except RuntimeError:
+        d.load()  # compiling in a worker thread (or at startup): already off the loop
+    return d
+
+def caller_directory_stats() -> dict:
+    new, ret = METRICS.get("turns_per_call_new"), METRICS.get("turns_per_call_returning")
+    saved = None
+    if new and ret and new["count"] and ret["count"]:
+        saved = round(new["sum"] / new["count"] - ret["sum"] / ret["count"], 2)
+    return {"files": {d.path: d.stats() for d in list(_caller_directories.values())}, "turns_saved_per_returning_call": saved}
+
+async def _caller_directory_refresher():
+    while True:
+        await asyncio.sleep(CALLER_DIRECTORY_REFRESH_S)
+        for d in list(_caller_directories.values()):
+            await asyncio.to_thread(d.load)
 
 def extract_address(user_text: str, call_state: dict):
     if not user_text or "@" in user_text:
@@ -353,7 +1248,7 @@ def extract_address(user_text: str, call_state: dict):
             addr["house"] = m.group(1)
     if addr.get("house") == "": addr["house"] = None
 
-    logger.info(f"[MEM] address now: {addr}")
+    logger.debug("[MEM] address now: %s", addr)
 
 def _looks_like_phone_utterance(text: str) -> bool:
     return bool(_PHONE_CUE.search(text or ""))
@@ -441,14 +1336,83 @@ def extract_contact(user_text: str, call_state: dict):
             last = call_state.get("meta", {}).get("last_saved_pair")
             pair = (name, phone)
             if last != pair:
-                _append_record_excel(name, phone)  # creates Record.xlsx if missing, else appends
+                callers = (call_state.get("profile") or tenants.get(DEFAULT_TENANT)).callers
+                _append_record_excel(name, phone, callers.path)  # creates the file if missing, else appends
+                callers.remember(name, phone)
                 call_state["meta"]["last_saved_pair"] = pair
     except Exception as e:
         logger.error(f"[Excel] save attempt failed: {e}")
 
+# ---- Appointment commit: the bot proposes one concrete slot, the caller agrees -> book it ----
+_MONTHS = {"januar": 1, "january": 1, "jänner": 1, "februar": 2, "february": 2, "märz": 3, "maerz": 3, "march": 3,
+           "april": 4, "mai": 5, "may": 5, "juni": 6, "june": 6, "juli": 7, "july": 7, "august": 8,
+           "september": 9, "oktober": 10, "october": 10, "november": 11, "dezember": 12, "december": 12}
+_SLOT_OFFER_RE = re.compile(r"\b(\d{1,2})\.?\s*(" + "|".join(_MONTHS) + r")\b(?:\s+(\d{4}))?,?\s+(?:um|at)\s+(\d{1,2})(?:[:.](\d{2}))?", re.I)
+_SLOT_YES = {"ja", "jawohl", "genau", "passt", "gerne", "gern", "okay", "ok", "gut", "perfekt", "super",
+             "einverstanden", "richtig", "prima", "buchen", "yes"}
+_SLOT_NO = {"nein", "nee", "nicht", "kein", "keine", "lieber", "anders", "später", "früher", "no"}
+
+def _parse_slot_offer(text: str, today) -> Optional[datetime]:
+    """The single date+time the bot proposed ("Dienstag, 24. Februar um 9:30"); None if none or several."""
+    found = set()
+    for d, mon, year, hh, mm in _SLOT_OFFER_RE.findall(text or ""):
+        try:
+            dt = datetime(int(year) if year else today.year, _MONTHS[mon.lower()], int(d), int(hh), int(mm or 0))
+        except ValueError:
+            continue
+        if not year and dt.date() < today:
+            dt = dt.replace(year=dt.year + 1)
+        found.add(dt)
+    return found.pop() if len(found) == 1 else None
+
+def note_slot_offer(bot_text: str, call_state: dict):
+    tz = _munich_tz()
+    offer = _parse_slot_offer(bot_text, datetime.now(tz).date() if tz else datetime.now().date())
+    call_state["meta"]["slot_offer"] = offer
+    if offer: logger.debug("[SLOTS] offered %s", offer)
+
+def extract_booking(user_text: str, call_state: dict):
+    """Commit the proposed slot when the caller agrees to it; a slot taken meanwhile is reported back to the LLM."""
+    meta = call_state["meta"]
+    offer = meta.pop("slot_offer", None)
+    if offer is None: return
+    toks = set(_EOT_TOKEN_RE.findall((user_text or "").lower()))
+    if not (toks & _SLOT_YES) or toks & _SLOT_NO: return
+    slots = (call_state.get("profile") or tenants.get(DEFAULT_TENANT)).slots
+    mech = slots.book(offer, details=_booking_details(call_state))
+    if mech is None:
+        meta["slot_taken"] = offer; _metric_inc("slot_conflicts")
+        logger.info("[SLOTS] %s no longer free; asking the caller for another time", offer)
+        return
+    meta.pop("slot_taken", None)
+    meta.setdefault("bookings", []).append((offer, mech)); _metric_inc("slot_bookings")
+    logger.info("[SLOTS] Booked %s with %s", offer, mech)
+    _save_bookings(slots)
+
+def _booking_details(call_state: dict) -> dict:
+    """Who the workshop should expect: the call and whatever contact details are known so far."""
+    contact = call_state["contact"]
+    d = {"call_sid": call_state["meta"].get("call_sid"), "name": contact.get("name"), "phone": contact.get("phone")}
+    return {k: v for k, v in d.items() if v}
+
+def _save_bookings(slots: "SlotEngine"):
+    fut = asyncio.get_running_loop().run_in_executor(None, slots.write, *slots.dump())
+    fut.add_done_callback(_log_failure(f"[SLOTS] saving {slots.path}"))
+
+def annotate_bookings(call_state: dict):
+    """Name/phone often arrive after the slot was agreed: add them to this call's bookings."""
+    bookings = call_state["meta"].get("bookings")
+    if not bookings: return
+    slots = (call_state.get("profile") or tenants.get(DEFAULT_TENANT)).slots
+    v = slots.version
+    for dt, mech in bookings:
+        slots.annotate(dt, mech, **_booking_details(call_state))
+    if slots.version != v: _save_bookings(slots)
+
 def build_system_prompt_with_memory(call_state: dict) -> str:
-    # Base system prompt is ONLY from env (already expanded with business info)
-    base = state.base_system_prompt or ""
+    # Base system prompt comes from the call's profile (already expanded with business info)
+    profile = call_state.get("profile") or tenants.get(DEFAULT_TENANT)
+    base = profile.base_system_prompt or ""
 
     name = call_state["contact"].get("name")
     phone = call_state["contact"].get("phone")
@@ -465,6 +1429,7 @@ def build_system_prompt_with_memory(call_state: dict) -> str:
     memory = [
         "Call meta:",
         f"- Already greeted: {'yes' if greeted else 'no'}",
+        "- Returning caller: yes (name and phone are from an earlier call; use them, don't ask again)" if call_state["meta"].get("returning") else None,
         "",
         "Known caller details:",
         f"- Name: {name}" if name else "- Name: (unknown)",
@@ -477,9 +1442,204 @@ def build_system_prompt_with_memory(call_state: dict) -> str:
         "- Toward completion, offer a brief, natural closing check-in.",
         closing_hint,
         "- Postadresse: " + pretty,
+        *[f"- Booked in this call: {dt:%A %d %B %Y %H:%M} ({mech}); confirm it, don't offer it again" for dt, mech in call_state["meta"].get("bookings", ())],
+        f"- The slot {call_state['meta']['slot_taken']:%A %d %B %Y %H:%M} was just booked by someone else: apologise and offer another time" if call_state["meta"].get("slot_taken") else None,
+        "",
+        profile.slots.summary(),
     ]
     return (base + "\n" if base else "") + "\n".join([m for m in memory if m is not None]) + "\n"
 
+# ---------- LLM request policy (first-token deadline, hedging, circuit breaking) ----------
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+LLM_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+LLM_FIRST_TOKEN_DEADLINE_S = float(os.getenv("LLM_FIRST_TOKEN_DEADLINE_S", "4.0"))
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE", "0").strip().lower() in ("1", "true", "yes", "on")
+LLM_HEDGE_DELAY_MS = os.getenv("LLM_HEDGE_DELAY_MS", "").strip()  # fixed delay; empty -> derived from measured latency
+LLM_HEDGE_MIN_DELAY_MS = int(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "300"))
+LLM_HEDGE_MAX_DELAY_MS = int(os.getenv("LLM_HEDGE_MAX_DELAY_MS", "2000"))
+LLM_BREAKER_FAILS = int(os.getenv("LLM_BREAKER_FAILS", "3"))
+LLM_BREAKER_COOLDOWN_S = float(os.getenv("LLM_BREAKER_COOLDOWN_S", "30"))
+LLM_FALLBACK_TEXT = _env_text("LLM_FALLBACK_TEXT", "Entschuldigung, könnten Sie das bitte noch einmal sagen?")
+
+class LLMEndpoint:
+    """
+    One chat-completions target (base URL + model + key) with its own latency tracker and
+    circuit breaker. Time-to-first-token is tracked as EWMA mean + mean deviation (the TCP RTO
+    estimator), which drives the hedge delay when LLM_HEDGE_DELAY_MS is not pinned. After
+    LLM_BREAKER_FAILS failures the circuit opens; once the cooldown is over a single request
+    is let through as a probe and its result closes or re-opens it.
+    """
+    def __init__(self, name: str, base_url: str, model: str, api_key: str):
+        self.name = name
+        self.url = f"{base_url.rstrip('/')}/chat/completions"
+        self.model = model
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+        self.ttft_s: Optional[float] = None
+        self.ttft_dev_s = 0.0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+
+    def available(self) -> bool:
+        if self.consecutive_failures < LLM_BREAKER_FAILS: return True  # closed
+        # Open; past its cooldown it is half-open and admits one probe at a time
+        return time.monotonic() >= self.open_until and not self.probing
+
+    def begin(self):
+        """A request is being sent; in the half-open state it is the probe."""
+        if self.consecutive_failures >= LLM_BREAKER_FAILS: self.probing = True
+
+    def abandon(self):
+        """The request was cancelled before it succeeded or failed: no verdict, free the probe slot."""
+        self.probing = False
+
+    def record_ttft(self, seconds: float):
+        if self.ttft_s is None:
+            self.ttft_s, self.ttft_dev_s = seconds, seconds / 2
+        else:
+            self.ttft_dev_s = 0.75 * self.ttft_dev_s + 0.25 * abs(seconds - self.ttft_s)
+            self.ttft_s = 0.875 * self.ttft_s + 0.125 * seconds
+        _metric_observe(f"llm_ttft_ms.{self.name}", seconds * 1000.0)
+
+    def record_success(self):
+        if self.consecutive_failures >= LLM_BREAKER_FAILS:
+            logger.info(f"[LLM] {self.name}: circuit closed again")
+        self.consecutive_failures = 0; self.open_until = 0.0; self.probing = False
+
+    def record_failure(self, err):
+        self.consecutive_failures += 1; self.probing = False
+        _metric_inc(f"llm_errors.{self.name}")
+        if self.consecutive_failures >= LLM_BREAKER_FAILS:
+            self.open_until = time.monotonic() + LLM_BREAKER_COOLDOWN_S
+            _metric_inc(f"llm_breaker_open.{self.name}")
+            logger.warning(f"[LLM] {self.name}: circuit open for {LLM_BREAKER_COOLDOWN_S:.0f}s after {self.consecutive_failures} failures ({err})")
+
+    def hedge_delay_s(self) -> float:
+        if LLM_HEDGE_DELAY_MS:
+            return int(LLM_HEDGE_DELAY_MS) / 1000.0
+        if self.ttft_s is None:
+            return LLM_HEDGE_MAX_DELAY_MS / 1000.0
+        est_ms = (self.ttft_s + 4 * self.ttft_dev_s) * 1000.0
+        return max(LLM_HEDGE_MIN_DELAY_MS, min(LLM_HEDGE_MAX_DELAY_MS, est_ms)) / 1000.0
+
+LLM_PRIMARY = LLMEndpoint("primary", LLM_BASE_URL, LLM_MODEL, OPENAI_API_KEY)
+LLM_HEDGE = LLMEndpoint(
+    "hedge",
+    os.getenv("LLM_HEDGE_BASE_URL", LLM_BASE_URL),
+    os.getenv("LLM_HEDGE_MODEL", LLM_MODEL),
+    os.getenv("LLM_HEDGE_API_KEY", OPENAI_API_KEY),
+)
+
+async def _llm_attempt(ep: LLMEndpoint, payload: dict, out: asyncio.Queue, state: dict):
+    """
+    Stream one request into `out`: content tokens, then None on completion or the exception on
+    failure. state["first"] is set once the first token has been seen (and its TTFT recorded).
+    """
+    t0 = time.perf_counter()
+    try:
+        async with llm_http().stream("POST", ep.url, json={**payload, "model": ep.model}, headers=ep.headers) as r:
+            r.raise_for_status()
+            async for line in r.aiter_lines():
+                if not line or not line.startswith("data:"): continue
+                data = line[5:].strip()
+                if data == "[DONE]": break
+                try: obj = json.loads(data)
+                except Exception: continue
+                token = (obj.get("choices") or [{}])[0].get("delta", {}).get("content")
+                if token:
+                    if not state["first"]:
+                        state["first"] = True; ep.record_ttft(time.perf_counter() - t0)
+                    await out.put(token)
+        ep.record_success()
+        await out.put(None)
+    except asyncio.CancelledError:
+        # Lost a hedge race, or the caller moved on (barge-in, new final): says nothing about the endpoint
+        ep.abandon()
+        raise
+    except Exception as e:
+        if isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500 and e.response.status_code != 429:
+            ep.abandon()  # our request was refused (bad payload, auth, model): the endpoint itself is fine
+            _metric_inc(f"llm_client_errors.{ep.name}")
+        else:
+            ep.record_failure(e)
+        await out.put(e)
+
+async def llm_stream_tokens(messages: list):
+    """
+    Yield content tokens for `messages` under the request policy:
+      - skip endpoints whose circuit is open, as long as another one is available (with a single
+        endpoint the request is sent anyway: failing every turn fast would be worse),
+      - optionally start a hedged request after the primary's hedge delay (or at once if the
+        primary fails before its first token); the first stream to produce a token wins and
+        the other is cancelled,
+      - give up with TimeoutError if no token arrives within LLM_FIRST_TOKEN_DEADLINE_S.
+    """
+    payload = {"messages": messages, "temperature": 0.3, "max_tokens": 320, "stream": True}
+    configured = (LLM_PRIMARY, LLM_HEDGE) if LLM_HEDGE_ENABLED else (LLM_PRIMARY,)
+    candidates = [ep for ep in configured if ep.available()]
+    if not candidates:
+        _metric_inc("llm_breaker_bypassed")
+        candidates = [configured[0]]
+
+    attempts = {}  # endpoint -> (task, queue, started, state)
+    def launch(ep: LLMEndpoint):
+        q: asyncio.Queue = asyncio.Queue(); state = {"first": False}
+        ep.begin()  # synchronously, so a concurrent request sees the probe slot taken
+        attempts[ep] = (asyncio.create_task(_llm_attempt(ep, payload, q, state)), q, time.perf_counter(), state)
+        if ep is not candidates[0]:
+            _metric_inc("llm_hedges_launched"); logger.info("[LLM] hedging on %s (%s)", ep.name, ep.model)
+
+    winner = None; first_token = None; last_err = None
+    try:
+        start = time.monotonic(); deadline = start + LLM_FIRST_TOKEN_DEADLINE_S
+        launch(candidates[0])
+        spare = candidates[1:]
+        hedge_at = start + candidates[0].hedge_delay_s() if spare else None
+        while winner is None:
+            now = time.monotonic()
+            if hedge_at is not None and now >= hedge_at:
+                ep = spare.pop(0); hedge_at = None
+                if ep.available(): launch(ep)  # another request may hold its probe slot by now
+                continue
+            if now >= deadline:
+                _metric_inc("llm_first_token_deadline_exceeded")
+                err = TimeoutError(f"no first token within {LLM_FIRST_TOKEN_DEADLINE_S:.1f}s")
+                for ep, (t, _q, _t0, _st) in attempts.items():
+                    t.cancel(); ep.record_failure(err)  # counts toward the breaker like an HTTP error
+                raise err
+            if not attempts:
+                raise last_err or RuntimeError("LLM request failed")
+            wake = min(deadline, hedge_at) if hedge_at is not None else deadline
+            getters = {asyncio.ensure_future(q.get()): ep for ep, (_t, q, _t0, _st) in attempts.items()}
+            done, pending = await asyncio.wait(getters, timeout=wake - now, return_when=asyncio.FIRST_COMPLETED)
+            for g in pending: g.cancel()
+            for g in done:
+                ep, item = getters[g], g.result()
+                if isinstance(item, str) and winner is None:
+                    winner, first_token = ep, item
+                elif not isinstance(item, str):
+                    # Finished or failed before producing any text: drop it, hedge right away if we can
+                    attempts.pop(ep, None)
+                    last_err = item if isinstance(item, Exception) else RuntimeError(f"{ep.name}: empty response")
+                    if spare: hedge_at = time.monotonic()
+        for ep, (t, _q, t0, st) in list(attempts.items()):
+            if ep is winner: continue
+            # Lost the race before its first token: the elapsed time is a lower bound for its TTFT
+            # (censored sample); without it a slow endpoint would never look slow
+            if not st["first"]: ep.record_ttft(time.perf_counter() - t0)
+            t.cancel()
+        if winner is not candidates[0]: _metric_inc("llm_hedge_wins")
+        yield first_token
+        q = attempts[winner][1]
+        while True:
+            item = await q.get()
+            if item is None: break
+            if isinstance(item, Exception): raise item
+            yield item
+    finally:
+        for t, _q, _t0, _st in attempts.values():
+            if not t.done(): t.cancel()
+
 # ---------- LLM streaming ----------
 _SENTENCE_END = re.compile(r'([.!?])(\s|$)')
 _CLAUSE_END   = re.compile(r'([,;])(\s|$)')
@@ -497,45 +1657,303 @@ async def llm_stream_sentences(history, user_text, call_state):
         yield "Entschuldigung, mein KI-Gehirn ist offline."; return
     system_prompt = build_system_prompt_with_memory(call_state)
     messages = [{"role": "system", "content": system_prompt}] + history[-12:] + [{"role": "user", "content": user_text}]
+    spoke = False
     try:
-        async with httpx_client.stream(
-            "POST", "https://api.openai.com/v1/chat/completions",
-            json={"model": "gpt-4o-mini", "messages": messages, "temperature": 0.3, "max_tokens": 320, "stream": True},
-        ) as r:
-            r.raise_for_status()
-            buf = ""; last_flush = time.perf_counter(); MAX_WAIT = 1.2; MIN_CHARS = 40
-            async for line in r.aiter_lines():
-                if not line or not line.startswith("data:"): continue
-                data = line[5:].strip()
-                if data == "[DONE]": break
-                try: obj = json.loads(data)
-                except Exception: continue
-                delta = obj.get("choices", [{}])[0].get("delta", {})
-                token = delta.get("content")
-                if token:
-                    buf += token
-                    sentences, buf = _split_complete_sentences(buf)
-                    for s in sentences: yield s; last_flush = time.perf_counter()
-                    i = 0
-                    for m in _CLAUSE_END.finditer(buf):
-                        j = m.end(); s = buf[i:j].strip()
-                        if s: yield s; last_flush = time.perf_counter()
-                        i = j
-                    if i: buf = buf[i:]
-                    now = time.perf_counter()
-                    if len(buf) >= MIN_CHARS and (now - last_flush) > MAX_WAIT:
-                        yield buf.strip(); buf = ""; last_flush = now
-            rem = buf.strip()
-            if rem: yield rem
+        buf = ""; last_flush = time.perf_counter(); MAX_WAIT = 1.2; MIN_CHARS = 40
+        async for token in llm_stream_tokens(messages):
+            buf += token
+            sentences, buf = _split_complete_sentences(buf)
+            for s in sentences: spoke = True; yield s; last_flush = time.perf_counter()
+            i = 0
+            for m in _CLAUSE_END.finditer(buf):
+                j = m.end(); s = buf[i:j].strip()
+                if s: spoke = True; yield s; last_flush = time.perf_counter()
+                i = j
+            if i: buf = buf[i:]
+            now = time.perf_counter()
+            if len(buf) >= MIN_CHARS and (now - last_flush) > MAX_WAIT:
+                spoke = True; yield buf.strip(); buf = ""; last_flush = now
+        rem = buf.strip()
+        if rem: yield rem
     except Exception as e:
-        logger.error(f"LLM stream error: {e}")
-        yield "Verstanden."
+        logger.error("LLM stream error: %r", e)
+        if not spoke:
+            yield LLM_FALLBACK_TEXT
 
 # ---------- Goodbye detection ----------
 _GOODBYE_PAT = re.compile(r"\b(good\s*bye|goodbye|bye|ciao)\b|have a nice day\b|have a wonderful day\b|have a great day\b|Tschüss\b|bis später\b|bis bald\b|auf wiederhören\b|auf wiedersehen\b|Verabschiedung\b|schönen Tag", re.I)
 def says_goodbye(text: str) -> bool:
     return bool(_GOODBYE_PAT.search(text or ""))
 
+# ---------- End-of-turn detection ----------
+# Azure emits a final after EndSilenceTimeoutMs of silence, which regularly splits one caller
+# utterance into several finals. Instead of starting an LLM request per final, we hold each
+# final briefly and coalesce whatever follows, using VAD energy, Azure partials and a few
+# linguistic cues to decide when the caller is actually done.
+EOT_MODE = os.getenv("EOT_MODE", "adaptive").strip().lower()  # "adaptive" | "off"
+EOT_MIN_HOLD_MS = int(os.getenv("EOT_MIN_HOLD_MS", "250"))
+EOT_BASE_HOLD_MS = int(os.getenv("EOT_BASE_HOLD_MS", "450"))
+EOT_MAX_HOLD_MS = int(os.getenv("EOT_MAX_HOLD_MS", "1100"))
+EOT_INCOMPLETE_HOLD_MS = int(os.getenv("EOT_INCOMPLETE_HOLD_MS", "1400"))
+EOT_MAX_TURN_WAIT_MS = int(os.getenv("EOT_MAX_TURN_WAIT_MS", "2500"))
+EOT_MERGE_WINDOW_MS = int(os.getenv("EOT_MERGE_WINDOW_MS", "1500"))
+EOT_ADAPT_STEP_MS = int(os.getenv("EOT_ADAPT_STEP_MS", "120"))
+EOT_ADAPT_DECAY_MS = int(os.getenv("EOT_ADAPT_DECAY_MS", "30"))
+
+_EOT_TRAILING_WORDS = {
+    "und","oder","aber","also","weil","dass","denn","wenn","ob","sondern","bzw","beziehungsweise",
+    "mit","für","bei","von","vom","zu","zum","zur","am","an","auf","in","im","nach","wegen",
+    "ein","eine","einen","einem","mein","meine","meinen","meinem","der","die","das","den","dem",
+    "äh","ähm","öhm","hm","hmm",
+    "and","or","but","the","a","my","with","for","because",
+}
+_EOT_DIGIT_WORDS = set(_NUM_WORD) | {"null","eins","ein","zwei","zwo","drei","vier","fünf","funf","sechs","sieben","acht","neun"}
+_EOT_TOKEN_RE = re.compile(r"[a-zA-ZÄÖÜäöüß]+|\d+")
+
+def _utterance_incomplete(text: str, expect_digits: bool = False) -> bool:
+    """
+    Linguistic end-of-turn cues: trailing conjunction/article/filler, trailing comma or dash,
+    or a phone number that is still being dictated (ends in a digit, fewer than 10 digits so far).
+    """
+    t = (text or "").strip()
+    if not t:
+        return False
+    if t[-1] in ",-–…":
+        return True
+    toks = _EOT_TOKEN_RE.findall(t.lower())
+    if not toks:
+        return False
+    last = toks[-1]
+    if last in _EOT_TRAILING_WORDS:
+        return True
+    if last.isdigit() or last in _EOT_DIGIT_WORDS:
+        if expect_digits or _looks_like_phone_utterance(t):
+            digits = sum(len(x) if x.isdigit() else 1 for x in toks if x.isdigit() or x in _EOT_DIGIT_WORDS)
+            return digits < 10
+    return False
+
+_EOT_CLOSED_ANSWERS = {
+    "ja","jawohl","jo","nein","nee","genau","richtig","stimmt","okay","ok","gut","danke","bitte",
+    "tschüss","tschüs","wiederhören","wiedersehen","auf","passt","korrekt","klar","gerne","sehr",
+    "yes","no","thanks","bye",
+}
+
+def _utterance_terminal(text: str, expect_digits: bool = False) -> bool:
+    """A question, or a short closed answer ("Ja, genau.", "Nein danke."): nothing more is coming."""
+    t = (text or "").strip()
+    if not t or expect_digits or _utterance_incomplete(t):
+        return False
+    if t.endswith("?"):
+        return True
+    toks = _EOT_TOKEN_RE.findall(t.lower())
+    return 0 < len(toks) <= 3 and all(x in _EOT_CLOSED_ANSWERS for x in toks)
+
+class EndOfTurnDetector:
+    """
+    Per-call turn-taking policy. Decides how long to hold a final before it is committed as a
+    turn, and adapts that hold to the caller: each time a caller continues right after a
+    commit (a split utterance), the hold grows; clean turns let it decay again.
+    """
+    def __init__(self):
+        self.enabled = EOT_MODE != "off"
+        self.hold_ms = float(EOT_BASE_HOLD_MS)
+        now = time.time() * 1000.0
+        self.last_voice_ms = 0.0
+        self.last_partial_ms = 0.0
+        self.last_final_ms = now
+        self.last_commit_ms = 0.0
+        self.pending_latency = None  # (turn_id, end_of_speech_ms) until first audio goes out
+        # Stats
+        self.finals = 0
+        self.turns = 0
+        self.coalesced = 0
+        self.fast_commits = 0  # terminal finals committed without a hold
+        self.llm_cancelled = 0
+        self.latencies_ms = []
+
+    def on_voice(self):
+        self.last_voice_ms = time.time() * 1000.0
+
+    def on_partial(self):
+        # Called from the Azure SDK thread; a float store is safe under the GIL
+        self.last_partial_ms = time.time() * 1000.0
+
+    def on_final(self):
+        self.finals += 1
+        self.last_final_ms = time.time() * 1000.0
+
+    def hold_seconds(self, text: str, first_final_ms: float, expect_digits: bool = False) -> float:
+        """Remaining time to wait for more speech before committing `text` as a turn."""
+        if not self.enabled:
+            return 0.0
+        if (_utterance_terminal(text, expect_digits)
+                and max(self.last_partial_ms, self.last_voice_ms) < self.last_final_ms):
+            self.fast_commits += 1
+            return 0.0  # terminal and the caller has been quiet since: holding would only add latency
+        hold = EOT_INCOMPLETE_HOLD_MS if _utterance_incomplete(text, expect_digits) else self.hold_ms
+        quiet_since = max(self.last_final_ms, self.last_partial_ms, self.last_voice_ms)
+        deadline = min(quiet_since + hold, first_final_ms + EOT_MAX_TURN_WAIT_MS)
+        return max(0.0, (deadline - time.time() * 1000.0) / 1000.0)
+
+    def is_continuation(self) -> bool:
+        """A final right after a commit means we split the caller's utterance."""
+        return self.enabled and (time.time() * 1000.0 - self.last_commit_ms) < EOT_MERGE_WINDOW_MS
+
+    def commit(self, turn_id: int, *, split: bool):
+        now = time.time() * 1000.0
+        self.turns += 1; self.last_commit_ms = now
+        if split:
+            self.coalesced += 1
+            self.hold_ms = min(EOT_MAX_HOLD_MS, self.hold_ms + EOT_ADAPT_STEP_MS)
+        else:
+            self.hold_ms = max(EOT_MIN_HOLD_MS, self.hold_ms - EOT_ADAPT_DECAY_MS)
+        end_of_speech = min(now, max(self.last_final_ms, self.last_voice_ms))
+        self.pending_latency = (turn_id, end_of_speech)
+
+    def on_first_audio(self, turn_id: int):
+        if self.pending_latency and self.pending_latency[0] == turn_id:
+            ms = time.time() * 1000.0 - self.pending_latency[1]
+            self.latencies_ms.append(ms); self.pending_latency = None
+            _metric_observe("turn_latency_ms", ms)
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies_ms)
+        return {
+            "mode": EOT_MODE, "finals": self.finals, "turns": self.turns, "coalesced": self.coalesced,
+            "fast_commits": self.fast_commits,
+            "llm_cancelled": self.llm_cancelled, "hold_ms": round(self.hold_ms),
+            "avg_turn_latency_ms": round(sum(lat) / len(lat)) if lat else None,
+            "p50_turn_latency_ms": round(lat[len(lat) // 2]) if lat else None,
+        }
+
+# ---------- Playback tracking (Twilio mark acknowledgements) ----------
+# Twilio plays outbound media in order and echoes each `mark` back once the audio queued before
+# it has played. Numbered marks every few frames tell us how far ahead of real time we are and
+# how much of each sentence the caller actually heard. After a `clear`, Twilio drops its buffer
+# and echoes every outstanding mark at once; those acks mean "discarded", not "heard".
+PLAYBACK_MARK_EVERY_FRAMES = int(os.getenv("PLAYBACK_MARK_EVERY_FRAMES", "10"))  # 10 x 20 ms
+PLAYBACK_MAX_AHEAD_MS = int(os.getenv("PLAYBACK_MAX_AHEAD_MS", "400"))
+PLAYBACK_DRAIN_GRACE_S = float(os.getenv("PLAYBACK_DRAIN_GRACE_S", "1.5"))
+
+class PlaybackTracker:
+    """Per-call view of outbound audio: sent vs. acknowledged, per sentence and overall."""
+    def __init__(self):
+        self.seq = 0
+        self.sent_ms = 0.0
+        self.acked_ms = 0.0
+        # Real-time play-out estimate between acks, re-anchored on every ack
+        self._anchor_ms = 0.0; self._anchor_t = time.perf_counter()
+        self._pending: "OrderedDict[str, tuple]" = OrderedDict()  # mark -> (sent_ms, segment, segment_ms)
+        self._ack = asyncio.Event()
+        self._discard: set = set()
+        self._clear_t: Optional[float] = None
+        self._seg: Optional[list] = None
+        self.segments: dict = {}         # turn_id -> [[text, sent_ms, heard_ms], ...]
+        self.history_entries: dict = {}  # turn_id -> assistant message dict in history
+        self.interrupted: set = set()
+        self.playing_turn: Optional[int] = None
+        # Stats
+        self.ahead_max_ms = 0.0; self._ahead_sum = 0.0; self._ahead_n = 0
+        self.barge_stop_ms: list = []
+
+    def played_ms(self) -> float:
+        est = self._anchor_ms + (time.perf_counter() - self._anchor_t) * 1000.0
+        return min(self.sent_ms, max(self.acked_ms, est))
+
+    def ahead_ms(self) -> float:
+        return self.sent_ms - self.played_ms()
+
+    def begin_segment(self, turn_id: int, text: str):
+        self._seg = [text, 0.0, 0.0]
+        self.segments.setdefault(turn_id, []).append(self._seg)
+        self.playing_turn = turn_id
+
+    def begin_filler(self):
+        """Filler audio: counts for pacing, but belongs to no turn's answer (never in heard_text)."""
+        self._seg = None; self.playing_turn = None
+
+    def on_frame(self, frame_ms: float):
+        if self.played_ms() >= self.sent_ms:
+            # Buffer ran dry: play-out restarts with this frame
+            self._anchor_ms, self._anchor_t = self.sent_ms, time.perf_counter()
+        self.sent_ms += frame_ms
+        if self._seg is not None: self._seg[1] += frame_ms
+
+    def next_mark(self) -> str:
+        self.seq += 1; name = f"pb-{self.seq}"
+        self._pending[name] = (self.sent_ms, self._seg, self._seg[1] if self._seg else 0.0)
+        ahead = self.ahead_ms()
+        self.ahead_max_ms = max(self.ahead_max_ms, ahead); self._ahead_sum += ahead; self._ahead_n += 1
+        _metric_observe("playback_ahead_ms", ahead)
+        return name
+
+    def on_mark(self, name: str):
+        entry = self._pending.pop(name, None)
+        if entry is None:
+            return
+        if name in self._discard:
+            self._discard.discard(name)
+            if not self._discard and self._clear_t is not None:
+                ms = (time.perf_counter() - self._clear_t) * 1000.0
+                self.barge_stop_ms.append(ms); _metric_observe("barge_in_stop_ms", ms); self._clear_t = None
+        else:
+            sent_ms, seg, seg_ms = entry
+            self.acked_ms = max(self.acked_ms, sent_ms)
+            if seg is not None: seg[2] = max(seg[2], seg_ms)
+            self._anchor_ms, self._anchor_t = self.acked_ms, time.perf_counter()
+        self._ack.set()
+
+    def on_clear(self, t0: Optional[float] = None) -> bool:
+        """We sent `clear`: whatever is still outstanding was discarded, not heard. True if audio was cut."""
+        cut = self.playing_turn is not None and self.ahead_ms() > 0
+        if cut:
+            self.interrupted.add(self.playing_turn)
+        self._discard |= set(self._pending)
+        if self._discard and self._clear_t is None:
+            self._clear_t = t0 or time.perf_counter()
+        self.acked_ms = self.sent_ms
+        self._anchor_ms, self._anchor_t = self.sent_ms, time.perf_counter()
+        return cut
+
+    async def wait_capacity(self, cap_ms: float = PLAYBACK_MAX_AHEAD_MS):
+        """Hold the sender while more than `cap_ms` of audio is queued ahead of real time."""
+        ahead = self.ahead_ms()
+        if ahead > cap_ms:
+            self._ack.clear()
+            try: await asyncio.wait_for(self._ack.wait(), timeout=(ahead - cap_ms) / 1000.0)
+            except asyncio.TimeoutError: pass
+
+    async def wait_drained(self, timeout: float):
+        """Wait until every mark sent so far has been acknowledged as played (bounded)."""
+        deadline = time.perf_counter() + timeout
+        while any(n not in self._discard for n in self._pending):
+            left = deadline - time.perf_counter()
+            if left <= 0: return False
+            self._ack.clear()
+            try: await asyncio.wait_for(self._ack.wait(), timeout=left)
+            except asyncio.TimeoutError: return False
+        return True
+
+    def heard_text(self, turn_id: int) -> str:
+        """The part of a turn's answer that was played, cut mid-sentence by played duration."""
+        out = []
+        for text, sent_ms, heard_ms in self.segments.get(turn_id, []):
+            if sent_ms > 0 and heard_ms >= sent_ms - 1:
+                out.append(text); continue
+            words = text.split(); keep = int(len(words) * heard_ms / sent_ms) if sent_ms > 0 else 0
+            if keep: out.append(" ".join(words[:keep]) + " …")
+            break
+        return " ".join(out)
+
+    def summary(self) -> dict:
+        return {
+            "marks": self.seq, "audio_sent_ms": round(self.sent_ms),
+            "ahead_max_ms": round(self.ahead_max_ms),
+            "ahead_avg_ms": round(self._ahead_sum / self._ahead_n) if self._ahead_n else None,
+            "barge_ins": len(self.barge_stop_ms),
+            "barge_stop_avg_ms": round(sum(self.barge_stop_ms) / len(self.barge_stop_ms)) if self.barge_stop_ms else None,
+        }
+
 # ====== TIME/DATE/ETC (SSML helpers) ======
 DATE_RE   = re.compile(r'\b(20\d{2}|19\d{2})[-/.](0?[1-9]|1[0-2])[-/.](0?[1-9]|[12]\d|3[01])\b')
 TEL_RE    = re.compile(r'(?<!\w)(\+?\d[\d\s().\-]{4,}\d)(?!\w)')
@@ -662,10 +2080,18 @@ async def incoming_call():
     if not ws_url: return "Missing MEDIA_WS_URL", 500
     form = await request.form
     call_sid = form.get("CallSid")
-    logger.info(f"Call start: {call_sid} -> streaming to {ws_url}")
+    # Route on the called number; compiling here (if cold) happens before the media stream opens
+    tenant = tenants.resolve(form.get("To"))
+    prof = tenants.get(tenant)
+    caller = form.get("From") or ""
+    known = prof.callers.lookup(caller) is not None
+    logger.info(f"Call start: {call_sid} (tenant={tenant}, returning caller={known}) -> streaming to {ws_url}")
     vr = VoiceResponse()
     connect = vr.connect()
-    connect.stream(url=ws_url)
+    stream = connect.stream(url=ws_url)
+    stream.parameter(name="tenant", value=tenant)
+    # Twilio's stream "start" message has no caller ID; /media looks the number up again (in memory)
+    stream.parameter(name="caller", value=caller)
     return str(vr)
 
 # ---------- Tiny TwiML for forced hangup (fallback) ----------
@@ -675,66 +2101,578 @@ async def hangup_twiml():
     vr.hangup()
     return str(vr)
 
-# ---------- Robust REST hangup (with TwiML redirect fallback) ----------
-async def _hangup_via_twilio_rest(call_sid: str, app_base_url: str) -> bool:
+# ---------- Tiny TwiML for handing the caller to a human ----------
+@app.route("/transfer-twiml", methods=["GET", "POST"])
+async def transfer_twiml():
+    # Only ever dials the configured number; the target is not taken from the request
+    vr = VoiceResponse()
+    number = (os.getenv("TRANSFER_NUMBER") or "").strip()
+    if number:
+        vr.dial(number)
+    else:
+        logger.error("[TRANSFER] TRANSFER_NUMBER not set; hanging up instead.")
+        vr.hangup()
+    return str(vr)
+
+# ---------- Twilio control plane (pooled REST client for live-call updates) ----------
+TWILIO_API_BASE = os.getenv("TWILIO_API_BASE", "https://api.twilio.com").rstrip("/")
+TWILIO_CTRL_TIMEOUT_S = float(os.getenv("TWILIO_CTRL_TIMEOUT_S", "4.0"))
+TWILIO_CTRL_RETRIES = int(os.getenv("TWILIO_CTRL_RETRIES", "3"))
+
+class _TwilioTransient(Exception):
+    """Network error, 429 or 5xx from Twilio: worth another attempt."""
+
+class TwilioControl:
     """
-    A) Try Status=completed
-    B) If that fails, redirect the live call to /hangup-twiml (returns <Hangup/>)
+    Long-lived client for live-call updates (hangup, redirect, transfer).
+    Credentials are resolved once, the HTTP client keeps a warm connection pool, and
+    callers on the media path submit fire-and-forget jobs with bounded retries instead
+    of awaiting Twilio while the call's resources stay open.
     Auth via either:
       - TWILIO_ACCOUNT_SID + TWILIO_AUTH_TOKEN   OR
       - TWILIO_API_KEY_SID + TWILIO_API_KEY_SECRET (recommended)
     """
-    acc = (os.getenv("TWILIO_ACCOUNT_SID") or "").strip()
-    tok = (os.getenv("TWILIO_AUTH_TOKEN") or "").strip()
-    api_key = (os.getenv("TWILIO_API_KEY_SID") or "").strip()
-    api_secret = (os.getenv("TWILIO_API_KEY_SECRET") or "").strip()
-
-    if not acc or not call_sid:
-        logger.error(f"[HANGUP] Missing TWILIO_ACCOUNT_SID or callSid (acc set? {bool(acc)}, callSid set? {bool(call_sid)})")
-        return False
-
-    if api_key and api_secret:
-        auth = (api_key, api_secret); auth_mode = "api_key"
-    elif tok:
-        auth = (acc, tok); auth_mode = "auth_token"
-    else:
-        logger.error("[HANGUP] No Twilio credentials found. Provide TWILIO_AUTH_TOKEN or API KEY/SECRET.")
+    def __init__(self):
+        self._creds = None  # (account_sid, auth tuple, auth_mode) once resolved
+        self._resolved = False
+        self._client = None
+        self._jobs: set = set()
+
+    def _credentials(self):
+        if self._resolved:
+            return self._creds
+        self._resolved = True
+        acc = (os.getenv("TWILIO_ACCOUNT_SID") or "").strip()
+        tok = (os.getenv("TWILIO_AUTH_TOKEN") or "").strip()
+        api_key = (os.getenv("TWILIO_API_KEY_SID") or "").strip()
+        api_secret = (os.getenv("TWILIO_API_KEY_SECRET") or "").strip()
+        if not acc:
+            logger.error("[TWILIO] Missing TWILIO_ACCOUNT_SID; live-call updates disabled.")
+        elif api_key and api_secret:
+            self._creds = (acc, (api_key, api_secret), "api_key")
+        elif tok:
+            self._creds = (acc, (acc, tok), "auth_token")
+        else:
+            logger.error("[TWILIO] No Twilio credentials found. Provide TWILIO_AUTH_TOKEN or API KEY/SECRET.")
+        return self._creds
+
+    def _http(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=TWILIO_API_BASE, timeout=TWILIO_CTRL_TIMEOUT_S,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120),
+            )
+        return self._client
+
+    async def update_call(self, call_sid: str, data: dict, label: str):
+        """POST a live-call update. Raises _TwilioTransient on network errors, 429 and 5xx."""
+        creds = self._credentials()
+        if not creds or not call_sid:
+            raise RuntimeError(f"cannot update call (credentials set? {bool(creds)}, callSid set? {bool(call_sid)})")
+        acc, auth, _mode = creds
+        t0 = time.perf_counter()
+        try:
+            r = await self._http().post(f"/2010-04-01/Accounts/{acc}/Calls/{call_sid}.json", data=data, auth=auth)
+        except httpx.HTTPError as e:
+            _metric_inc(f"twilio_ctrl_errors.{label}")
+            raise _TwilioTransient(f"{label}: {e!r}") from e
+        _metric_observe(f"twilio_ctrl_ms.{label}", (time.perf_counter() - t0) * 1000.0)
+        if r.status_code == 429 or r.status_code >= 500:
+            _metric_inc(f"twilio_ctrl_errors.{label}")
+            raise _TwilioTransient(f"{label}: HTTP {r.status_code}")
+        if r.status_code // 100 != 2:
+            _metric_inc(f"twilio_ctrl_errors.{label}")
+        return r
+
+    async def redirect(self, call_sid: str, url: str, method: str = "GET", label: str = "redirect") -> bool:
+        r = await self.update_call(call_sid, {"Url": url, "Method": method}, label)
+        if r.status_code // 100 == 2:
+            logger.info(f"[TWILIO] {call_sid}: redirected to {url}.")
+            return True
+        if r.status_code == 401:
+            logger.error(
+                "[TWILIO] 401 Unauthorized from Twilio.\n"
+                " • TWILIO_ACCOUNT_SID must match the (sub)account that owns the CallSid.\n"
+                " • API keys or Auth Token must be for that SAME (sub)account.\n"
+                " • Ensure live creds, no trailing spaces.\n"
+            )
+        else:
+            logger.error(f"[TWILIO] {label} failed ({r.status_code}): {r.text[:300]}")
         return False
 
-    base = f"https://api.twilio.com/2010-04-01/Accounts/{acc}/Calls/{call_sid}.json"
-    async with httpx.AsyncClient(timeout=8.0) as c:
-        # A) Direct hangup
+    async def hangup(self, call_sid: str, app_base_url: str) -> bool:
+        """
+        A) Try Status=completed
+        B) If that fails, redirect the live call to /hangup-twiml (returns <Hangup/>)
+        """
+        transient = None
         try:
-            r1 = await c.post(base, data={"Status": "completed"}, auth=auth)
-            if r1.status_code // 100 == 2:
-                logger.info(f"[HANGUP] Completed via Status=completed using {auth_mode}.")
+            r = await self.update_call(call_sid, {"Status": "completed"}, "hangup")
+            if r.status_code // 100 == 2:
+                logger.info(f"[HANGUP] Completed via Status=completed using {self._creds[2]}.")
                 return True
-            logger.warning(f"[HANGUP] Direct hangup failed ({r1.status_code}): {r1.text[:300]}")
+            logger.warning(f"[HANGUP] Direct hangup failed ({r.status_code}): {r.text[:300]}")
+        except _TwilioTransient as e:
+            transient = e
+            logger.warning(f"[HANGUP] Direct hangup error: {e}")
+        ok = await self.redirect(call_sid, f"{app_base_url}/hangup-twiml", label="hangup_redirect")
+        if not ok and transient:
+            raise transient  # the direct hangup may still work on the next attempt
+        return ok
+
+    async def transfer(self, call_sid: str, app_base_url: str) -> bool:
+        """Hand the live call to a human (TRANSFER_NUMBER) via /transfer-twiml."""
+        return await self.redirect(call_sid, f"{app_base_url}/transfer-twiml", label="transfer")
+
+    def submit(self, label: str, fn, *args) -> asyncio.Task:
+        """Run `await fn(*args)` in the background, retrying transient failures with backoff."""
+        async def job():
+            t0 = time.perf_counter()
+            for attempt in range(1, TWILIO_CTRL_RETRIES + 1):
+                try:
+                    ok = await fn(*args)
+                    break
+                except _TwilioTransient as e:
+                    if attempt == TWILIO_CTRL_RETRIES:
+                        logger.error(f"[TWILIO] {label} gave up after {attempt} attempts: {e}"); ok = False
+                        break
+                    _metric_inc("twilio_jobs_retried")
+                    await asyncio.sleep(0.25 * 2 ** (attempt - 1))
+                except Exception as e:
+                    logger.error(f"[TWILIO] {label} failed: {e}"); ok = False
+                    break
+            _metric_observe(f"twilio_job_ms.{label}", (time.perf_counter() - t0) * 1000.0)
+            _metric_inc(f"twilio_jobs_{'ok' if ok else 'failed'}.{label}")
+            return ok
+        task = asyncio.create_task(job())
+        self._jobs.add(task); task.add_done_callback(self._jobs.discard)
+        return task
+
+    def submit_hangup(self, call_sid: str, app_base_url: str) -> asyncio.Task:
+        return self.submit("hangup", self.hangup, call_sid, app_base_url)
+
+    async def aclose(self, grace_s: float = 5.0):
+        if self._jobs:
+            await asyncio.wait(list(self._jobs), timeout=grace_s)
+        if self._client is not None:
+            await self._client.aclose(); self._client = None
+
+twilio_control = TwilioControl()
+
+# ---------- Filler audio ----------
+# When an answer's first sentence is late, a short acknowledgement covers the dead air. Clips are
+# synthesized once per voice (and kept in the artifact store), then streamed from memory; once
+# real audio is queued the clip stops at its next pause instead of mid-word.
+FILLER_ENABLED = os.getenv("FILLER_ENABLED", "1") == "1"
+FILLER_DEADLINE_MS = int(os.getenv("FILLER_DEADLINE_MS", "900"))
+FILLER_MAX_PER_CALL = int(os.getenv("FILLER_MAX_PER_CALL", "3"))
+FILLER_MIN_GAP_S = float(os.getenv("FILLER_MIN_GAP_S", "20"))
+FILLER_PHRASES = _parse_env_list("FILLER_PHRASES") or ["Einen Moment, bitte…"]
+FILLER_CUT_MAX_MS = int(os.getenv("FILLER_CUT_MAX_MS", "250"))  # longest we keep playing to reach a pause
+FILLER_MAX_AHEAD_MS = int(os.getenv("FILLER_MAX_AHEAD_MS", "160"))  # short lead, so a cut takes effect quickly
+FILLER_PAUSE_LEVEL = int(os.getenv("FILLER_PAUSE_LEVEL", "250"))  # mean |sample| of a 20 ms frame inside a pause
+
+# Idle reaper: a caller who stays silent gets one cached IDLE_PROMPT_TEXT, then the call is hung up
+# (REST hangup + closing the stream releases ASR, TTS, socket and tasks). A stream that stops
+# delivering media is hung up without asking. "observe" only measures: no prompt, no hangup, and
+# the minutes each call stayed open after it would have been reaped go to idle_reclaimable_min.
+IDLE_REAPER = os.getenv("IDLE_REAPER", "on").strip().lower()  # on | observe | off
+IDLE_SILENCE_S = float(os.getenv("IDLE_SILENCE_S", "20"))       # caller silent (VAD) while the bot is quiet
+IDLE_PROMPT_WAIT_S = float(os.getenv("IDLE_PROMPT_WAIT_S", "8"))  # after the prompt has played
+IDLE_MEDIA_TIMEOUT_S = float(os.getenv("IDLE_MEDIA_TIMEOUT_S", "10"))  # no inbound media frames at all
+IDLE_CHECK_S = float(os.getenv("IDLE_CHECK_S", "1"))
+IDLE_PROMPT_TEXT = os.getenv("IDLE_PROMPT_TEXT", "Sind Sie noch da?")
+
+class FillerClip:
+    __slots__ = ("text", "audio", "ms", "cuts", "kind")
+    def __init__(self, text: str, audio: bytes, kind: str = "filler"):
+        self.text, self.audio, self.ms, self.kind = text, audio, len(audio) / 8.0, kind
+        # Byte offsets of quiet 20 ms frames: stopping there doesn't chop a word
+        self.cuts = [i for i in range(0, len(audio), 160) if mulaw_level(audio[i:i+160]) < FILLER_PAUSE_LEVEL]
+        self.cuts.append(len(audio))
+
+    def cut_at(self, pos: int) -> int:
+        """Where to stop once real audio is waiting: the next pause, unless that's too far off."""
+        c = next(c for c in self.cuts if c >= pos)
+        return c if c - pos <= FILLER_CUT_MAX_MS * 8 else pos
+
+class FillerCache:
+    def __init__(self):
+        self._clips: dict = {}  # tts_cache_ns -> [FillerClip, ...]
+        self._prompts: dict = {}  # (tts_cache_ns, text) -> FillerClip (kind "prompt", e.g. the idle prompt)
+        self._loading: set = set()
+        self._failed: dict = {}  # tts_cache_ns -> monotonic time of the last failed attempt
+        self._lock = threading.Lock()
+        self._rr = 0
+
+    def ensure(self, prof: LowLatencyReceptionist):
+        """Blocking (synthesizes what the artifact store doesn't have); run in a worker thread."""
+        ns = prof.tts_cache_ns
+        with self._lock:
+            if ns in self._clips or ns in self._loading: return
+            if time.monotonic() - self._failed.get(ns, -60.0) < 60.0: return
+            self._loading.add(ns)
+        try:
+            self._load(prof, ns)
         except Exception as e:
-            logger.error(f"[HANGUP] Direct hangup error: {e}")
+            self._failed[ns] = time.monotonic()
+            logger.warning("[FILLER] could not prepare clips for %s: %s", ns, e)
+        finally:
+            with self._lock: self._loading.discard(ns)
+
+    def _load(self, prof: LowLatencyReceptionist, ns: str):
+        clips, synth, ready = [], None, 0
+        wanted = [(t, "filler") for t in FILLER_PHRASES] if FILLER_ENABLED else []
+        if IDLE_REAPER == "on" and IDLE_PROMPT_TEXT: wanted.append((IDLE_PROMPT_TEXT, "prompt"))
+        for text, kind in wanted:
+            key = hashlib.sha256(json.dumps([ARTIFACT_VERSION, ns, text]).encode("utf-8")).hexdigest()[:24]
+            audio = artifact_load("audio", key)
+            if audio is None:
+                synth = synth or prof.make_tts()
+                res = synth.speak_ssml_async(auto_ssml(text, lang="de-DE", voice=prof.voice)).get()
+                audio = bytes(res.audio_data or b"")
+                if not audio:
+                    logger.warning("[FILLER] synthesis of %r failed (%s)", text, res.reason); continue
+                artifact_save("audio", key, audio)
+            clip = FillerClip(text, audio, kind); ready += 1
+            if kind == "filler": clips.append(clip)
+            else: self._prompts[(ns, text)] = clip
+        with self._lock: self._clips[ns] = clips
+        logger.info("[FILLER] %d/%d clip(s) ready for %s", ready, len(wanted), ns)
+
+    def pick(self, prof: LowLatencyReceptionist) -> Optional[FillerClip]:
+        clips = self._clips.get(prof.tts_cache_ns)
+        if not clips: return None
+        self._rr += 1
+        return clips[self._rr % len(clips)]
+
+    def prompt(self, prof: LowLatencyReceptionist, text: str) -> Optional[FillerClip]:
+        return self._prompts.get((prof.tts_cache_ns, text))
+
+filler_cache = FillerCache()
+
+# ---------- Call sessions ----------
+CALL_FINAL_QUEUE_MAX = int(os.getenv("CALL_FINAL_QUEUE_MAX", "16"))    # caller finals; overflow drops the oldest
+CALL_TTS_QUEUE_MAX = int(os.getenv("CALL_TTS_QUEUE_MAX", "32"))        # sentences to speak; a full queue pauses the LLM reader
+# Synthesized audio has no cap of its own: each sentence gets a fresh queue, so it holds at most one
+# sentence of audio (LLM max_tokens bounds that), and dropping a chunk would cut the sentence mid-word.
+CALL_TEARDOWN_TIMEOUT_S = float(os.getenv("CALL_TEARDOWN_TIMEOUT_S", "3"))
+
+SESSIONS: dict = {}                   # id -> live CallSession
+_closed_sessions = weakref.WeakSet()  # closed but not yet garbage-collected: anything lingering here leaks
+_session_ids = iter(range(1, 1 << 62))
+
+def _put_drop_oldest(q: asyncio.Queue, item, label: str):
+    if q.full():
+        try: q.get_nowait()
+        except asyncio.QueueEmpty: pass
+        _metric_inc(f"queue_overflow_{label}")
+    q.put_nowait(item)
+
+def _put_drop_newest(q: asyncio.Queue, item, label: str):
+    try: q.put_nowait(item)
+    except asyncio.QueueFull: _metric_inc(f"queue_overflow_{label}")
+
+def _drain(q: asyncio.Queue):
+    try:
+        while True: q.get_nowait()
+    except asyncio.QueueEmpty:
+        pass
+
+def _deep_size(obj, _seen=None) -> int:
+    """Rough bytes held by plain containers, strings and log records (not SDK objects)."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen: return 0
+    seen.add(id(obj)); size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, deque)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    elif isinstance(obj, logging.LogRecord):
+        size += _deep_size(obj.__dict__, seen)
+    return size
+
+class SynthesisFailed(Exception):
+    """Queued in place of audio when Azure cancels a synthesis with an error."""
+
+class CallSession:
+    """
+    Everything one call owns: ids, the Azure recognizer/synthesizer, queues, tasks and conversation
+    state. Tasks are started through spawn() so close() can cancel and await all of them; close()
+    then stops ASR, detaches the SDK callbacks and drops every reference, so a finished call can be
+    garbage-collected (closed sessions that linger show up on /debug/sessions).
+    """
+    __slots__ = ("id", "call_sid", "stream_sid", "started", "app_base_url", "loop", "log",
+                 "profile", "recognizer", "push_stream", "synthesizer",
+                 "history", "call_state", "eot", "playback",
+                 "final_q", "tts_q", "chunk_q", "tasks", "llm_task",
+                 "turn", "greeted", "tts_busy", "tts_cancel", "allow_hangup", "interaction_started",
+                 "last_bot_asked_question", "last_tts_start_ms", "last_tts_end_ms",
+                 "last_assistant_sentence_ms", "speech_streak", "end_called", "closed",
+                 "asr_mulaw", "asr_restarting", "failovers", "returning", "last_user_media_ms",
+                 "idle_prompted_ms", "idle_would_reap_ms", "fillers", "filler_last_t", "filler_turn", "filler_t0", "filler_ms", "filler_ready_t", "filler_saved_ms",
+                 "__weakref__")
+
+    def __init__(self, app_base_url: str, log: CallLog):
+        now_ms = time.time() * 1000.0
+        self.id = next(_session_ids); self.call_sid = None; self.stream_sid = None
+        self.started = time.time(); self.app_base_url = app_base_url
+        self.loop = asyncio.get_running_loop(); self.log = log
+        # Azure ASR/TTS are built on the Twilio "start" event, once we know the tenant profile
+        self.profile = tenants.get(DEFAULT_TENANT)
+        self.recognizer = self.push_stream = self.synthesizer = None
+        self.asr_mulaw = self.asr_restarting = False; self.failovers = 0
+        self.history = []
+        self.call_state = {
+            "contact": {
+                "name": None,
+                "phone": None,
+                "email": None,
+                "address": {"street": None, "house": None, "postal": None, "city": None}
+            },
+            "meta": {"greeted": False, "last_saved_pair": None}  # track last saved (name, phone)
+        }
+        self.eot = EndOfTurnDetector(); self.playback = PlaybackTracker()
+        self.final_q = asyncio.Queue(CALL_FINAL_QUEUE_MAX)
+        self.tts_q = asyncio.Queue(CALL_TTS_QUEUE_MAX)
+        self.chunk_q: Optional[asyncio.Queue] = None
+        self.tasks: set = set(); self.llm_task: Optional[asyncio.Task] = None
+        self.turn = 0; self.greeted = False
+        self.tts_busy = self.tts_cancel = False
+        # Only allow hangup after the caller has spoken once
+        self.allow_hangup = self.interaction_started = self.last_bot_asked_question = False
+        self.last_tts_start_ms = 0.0; self.last_tts_end_ms = self.last_assistant_sentence_ms = now_ms
+        self.speech_streak = 0
+        self.end_called = self.closed = False
+        self.returning = False
+        self.last_user_media_ms = now_ms; self.idle_prompted_ms = self.idle_would_reap_ms = 0.0
+        self.fillers = 0; self.filler_last_t = 0.0; self.filler_turn = None
+        self.filler_t0 = self.filler_ms = self.filler_ready_t = self.filler_saved_ms = 0.0
+        SESSIONS[self.id] = self
+
+    # ---- tasks ----
+    def spawn(self, coro, name: str) -> asyncio.Task:
+        task = asyncio.create_task(coro, name=f"{name}#{self.id}")
+        self.tasks.add(task); task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("[CALL] task %s failed: %r", task.get_name(), task.exception())
+
+    def next_turn(self) -> int:
+        self.turn += 1; self.log.turn = self.turn
+        return self.turn
+
+    # ---- Azure speech (callbacks run on SDK threads) ----
+    def _on_recognized(self, evt):
+        if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech and evt.result.text:
+            txt = evt.result.text.strip()
+            if txt:
+                ep = getattr(self.recognizer, "speech_endpoint", None)
+                if ep is not None and self.eot.last_voice_ms:
+                    lag = time.time() * 1000.0 - self.eot.last_voice_ms  # end of caller speech -> final
+                    if lag > 0: ep.record_latency("asr", lag)
+                    ep.record_success()
+                self.loop.call_soon_threadsafe(_put_drop_oldest, self.final_q, txt, "final")
+
+    def _on_asr_canceled(self, evt):
+        details = getattr(evt, "cancellation_details", None)
+        if self.closed or getattr(details, "reason", None) != speechsdk.CancellationReason.Error: return
+        self.loop.call_soon_threadsafe(self._asr_failed, getattr(details, "error_details", "") or "canceled")
+
+    def _on_recognizing(self, _evt):
+        self.eot.on_partial()
+
+    def _on_synth(self, evt):
+        q = self.chunk_q
+        if evt and evt.result and evt.result.audio_data and q is not None:
+            self.loop.call_soon_threadsafe(q.put_nowait, evt.result.audio_data)
+
+    def _on_synth_done(self, _evt):
+        q = self.chunk_q
+        if q is not None:
+            self.loop.call_soon_threadsafe(q.put_nowait, None)  # end marker
+
+    def _on_synth_canceled(self, evt):
+        q = self.chunk_q
+        if q is None: return
+        details = getattr(getattr(evt, "result", None), "cancellation_details", None)
+        if getattr(details, "reason", None) == speechsdk.CancellationReason.Error:
+            err = SynthesisFailed(getattr(details, "error_details", "") or "synthesis canceled")
+            self.loop.call_soon_threadsafe(q.put_nowait, err)
+        else:
+            self.loop.call_soon_threadsafe(q.put_nowait, None)
+
+    def _attach_asr(self, rec):
+        rec.recognized.connect(self._on_recognized)
+        rec.recognizing.connect(self._on_recognizing)
+        rec.canceled.connect(self._on_asr_canceled)
+        rec.start_continuous_recognition_async()
+
+    def _attach_synth(self, synth):
+        synth.synthesizing.connect(self._on_synth)
+        synth.synthesis_completed.connect(self._on_synth_done)
+        synth.synthesis_canceled.connect(self._on_synth_canceled)
+
+    def start_speech(self, prof: "LowLatencyReceptionist"):
+        self.profile = prof; self.call_state["profile"] = prof
+        self.recognizer, self.push_stream = prof.make_asr()
+        self.asr_mulaw = prof.asr_ingest == "mulaw"
+        self._attach_asr(self.recognizer)
+        # One synthesizer per call (replaced only on failover)
+        self.synthesizer = speech_pool.take(prof)
+        self._attach_synth(self.synthesizer)
+        logger.info("[SPEECH] endpoints: asr=%s tts=%s", self.recognizer.speech_endpoint.name,
+                    self.synthesizer.speech_endpoint.name)
+        if FILLER_ENABLED or IDLE_REAPER == "on":
+            self.loop.run_in_executor(None, filler_cache.ensure, prof)  # no-op once the voice is cached
+
+    def _failover_allowed(self, kind: str) -> bool:
+        if self.closed or self.failovers >= SPEECH_FAILOVERS_PER_CALL:
+            _metric_inc(f"speech_failover_refused_{kind}"); return False
+        return True
 
-        # B) Redirect to TwiML Hangup
+    def _asr_failed(self, err: str):
+        ep = getattr(self.recognizer, "speech_endpoint", None)
+        if ep is not None: ep.record_failure("asr", err)
+        logger.warning("[SPEECH] recognizer on %s canceled: %s", ep.name if ep else "?", err)
+        if not self.asr_restarting and self._failover_allowed("asr"):
+            self.asr_restarting = True
+            self.spawn(self.fail_over_asr(ep), "asr-failover")
+
+    async def fail_over_asr(self, old_ep: Optional[SpeechEndpoint]):
+        """New recognizer on the best other endpoint; the caller's audio goes there from the next frame."""
         try:
-            hangup_url = f"{app_base_url}/hangup-twiml"
-            r2 = await c.post(base, data={"Url": hangup_url, "Method": "GET"}, auth=auth)
-            if r2.status_code // 100 == 2:
-                logger.info(f"[HANGUP] Redirected to {hangup_url} (Twiml <Hangup/>) using {auth_mode}.")
-                return True
-            if r2.status_code == 401:
-                logger.error(
-                    "[HANGUP] 401 Unauthorized from Twilio.\n"
-                    " • TWILIO_ACCOUNT_SID must match the (sub)account that owns the CallSid.\n"
-                    " • API keys or Auth Token must be for that SAME (sub)account.\n"
-                    " • Ensure live creds, no trailing spaces.\n"
-                )
-            else:
-                logger.error(f"[HANGUP] Redirect failed ({r2.status_code}): {r2.text[:300]}")
-        except Exception as e:
-            logger.error(f"[HANGUP] Redirect hangup error: {e}")
+            self.failovers += 1
+            ep = speech_router.pick("asr", exclude=(old_ep,))
+            rec, push = await asyncio.to_thread(self.profile.make_asr, ep)
+            if self.closed:
+                push.close(); return
+            old_rec, old_push = self.recognizer, self.push_stream
+            self.recognizer, self.push_stream = rec, push
+            self._attach_asr(rec)
+            _metric_inc("speech_failovers_asr")
+            logger.warning("[SPEECH] ASR failed over %s -> %s", old_ep.name if old_ep else "?", ep.name)
+            await self._release_asr(old_rec, old_push)
+        finally:
+            self.asr_restarting = False
+
+    def fail_over_tts(self, err) -> bool:
+        """Swap the call's synthesizer for one on the best other endpoint. False if there is none."""
+        old = self.synthesizer
+        old_ep = getattr(old, "speech_endpoint", None)
+        if old_ep is not None: old_ep.record_failure("tts", err)
+        if not self._failover_allowed("tts"): return False
+        ep = speech_router.pick("tts", exclude=(old_ep,))
+        if ep is old_ep: return False
+        self.failovers += 1
+        self.synthesizer = speech_pool.take(self.profile, ep)
+        self._attach_synth(self.synthesizer)
+        self._release_synth(old)
+        _metric_inc("speech_failovers_tts")
+        logger.warning("[SPEECH] TTS failed over %s -> %s (%s)", old_ep.name if old_ep else "?", ep.name, err)
+        return True
 
-    return False
+    async def _release_asr(self, rec, push):
+        if push is not None:
+            try: push.close()
+            except Exception: pass
+        if rec is not None:
+            try:
+                await asyncio.wait_for(asyncio.to_thread(lambda: rec.stop_continuous_recognition_async().get()),
+                                       CALL_TEARDOWN_TIMEOUT_S)
+            except Exception as e:
+                logger.warning("[CALL] recognizer stop: %r", e)
+            for sig in (rec.recognized, rec.recognizing, rec.canceled):
+                try: sig.disconnect_all()
+                except Exception: pass
+
+    @staticmethod
+    def _release_synth(synth):
+        if synth is None: return
+        try: synth.stop_speaking_async()
+        except Exception: pass
+        for sig in (synth.synthesizing, synth.synthesis_completed, synth.synthesis_canceled):
+            try: sig.disconnect_all()
+            except Exception: pass
+        conn = getattr(synth, "warm_connection", None)
+        if conn is not None:
+            try: conn.close()
+            except Exception: pass
+
+    async def _stop_speech(self):
+        rec, push, synth = self.recognizer, self.push_stream, self.synthesizer
+        self.recognizer = self.push_stream = self.synthesizer = None
+        await self._release_asr(rec, push)
+        self._release_synth(synth)
+
+    # ---- teardown ----
+    async def close(self):
+        """Idempotent: cancel and await every task, release ASR/TTS, drop state."""
+        if self.closed: return
+        self.closed = True
+        me = asyncio.current_task()
+        pending = [t for t in self.tasks if t is not me]
+        for t in pending: t.cancel()
+        if pending:
+            _, stuck = await asyncio.wait(pending, timeout=CALL_TEARDOWN_TIMEOUT_S)
+            if stuck:
+                _metric_inc("call_tasks_stuck", len(stuck))
+                logger.error("[CALL] %d task(s) did not stop: %s", len(stuck), [t.get_name() for t in stuck])
+        await self._stop_speech()
+        _drain(self.final_q); _drain(self.tts_q)
+        self.chunk_q = self.llm_task = None
+        SESSIONS.pop(self.id, None); _closed_sessions.add(self)
+        _metric_inc("calls_closed")
+
+    def preload_caller(self, entry: dict):
+        """Returning caller: start with the contact we already have (and don't save it again)."""
+        contact = self.call_state["contact"]
+        contact["name"], contact["phone"] = entry["name"], entry["phone"]
+        self.call_state["meta"]["returning"] = True
+        self.call_state["meta"]["last_saved_pair"] = (entry["name"], entry["phone"])
+        self.returning = True
+        _metric_inc("calls_returning")
+        logger.info("[CALLER] returning caller %s; name and phone preloaded", entry["name"])
+
+    def greeting(self) -> Optional[str]:
+        prof = self.profile
+        if self.returning and prof.returning_greeting:
+            return prof.returning_greeting.replace("{name}", self.call_state["contact"]["name"] or "")
+        return prof.greeting
+
+    def filler_allowed(self) -> bool:
+        """Per-call limits: at most FILLER_MAX_PER_CALL, at least FILLER_MIN_GAP_S apart."""
+        return self.fillers < FILLER_MAX_PER_CALL and time.monotonic() - self.filler_last_t >= FILLER_MIN_GAP_S
+
+    def info(self) -> dict:
+        return {
+            "id": self.id, "callSid": self.call_sid, "streamSid": self.stream_sid,
+            "tenant": self.profile.name if self.profile else None,
+            "age_s": round(time.time() - self.started, 1), "turn": self.turn,
+            "tasks": sorted(t.get_name() for t in self.tasks),
+            "queues": {"final": self.final_q.qsize(), "tts": self.tts_q.qsize(),
+                       "audio": self.chunk_q.qsize() if self.chunk_q is not None else 0},
+            "history_turns": len(self.history),
+            "approx_bytes": _deep_size(self.history) + _deep_size(self.call_state["contact"])
+                            + (_deep_size(self.log.ring) if self.log.ring is not None else 0),
+        }
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return 0
 
 # ---------- WebSocket media loop ----------
+async def send_media_frame(stream_sid: str, frame: bytes):
+    """One μ-law frame to Twilio (module-level so the hot-path counters can wrap it)."""
+    await websocket.send(json.dumps({"event": "media", "streamSid": stream_sid,
+                                     "media": {"payload": base64.b64encode(frame).decode("ascii")}}))
+
 @app.websocket("/media")
 async def media():
     subs = getattr(websocket, "subprotocols", []) or []
@@ -742,8 +2680,8 @@ async def media():
         await websocket.accept(subprotocol="audio")
     else:
         await websocket.accept()
+    call_log = CallLog(); _call_log.set(call_log)  # inherited by every task this handler starts
     logger.info("WebSocket connected.")
-    stream_sid = None
 
     # Build base URL for TwiML redirect fallback (no request context in WS!)
     app_base_url = os.getenv("APP_BASE_URL")
@@ -756,197 +2694,306 @@ async def media():
         else:
             # Twilio will fetch TwiML over HTTPS, not WSS.
             app_base_url = f"https://{host}"
-    logger.info(f"[WS] app_base_url set to {app_base_url}")
-
-    # Per-call state
-    history = []
-    greeted = False
-    # --- INIT UPDATED: include email + full address container ---
-    call_state = {
-        "contact": {
-            "name": None,
-            "phone": None,
-            "email": None,
-            "address": {"street": None, "house": None, "postal": None, "city": None}
-        },
-        "meta": {"greeted": False, "last_saved_pair": None}  # <-- NEW: track last saved (name, phone)
-    }
+    logger.debug("[WS] app_base_url set to %s", app_base_url)
 
-    # Turn control
-    current_turn = {"id": 0}
-    llm_task: Optional[asyncio.Task] = None
-
-    # TTS pipeline
-    tts_queue: asyncio.Queue = asyncio.Queue()
-    tts_busy = False
-    tts_cancel = False
-    last_tts_start_ms = 0.0
+    s = CallSession(app_base_url, call_log)
+    history, call_state, eot, playback = s.history, s.call_state, s.eot, s.playback
     FRAME = 160  # 20 ms @ 8k μ-law
-
-    # Barge-in
-    speech_streak_frames = 0
-    REQ_STREAK_FRAMES = 5
-
-    # Other state
-    POST_TTS_GUARD_MS = int(os.getenv("POST_TTS_GUARD_MS", "1500"))
-    last_user_media_ms = time.time() * 1000.0
-    last_tts_end_ms = time.time() * 1000.0
-    last_bot_asked_question = False
-    last_assistant_sentence_ms = time.time() * 1000.0
-    interaction_started = False
-    # Only allow hangup after the caller has spoken once
-    allow_hangup = False
-
-    smooth_task: Optional[asyncio.Task] = None
-    call_sid_for_rest: Optional[str] = None
-    end_called = False
-
-    # Azure ASR
-    recognizer, push_stream = state.make_asr()
-    loop = asyncio.get_event_loop()
-
-    final_queue: asyncio.Queue = asyncio.Queue()
-    def on_recognized(evt: speechsdk.SpeechRecognitionEventArgs):
-        if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech and evt.result.text:
-            txt = evt.result.text.strip()
-            if txt:
-                loop.call_soon_threadsafe(final_queue.put_nowait, txt)
-    recognizer.recognized.connect(on_recognized)
-    recognizer.start_continuous_recognition_async()
-
-    # Create ONE synthesizer per call
-    synthesizer = state.make_tts()
-    current_chunk_q: Optional[asyncio.Queue] = None
-
-    def _tts_on_synth(evt: speechsdk.SpeechSynthesisEventArgs):
-        try:
-            if evt and evt.result and evt.result.audio_data and current_chunk_q is not None:
-                loop.call_soon_threadsafe(current_chunk_q.put_nowait, evt.result.audio_data)
-        except Exception as e:
-            logger.error(f"TTS on_synth error: {e}")
-
-    def _tts_on_completed(_evt):
-        try:
-            if current_chunk_q is not None:
-                loop.call_soon_threadsafe(current_chunk_q.put_nowait, None)
-        except Exception:
-            pass
-
-    synthesizer.synthesizing.connect(_tts_on_synth)
-    synthesizer.synthesis_completed.connect(_tts_on_completed)
-    synthesizer.synthesis_canceled.connect(_tts_on_completed)
+    REQ_STREAK_FRAMES = 5  # barge-in after 100 ms of caller speech
 
     async def tts_worker():
-        nonlocal tts_busy, tts_cancel, last_tts_start_ms, last_tts_end_ms, stream_sid, current_chunk_q, allow_hangup
         while True:
-            item = await tts_queue.get()
-            if item is None: break
-            item_turn, text = item
-            if item_turn != current_turn["id"]: continue
+            item_turn, text = await s.tts_q.get()
+            if item_turn != s.turn: continue
+            if isinstance(text, FillerClip):
+                await _play_filler(item_turn, text); continue
             try:
-                tts_busy = True; tts_cancel = False
-                last_tts_start_ms = time.time() * 1000.0
+                s.tts_busy = True; s.tts_cancel = False
+                s.last_tts_start_ms = time.time() * 1000.0
                 if getattr(websocket, "closed", False): break
-                chunk_q: asyncio.Queue = asyncio.Queue()
-                current_chunk_q = chunk_q
-                ssml = auto_ssml(text, lang="de-DE", voice=os.getenv("AZURE_TTS_VOICE"))
-                synth_coro = asyncio.to_thread(synthesizer.speak_ssml_async(ssml).get)
-                next_tick = time.perf_counter(); sent_frames = 0
+                ssml = auto_ssml(text, lang="de-DE", voice=s.profile.voice)
+                playback.begin_segment(item_turn, text); sent_frames = 0
+                chunk_q, synth_fut, t_synth, failed = _start_synthesis(ssml)
                 while True:
-                    if tts_cancel or getattr(websocket, "closed", False):
-                        try: await websocket.send(json.dumps({"event": "clear", "streamSid": stream_sid}))
-                        except Exception: pass
+                    if s.tts_cancel or getattr(websocket, "closed", False):
+                        await _send_clear()
+                        break
+                    if t_synth:  # no audio yet from this synthesizer
+                        try: chunk = await asyncio.wait_for(chunk_q.get(), SPEECH_TTFC_TIMEOUT_S)
+                        except asyncio.TimeoutError:
+                            chunk = SynthesisFailed(f"no audio after {SPEECH_TTFC_TIMEOUT_S:.0f}s")
+                    else:
+                        chunk = await chunk_q.get()
+                    if isinstance(chunk, SynthesisFailed):
+                        failed = True
+                        # Move the call to another endpoint; say the sentence again there if none of it went out
+                        if s.fail_over_tts(chunk) and not sent_frames and not s.tts_cancel:
+                            chunk_q, synth_fut, t_synth, failed = _start_synthesis(ssml)
+                            continue
                         break
-                    chunk = await chunk_q.get()
                     if chunk is None: break
+                    if t_synth:
+                        ep = s.synthesizer.speech_endpoint
+                        ep.record_latency("tts", (time.perf_counter() - t_synth) * 1000.0); ep.record_success()
+                        t_synth = 0.0
                     i, n = 0, len(chunk)
-                    while not tts_cancel and i < n and not getattr(websocket, "closed", False):
+                    while not s.tts_cancel and i < n and not getattr(websocket, "closed", False):
                         frame = chunk[i:i+FRAME]; i += len(frame)
                         if not frame: break
-                        payload = base64.b64encode(frame).decode("ascii")
+                        # Paced by Twilio's acks: at most PLAYBACK_MAX_AHEAD_MS buffered ahead of real time
+                        await playback.wait_capacity()
+                        if s.tts_cancel: break
                         try:
-                            await websocket.send(json.dumps({"event": "media", "streamSid": stream_sid, "media": {"payload": payload}}))
+                            await send_media_frame(s.stream_sid, frame)
                         except Exception:
-                            tts_cancel = True; break
+                            s.tts_cancel = True; break
+                        playback.on_frame(len(frame) / 8.0)  # 8 μ-law bytes per ms
                         sent_frames += 1
-                        next_tick += 0.02
-                        delay = next_tick - time.perf_counter()
-                        if delay > 0: await asyncio.sleep(delay)
-                logger.info(f"[TTS-streaming] frames sent: {sent_frames}")
-                try: await synth_coro
+                        if sent_frames == 1:
+                            eot.on_first_audio(item_turn)
+                            if s.filler_turn == item_turn: _filler_landed()
+                        if sent_frames % PLAYBACK_MARK_EVERY_FRAMES == 0: await _send_mark()
+                logger.debug("[TTS-streaming] frames sent: %d", sent_frames)
+                try:
+                    if not failed: await asyncio.to_thread(synth_fut.get)  # a failed one may never resolve
                 except Exception: pass
-                finally: current_chunk_q = None
-                last_tts_end_ms = time.time() * 1000.0
-                if not getattr(websocket, "closed", False) and item_turn == current_turn["id"]:
-                    try: await websocket.send(json.dumps({"event": "mark", "streamSid": stream_sid, "mark": {"name": "tts-end"}}))
-                    except Exception: pass
-
-                if says_goodbye(text) and item_turn == current_turn["id"]:
-                    if allow_hangup:
-                        logger.info("[HANGUP] Goodbye phrase spoken; ending call (armed).")
+                finally: s.chunk_q = None
+                s.last_tts_end_ms = time.time() * 1000.0
+                if not s.tts_cancel and sent_frames and sent_frames % PLAYBACK_MARK_EVERY_FRAMES:
+                    await _send_mark()  # sentence boundary
+
+                if says_goodbye(text) and item_turn == s.turn:
+                    if s.allow_hangup:
+                        # Hang up once Twilio confirms the farewell was played, not when we finished sending it
+                        drained = await playback.wait_drained(playback.ahead_ms() / 1000.0 + PLAYBACK_DRAIN_GRACE_S)
+                        logger.info("[HANGUP] Goodbye phrase spoken; ending call (armed, playout confirmed=%s).", drained)
                         await _end_call_and_close()
                         break
                     else:
                         logger.info("[HANGUP] Goodbye phrase in bot output ignored (not armed yet).")
             except Exception as e:
-                logger.error(f"TTS worker error: {e}")
+                logger.error("TTS worker error: %s", e)
             finally:
-                tts_busy = False
-    asyncio.create_task(tts_worker())
+                s.tts_busy = False
+
+    def _start_synthesis(ssml: str):
+        chunk_q: asyncio.Queue = asyncio.Queue()  # one sentence of audio; unbounded on purpose (see CALL_TTS_QUEUE_MAX)
+        s.chunk_q = chunk_q
+        return chunk_q, s.synthesizer.speak_ssml_async(ssml), time.perf_counter(), False
+
+    async def _play_filler(turn_id: int, clip: FillerClip):
+        s.tts_busy = True; s.tts_cancel = False
+        playback.begin_filler()
+        if clip.kind == "filler":
+            s.filler_turn, s.filler_t0, s.filler_ms, s.filler_ready_t = turn_id, time.perf_counter(), clip.ms, 0.0
+        pos, end, frames, cut = 0, len(clip.audio), 0, False
+        try:
+            while not s.tts_cancel and turn_id == s.turn and not getattr(websocket, "closed", False):
+                if not cut and not s.tts_q.empty():
+                    cut, end = True, clip.cut_at(pos)  # the answer is ready: finish the current word, then yield
+                    if end < len(clip.audio): _metric_inc("filler_cut")
+                if pos >= end: break
+                await playback.wait_capacity(FILLER_MAX_AHEAD_MS)
+                frame = clip.audio[pos:pos+FRAME]; pos += len(frame)
+                try:
+                    await send_media_frame(s.stream_sid, frame)
+                except Exception:
+                    s.tts_cancel = True; break
+                playback.on_frame(len(frame) / 8.0)
+                frames += 1
+                if frames % PLAYBACK_MARK_EVERY_FRAMES == 0: await _send_mark()
+            if frames % PLAYBACK_MARK_EVERY_FRAMES: await _send_mark()
+        finally:
+            s.tts_busy = False
+
+    def _filler_answer_ready():
+        # Without the filler the caller would have heard silence from its start until now
+        s.filler_ready_t = time.perf_counter()
+        saved = min((s.filler_ready_t - s.filler_t0) * 1000.0, s.filler_ms)
+        s.filler_saved_ms += saved; _metric_observe("filler_silence_saved_ms", saved)
+
+    def _filler_landed():
+        # First real frame: what the filler cost is how long the answer waited behind it
+        s.filler_turn = None
+        if s.filler_ready_t:
+            delay = (time.perf_counter() - s.filler_ready_t) * 1000.0 + playback.ahead_ms()
+            _metric_observe("filler_answer_delay_ms", delay)
+
+    async def _filler_after(turn_id: int):
+        await asyncio.sleep(FILLER_DEADLINE_MS / 1000.0)
+        # Still nothing queued for this turn (we'd have been cancelled); only fill actual silence
+        if turn_id != s.turn or s.tts_busy or playback.ahead_ms() > 0: return
+        _metric_inc("filler_due")
+        if not s.filler_allowed():
+            _metric_inc("filler_rate_limited"); return
+        clip = filler_cache.pick(s.profile)
+        if clip is None:
+            _metric_inc("filler_not_cached"); return
+        s.fillers += 1; s.filler_last_t = time.monotonic(); _metric_inc("filler_fired")
+        logger.debug("[FILLER] turn %d: no sentence after %d ms, playing %r", turn_id, FILLER_DEADLINE_MS, clip.text)
+        _put_drop_newest(s.tts_q, (turn_id, clip), "tts")
+
+    async def _send_mark():
+        try: await websocket.send(json.dumps({"event": "mark", "streamSid": s.stream_sid, "mark": {"name": playback.next_mark()}}))
+        except Exception: pass
+
+    def _trim_to_heard(turn_id: Optional[int]):
+        # History should hold what the caller heard, not what the LLM wrote
+        entry = playback.history_entries.get(turn_id)
+        if entry is None: return
+        heard = playback.heard_text(turn_id)
+        if heard:
+            entry["content"] = heard
+        elif entry in history:
+            history.remove(entry)
+        logger.info("[PLAYBACK] barge-in: caller heard %r", heard)
+
+    async def _send_clear(t0: Optional[float] = None):
+        try: await websocket.send(json.dumps({"event": "clear", "streamSid": s.stream_sid}))
+        except Exception: pass
+        if playback.on_clear(t0):
+            _trim_to_heard(playback.playing_turn)
 
     async def speak_llm_stream(turn_id: int, user_text: str):
-        nonlocal last_bot_asked_question, interaction_started, last_assistant_sentence_ms
         assistant_accum = []
-        async for sentence in llm_stream_sentences(history, user_text, call_state):
-            if turn_id != current_turn["id"]: break
-            s = sentence.strip()
-            if not s: continue
-            assistant_accum.append(s); interaction_started = True
-            last_bot_asked_question = s.endswith("?"); last_assistant_sentence_ms = time.time() * 1000.0
-            await tts_queue.put((turn_id, s))
-        full = " ".join(assistant_accum).strip()
-        if assistant_accum and not assistant_accum[-1].endswith("?"):
-            last_bot_asked_question = False
-        if full and turn_id == current_turn["id"]:
-            history.append({"role": "assistant", "content": full})
-            logger.info(f"[Bot] {full}")
+        filler = s.spawn(_filler_after(turn_id), "filler") if FILLER_ENABLED else None
+        try:
+            async for sentence in llm_stream_sentences(history, user_text, call_state):
+                if turn_id != s.turn or turn_id in playback.interrupted: break
+                text = sentence.strip()
+                if not text: continue
+                if filler is not None: filler.cancel(); filler = None
+                if s.filler_turn == turn_id and not s.filler_ready_t: _filler_answer_ready()
+                assistant_accum.append(text); s.interaction_started = True
+                s.last_bot_asked_question = text.endswith("?"); s.last_assistant_sentence_ms = time.time() * 1000.0
+                await s.tts_q.put((turn_id, text))  # full queue: wait for playback to catch up
+        finally:
+            if filler is not None: filler.cancel()
+            # Runs on cancellation too: an interrupted answer is recorded as far as it was heard
+            full = " ".join(assistant_accum).strip()
+            if assistant_accum and not assistant_accum[-1].endswith("?"):
+                s.last_bot_asked_question = False
+            interrupted = turn_id != s.turn or turn_id in playback.interrupted
+            content = playback.heard_text(turn_id) if interrupted else full
+            if content:
+                entry = {"role": "assistant", "content": content}
+                history.append(entry); playback.history_entries[turn_id] = entry
+                logger.info("[Bot] %s", content)
+                note_slot_offer(content, call_state)
+
+    def _expect_digits() -> bool:
+        # Bot just asked for the number and we don't have one yet -> caller is dictating digits
+        if call_state["contact"].get("phone"): return False
+        last_bot = next((m["content"] for m in reversed(history) if m["role"] == "assistant"), "")
+        return bool(re.search(r"nummer|telefon|number", last_bot, re.I))
 
     async def consume_finals():
-        nonlocal llm_task, tts_cancel, interaction_started, allow_hangup
         while True:
-            user_text = await final_queue.get()
-            allow_hangup = True
+            user_text = await s.final_q.get()
+            eot.on_final()
+            continuation = eot.is_continuation()  # judged on arrival; the hold below would blur it
+            # Hold briefly and coalesce finals that follow (caller still talking, "und ...", digits)
+            parts = [user_text]; first_final_ms = time.time() * 1000.0
+            while True:
+                wait_s = eot.hold_seconds(" ".join(parts), first_final_ms, _expect_digits())
+                if wait_s <= 0: break
+                try:
+                    parts.append(await asyncio.wait_for(s.final_q.get(), timeout=wait_s)); eot.on_final()
+                except asyncio.TimeoutError:
+                    pass  # re-evaluate: partials or voice may have pushed the deadline out
+            user_text = " ".join(parts)
+            s.allow_hangup = True
             # --- capture/update contact info every user final ---
             extract_contact(user_text, call_state); extract_address(user_text, call_state)
-            current_turn["id"] += 1; turn_id = current_turn["id"]; interaction_started = True
-            logger.info(f"[Caller] {user_text} | MEM: {call_state['contact']} | hangup_armed={allow_hangup}")
-            if llm_task and not llm_task.done():
-                llm_task.cancel()
-                try: await llm_task
-                except: pass
-            tts_cancel = True
-            try:
-                while True: _ = tts_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                pass
+            extract_booking(user_text, call_state); annotate_bookings(call_state)
+            turn_id = s.next_turn(); s.interaction_started = True
+            logger.info("[Caller] %s | hangup_armed=%s", user_text, s.allow_hangup)
+            logger.debug("[MEM] %s", call_state["contact"])
+            was_running = s.llm_task is not None and not s.llm_task.done()
+            if was_running:
+                s.llm_task.cancel(); eot.llm_cancelled += 1; _metric_inc("llm_requests_cancelled")
+                await asyncio.wait({s.llm_task})  # not `await task`: that would swallow our own cancellation
+            s.tts_cancel = True
+            if playback.ahead_ms() > 0: await _send_clear()
+            _drain(s.tts_q)
+            # Decided only now: during the hold the previous answer may have finished, and the cancelled
+            # one records whatever the caller heard. Either way history[-1] is no longer the caller's
+            # message and the new final is a turn of its own.
+            split = continuation and was_running and bool(history) and history[-1]["role"] == "user"
+            if split:
+                # Replace the cut-off user message with the merged utterance (one LLM request, not two)
+                user_text = history.pop()["content"] + " " + user_text
+                logger.info("[EOT] merged split utterance: %s", user_text)
+            eot.commit(turn_id, split=split)
             history.append({"role": "user", "content": user_text})
-            llm_task = asyncio.create_task(speak_llm_stream(turn_id, user_text))
-    asyncio.create_task(consume_finals())
-
-    async def _hangup_via_rest_or_redirect():
-        if call_sid_for_rest:
-            ok = await _hangup_via_twilio_rest(call_sid_for_rest, app_base_url)
-            if not ok:
-                logger.error("[HANGUP] REST/Redirect hangup did not succeed; closing WS anyway (Twilio may keep call).")
+            _metric_inc("llm_requests")
+            s.llm_task = s.spawn(speak_llm_stream(turn_id, user_text), "llm")
+
+    def _bot_active() -> bool:
+        return (s.tts_busy or playback.ahead_ms() > 0 or not s.tts_q.empty() or not s.final_q.empty()
+                or (s.llm_task is not None and not s.llm_task.done()))
+
+    async def _idle_watch():
+        # Silence counts from whichever is later: the caller's last voice/partial/final, or the bot going quiet
+        bot_quiet_ms = time.time() * 1000.0
+        while not s.end_called:
+            await asyncio.sleep(IDLE_CHECK_S)
+            now = time.time() * 1000.0
+            if now - s.last_user_media_ms >= IDLE_MEDIA_TIMEOUT_S * 1000.0:
+                if await _idle_reap("no_media", now): return
+                continue
+            if _bot_active():
+                bot_quiet_ms = now; continue
+            heard_ms = max(eot.last_voice_ms, eot.last_partial_ms, eot.last_final_ms)
+            if s.idle_prompted_ms and heard_ms > s.idle_prompted_ms:
+                s.idle_prompted_ms = 0.0
+                if IDLE_REAPER == "on": _metric_inc("idle_prompt_answered")
+            if s.idle_would_reap_ms and heard_ms > s.idle_would_reap_ms:
+                s.idle_would_reap_ms = 0.0; _metric_inc("idle_false_alarm")  # observe mode: caller came back
+            silent_ms = now - max(heard_ms, bot_quiet_ms, s.idle_prompted_ms)
+            if not s.idle_prompted_ms:
+                if silent_ms >= IDLE_SILENCE_S * 1000.0:
+                    s.idle_prompted_ms = now; _idle_prompt()
+            elif silent_ms >= IDLE_PROMPT_WAIT_S * 1000.0 and not s.idle_would_reap_ms:
+                if await _idle_reap("silent", now): return
+
+    def _idle_prompt():
+        _metric_inc("idle_prompted")
+        if IDLE_REAPER != "on":
+            logger.info("[IDLE] caller silent for %.0fs; would ask whether they are still there", IDLE_SILENCE_S); return
+        logger.info("[IDLE] caller silent for %.0fs; asking whether they are still there", IDLE_SILENCE_S)
+        turn_id = s.next_turn()
+        history.append({"role": "assistant", "content": IDLE_PROMPT_TEXT})
+        clip = filler_cache.prompt(s.profile, IDLE_PROMPT_TEXT)
+        _put_drop_newest(s.tts_q, (turn_id, clip if clip is not None else IDLE_PROMPT_TEXT), "tts")
+
+    async def _idle_reap(reason: str, now_ms: float) -> bool:
+        """Hang up an idle call (observe mode: only note when). True once the call is being ended."""
+        idle_s = (now_ms - max(eot.last_voice_ms, eot.last_final_ms, s.started * 1000.0)) / 1000.0
+        if IDLE_REAPER != "on":
+            if not s.idle_would_reap_ms:
+                s.idle_would_reap_ms = now_ms; _metric_inc(f"idle_would_reap.{reason}")
+                logger.info("[IDLE] would hang up (%s) after %.0fs without the caller", reason, idle_s)
+            return False
+        _metric_inc(f"idle_reaped.{reason}"); _metric_observe("idle_reaped_idle_min", idle_s / 60.0)
+        _metric_observe("idle_reaped_call_min", (now_ms / 1000.0 - s.started) / 60.0)
+        logger.info("[IDLE] hanging up (%s) after %.0fs without the caller", reason, idle_s)
+        await _end_call_and_close()
+        return True
 
     async def _end_call_and_close():
-        nonlocal end_called
-        if end_called: return
-        end_called = True
-        await _hangup_via_rest_or_redirect()
-        try: await websocket.close()
+        if s.end_called: return
+        s.end_called = True
+        # Fire-and-forget: the job outlives this handler, so ASR/TTS/WS are released right away.
+        # Closing the stream also ends <Connect>, which hangs up if the REST call is slow.
+        if s.call_sid:
+            twilio_control.submit_hangup(s.call_sid, s.app_base_url)
+        try: await websocket.close(1000)
         except Exception: pass
 
+    s.spawn(tts_worker(), "tts")
+    s.spawn(consume_finals(), "finals")
+
     # WS main loop
     try:
         while True:
@@ -955,66 +3002,311 @@ async def media():
             msg = json.loads(raw); event = msg.get("event")
 
             if event == "start":
-                stream_sid = msg["start"]["streamSid"]
-                call_sid_for_rest = ((msg.get("start") or {}).get("callSid") or msg.get("callSid"))
-                logger.info(f"Stream started: {stream_sid} (callSid={call_sid_for_rest})")
-                if not greeted:
-                    greeted = True; call_state["meta"]["greeted"] = True
-                    current_turn["id"] += 1
-                    # GREETING only from env; if unset -> skip with warning
-                    greeting_text = _env_text("GREETING")
+                start = msg.get("start") or {}
+                s.stream_sid = start["streamSid"]
+                s.call_sid = start.get("callSid") or msg.get("callSid")
+                s.call_state["meta"]["call_sid"] = s.call_sid
+                params = start.get("customParameters") or {}
+                s.start_speech(tenants.get(params.get("tenant") or DEFAULT_TENANT))
+                known = s.profile.callers.lookup(params.get("caller"))
+                if known: s.preload_caller(known)
+                call_log.call_sid = s.call_sid or s.stream_sid
+                logger.info("Stream started: %s (callSid=%s, tenant=%s)", s.stream_sid, s.call_sid, s.profile.name)
+                if IDLE_REAPER in ("on", "observe"):
+                    s.last_user_media_ms = time.time() * 1000.0
+                    s.spawn(_idle_watch(), "idle")
+                if not s.greeted:
+                    s.greeted = True; call_state["meta"]["greeted"] = True
+                    turn_id = s.next_turn()
+                    # GREETING from env (or the tenant config); if unset -> skip with warning
+                    greeting_text = s.greeting()
                     if greeting_text and greeting_text.strip():
-                        await tts_queue.put((current_turn["id"], greeting_text))
+                        await s.tts_q.put((turn_id, greeting_text))
                     else:
                         logger.warning("GREETING not set in environment; skipping initial spoken greeting.")
 
             elif event == "media":
-                b64 = msg["media"]["payload"]
-                pcm16 = mulaw_b64_to_pcm16_bytes(b64)
-                await asyncio.to_thread(push_stream.write, pcm16)
-                if is_speech(pcm16):
-                    speech_streak_frames = min(10, speech_streak_frames + 1)
+                raw = base64.b64decode(msg["media"]["payload"])
+                s.last_user_media_ms = time.time() * 1000.0
+                if s.push_stream is not None:
+                    # write() only copies into the SDK's buffer; no thread hop per 20 ms frame
+                    s.push_stream.write(raw if s.asr_mulaw else mulaw_to_pcm16(raw))
+                if is_speech_mulaw(raw):
+                    s.speech_streak = min(10, s.speech_streak + 1)
+                    eot.on_voice()
                 else:
-                    speech_streak_frames = 0
-                if tts_busy and speech_streak_frames >= REQ_STREAK_FRAMES:
-                    tts_cancel = True
-                    try: await websocket.send(json.dumps({"event": "clear", "streamSid": stream_sid}))
-                    except Exception: pass
-                    try:
-                        while True: _ = tts_queue.get_nowait()
-                    except asyncio.QueueEmpty:
-                        pass
+                    s.speech_streak = 0
+                if not s.tts_cancel and (s.tts_busy or playback.ahead_ms() > 0) and s.speech_streak >= REQ_STREAK_FRAMES:
+                    s.tts_cancel = True
+                    await _send_clear(time.perf_counter())
+                    _drain(s.tts_q)
+
+            elif event == "mark":
+                playback.on_mark((msg.get("mark") or {}).get("name", ""))
 
             elif event == "stop":
                 logger.info("Stream stopped by Twilio.")
                 break
 
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
-        logger.error(f"WS error: {e}")
+        logger.error("WS error: %s", e, exc_info=True)
     finally:
-        try:
-            if llm_task and not llm_task.done():
-                llm_task.cancel()
-                try: await llm_task
-                except: pass
-            await tts_queue.put(None)
-            if smooth_task and not smooth_task.done():
-                smooth_task.cancel()
-                try: await smooth_task
-                except: pass
-            push_stream.close()
-            recognizer.stop_continuous_recognition_async()
-        except Exception:
-            pass
+        # Shielded: Quart cancels this handler when the socket drops, teardown must still finish
+        try: await asyncio.shield(s.close())
+        except BaseException: pass
+        logger.info("[EOT] call summary: %s", eot.summary())
+        logger.info("[PLAYBACK] call summary: %s", playback.summary())
+        if s.greeted:
+            _metric_observe("turns_per_call_returning" if s.returning else "turns_per_call_new", eot.turns)
+        if s.fillers: logger.info("[FILLER] call summary: fired=%d silence_saved_ms=%.0f", s.fillers, s.filler_saved_ms)
+        if s.idle_would_reap_ms:
+            # Observe mode: how long this call stayed open after the reaper would have ended it
+            _metric_observe("idle_reclaimable_min", (time.time() * 1000.0 - s.idle_would_reap_ms) / 60000.0)
         logger.info("WebSocket closed.")
+        call_log.flush()
+
+# ---------- Debug: live sessions ----------
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+def _admin_ok() -> bool:
+    """Admin/debug endpoints are off unless ADMIN_TOKEN is set; callers send it as a Bearer token."""
+    if not ADMIN_TOKEN: return False
+    got = request.headers.get("Authorization", "")
+    return hmac.compare_digest(got.encode(), f"Bearer {ADMIN_TOKEN}".encode())
+
+@app.get("/debug/sessions")
+async def debug_sessions():
+    if not _admin_ok(): return {"error": "not found"}, 404
+    if request.args.get("gc"): gc.collect()
+    return {
+        "live": [sess.info() for sess in list(SESSIONS.values())],
+        "closed_not_collected": len(_closed_sessions),
+        "tasks": len(asyncio.all_tasks()), "threads": threading.active_count(),
+        "rss_mb": round(_rss_bytes() / 1e6, 1),
+    }
+
+# ---------- Debug: profiler & hot-path counters ----------
+# GET /debug/profile?seconds=10 samples Python stacks of the event-loop thread and the executor
+# threads (threads=all: every thread) and returns them as collapsed stacks, one
+# "thread;outer;...;inner count" line each, ready for flamegraph.pl or speedscope.
+# GET /debug/hot?enable=1 swaps counting wrappers in for the HOT_FUNCTIONS module globals and
+# enable=0 puts the originals back, so when they are off the hot path runs the original functions.
+PROFILE_MAX_S = float(os.getenv("PROFILE_MAX_S", "60"))
+PROFILE_HZ = float(os.getenv("PROFILE_HZ", "97"))  # off the 50 Hz frame clock so samples don't alias with it
+HOT_FUNCTIONS = ("mulaw_to_pcm16", "mulaw_level", "is_speech_mulaw",
+                 "auto_ssml", "extract_contact", "send_media_frame")
+HOT_COUNTERS: dict = {}  # name -> [calls, total_ns, max_ns]
+_hot_originals: dict = {}
+_profile_lock = threading.Lock()
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def sample_stacks(seconds: float, hz: float, loop_ident: int, all_threads: bool = False) -> tuple:
+    """Blocking; run on its own thread. Returns (collapsed stack counts, samples taken)."""
+    raw: Counter = Counter()  # (root, code, code, ...) innermost first; labels are built once at the end
+    me, interval = threading.get_ident(), 1.0 / hz
+    names: dict = {}
+    t_next = time.perf_counter(); deadline = t_next + seconds; samples = 0
+    while t_next < deadline:
+        if samples % 100 == 0:
+            names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me: continue
+            name = names.get(ident, f"thread-{ident}")
+            if ident == loop_ident: root = "loop"
+            elif name.startswith(("asyncio_", "ThreadPoolExecutor")): root = "executor"
+            elif all_threads: root = name
+            else: continue
+            key = [root]
+            while frame is not None:
+                key.append(frame.f_code); frame = frame.f_back
+            raw[tuple(key)] += 1
+        samples += 1
+        t_next += interval
+        time.sleep(max(0.0, t_next - time.perf_counter()))
+    labels: dict = {}
+    stacks: Counter = Counter()
+    for key, n in raw.items():
+        names = [labels.get(c) or labels.setdefault(c, _frame_label(c)) for c in reversed(key[1:])]
+        stacks[";".join([key[0], *names])] += n
+    return stacks, samples
+
+@app.get("/debug/profile")
+async def debug_profile():
+    if not _admin_ok(): return {"error": "not found"}, 404
+    try:
+        seconds = min(max(float(request.args.get("seconds", 10)), 0.1), PROFILE_MAX_S)
+        hz = min(max(float(request.args.get("hz", PROFILE_HZ)), 1.0), 1000.0)
+    except ValueError:
+        return {"error": "seconds and hz must be numbers"}, 400
+    if not _profile_lock.acquire(blocking=False):
+        return {"error": "a profile is already running"}, 409
+    loop, fut = asyncio.get_running_loop(), asyncio.get_running_loop().create_future()
+    args = (seconds, hz, threading.get_ident(), request.args.get("threads") == "all")
+    def done(set_, value):
+        if not fut.done(): set_(value)  # the client may have gone (handler cancelled)
+    def run():
+        # The sampler owns the lock: a client that disconnects mid-run doesn't let a second one start
+        try: res = sample_stacks(*args)
+        except BaseException as e: loop.call_soon_threadsafe(done, fut.set_exception, e)
+        else: loop.call_soon_threadsafe(done, fut.set_result, res)
+        finally: _profile_lock.release()
+    try:
+        # A thread of its own: in the executor it would hold a worker for the whole run
+        threading.Thread(target=run, name="profiler", daemon=True).start()
+    except BaseException:
+        _profile_lock.release(); raise
+    logger.info("[PROFILE] sampling %.1fs at %.0f Hz", seconds, hz)
+    stacks, samples = await fut
+    body = "".join(f"{stack} {n}\n" for stack, n in stacks.most_common())
+    return body, 200, {"Content-Type": "text/plain; charset=utf-8", "X-Profile-Samples": str(samples)}
+
+def _hot_wrap(name: str, fn):
+    c = HOT_COUNTERS.setdefault(name, [0, 0, 0])
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def counted(*args, **kwargs):
+            t0 = time.perf_counter_ns()
+            try: return await fn(*args, **kwargs)
+            finally:
+                dt = time.perf_counter_ns() - t0
+                c[0] += 1; c[1] += dt
+                if dt > c[2]: c[2] = dt
+    else:
+        @functools.wraps(fn)
+        def counted(*args, **kwargs):
+            t0 = time.perf_counter_ns()
+            try: return fn(*args, **kwargs)
+            finally:
+                dt = time.perf_counter_ns() - t0
+                c[0] += 1; c[1] += dt
+                if dt > c[2]: c[2] = dt
+    return counted
+
+def hot_counters_enable(on: bool):
+    """Swap the counting wrappers in (or the originals back); call sites look the names up per call."""
+    g = globals()
+    if on and not _hot_originals:
+        for name in HOT_FUNCTIONS:
+            _hot_originals[name] = g[name]; g[name] = _hot_wrap(name, g[name])
+    elif not on and _hot_originals:
+        g.update(_hot_originals); _hot_originals.clear()
+
+def hot_counters_stats() -> dict:
+    return {name: {"calls": c[0], "total_ms": round(c[1] / 1e6, 2),
+                   "mean_us": round(c[1] / c[0] / 1e3, 2) if c[0] else 0.0, "max_us": round(c[2] / 1e3, 1)}
+            for name, c in HOT_COUNTERS.items()}
+
+@app.get("/debug/hot")
+async def debug_hot():
+    if not _admin_ok(): return {"error": "not found"}, 404
+    if request.args.get("reset"):
+        for c in HOT_COUNTERS.values(): c[:] = [0, 0, 0]  # in place: the active wrappers hold these lists
+    if "enable" in request.args:
+        hot_counters_enable(request.args.get("enable") not in ("0", "false", "off"))
+        logger.info("[PROFILE] hot-path counters %s", "on" if _hot_originals else "off")
+    return {"enabled": bool(_hot_originals), "counters": hot_counters_stats()}
+
+# ---------- Warm-up & readiness ----------
+# /ready turns green once the heavy modules are imported, the default profile is compiled,
+# the OpenAI connection is open and the speech pool holds a connected synthesizer.
+READINESS = {"modules": False, "profile": False, "openai": False, "speech": False}
+WARMUP_RETRY_S = float(os.getenv("WARMUP_RETRY_S", "5"))
+
+async def _warm_openai():
+    if not OPENAI_API_KEY:
+        logger.warning("[STARTUP] OPENAI_API_KEY not set; LLM not ready."); return
+    try:
+        r = await llm_http().get(f"{LLM_BASE_URL}/models", headers=LLM_PRIMARY.headers)
+        READINESS["openai"] = r.status_code // 100 == 2
+        if not READINESS["openai"]:
+            logger.warning(f"[STARTUP] OpenAI warm-up returned {r.status_code}")
+    except Exception as e:
+        logger.warning(f"[STARTUP] OpenAI warm-up failed: {e!r}")
+
+async def _warm_speech(prof: LowLatencyReceptionist):
+    try:
+        await asyncio.to_thread(speech_pool.fill, prof)
+        READINESS["speech"] = speech_pool.ready(prof)
+        if FILLER_ENABLED or IDLE_REAPER == "on": await asyncio.to_thread(filler_cache.ensure, prof)
+    except Exception as e:
+        logger.warning(f"[STARTUP] speech warm-up failed: {e}")
+
+async def _warm_up():
+    while True:
+        if not READINESS["modules"]:
+            try:
+                for mod in (speechsdk, httpx, _twiml):
+                    await asyncio.to_thread(mod.load)
+                READINESS["modules"] = True
+            except Exception as e:
+                logger.error(f"[STARTUP] import failed: {e}")
+        prof = tenants.get(DEFAULT_TENANT); READINESS["profile"] = True
+        if READINESS["modules"] and prof.callers.load_ms is None:
+            await asyncio.to_thread(prof.callers.load)
+        if READINESS["modules"]:
+            await asyncio.gather(
+                *([] if READINESS["openai"] else [_warm_openai()]),
+                *([] if READINESS["speech"] else [_warm_speech(prof)]),
+            )
+        if all(READINESS.values()):
+            STARTUP["ready_ms"] = round(_process_age_ms())
+            logger.info(f"[STARTUP] ready {STARTUP['ready_ms']} ms after process start; "
+                        f"import phases {STARTUP['phases_ms']}, lazy imports {STARTUP['lazy_imports_ms']}")
+            return
+        await asyncio.sleep(WARMUP_RETRY_S)
+
+# ---------- Event-loop lag ----------
+# Sleeps a fixed interval and records how late it wakes up: anything the loop thread does
+# synchronously (formatting, blocking writes, CPU work) shows up here, on /metrics as loop_lag_ms.
+LOOP_LAG_INTERVAL_MS = float(os.getenv("LOOP_LAG_INTERVAL_MS", "100"))
+LOOP_LAG_WARN_MS = float(os.getenv("LOOP_LAG_WARN_MS", "100"))
+
+async def _loop_lag_monitor():
+    interval = LOOP_LAG_INTERVAL_MS / 1000.0
+    while True:
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag_ms = max(0.0, (time.perf_counter() - t0 - interval) * 1000.0)
+        _metric_observe("loop_lag_ms", lag_ms)
+        if lag_ms > LOOP_LAG_WARN_MS:
+            logger.warning("[LOOP] event loop lagged %.0f ms", lag_ms)
+
+@app.before_serving
+async def _startup():
+    app.add_background_task(_warm_up)
+    if CALLER_FAST_PATH and CALLER_DIRECTORY_REFRESH_S > 0:
+        app.add_background_task(_caller_directory_refresher)
+    if LOOP_LAG_INTERVAL_MS > 0:
+        app.add_background_task(_loop_lag_monitor)
+
+@app.get("/ready")
+async def ready():
+    ok = all(READINESS.values())
+    return {"ready": ok, "checks": READINESS, "startup": STARTUP}, (200 if ok else 503)
 
 # ---------- Shutdown ----------
 @app.after_serving
 async def _shutdown():
-    try: await httpx_client.aclose()
+    try:
+        if _llm_client is not None: await _llm_client.aclose()
     except Exception: pass
+    try: await twilio_control.aclose()
+    except Exception: pass
+
+# ---------- Metrics endpoint ----------
+@app.get("/metrics")
+async def metrics():
+    # Per-region speech health and caller-directory counts are operator data, like /debug/*
+    if not _admin_ok(): return {"error": "not found"}, 404
+    return {**METRICS, "caller_directory": caller_directory_stats(), "speech_endpoints": speech_router.stats()}
 
 # ---------- Health ----------
 @app.get("/")
 async def home():
-    return "AI Receptionist — Natural v12.3 (DE voice, fast responses, robust hangup with guard)"
\ No newline at end of file
+    return "AI Receptionist — Natural v12.3 (DE voice, fast responses, robust hangup with guard)"
+
+_startup_phase("module")
@@ -0,0 +1,18 @@
+import os, sys, tempfile
+
+# ai_receptionist reads its configuration at import time
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.update({
+    "LOG_LEVEL": "WARNING",
+    "SPEECH_POOL_SIZE": "0",
+    "FILLER_ENABLED": "0",
+    "IDLE_REAPER": "off",
+    "LOOP_LAG_INTERVAL_MS": "0",
+    "CALLER_FAST_PATH": "0",
+    "ADMIN_TOKEN": "test-token",
+    "AZURE_SPEECH_ENDPOINTS": '[{"name": "a", "host": "ws://fake-a"}, {"name": "b", "host": "ws://fake-b"}]',
+    "PRECOMPILED_DIR": tempfile.mkdtemp(prefix="precompiled-"),
+})
+os.environ.pop("GREETING", None)
+os.chdir(ROOT)  # business_info.txt, tenants.json
+sys.path.insert(0, ROOT)
@@ -0,0 +1,258 @@
+"""
+Local stand-ins for Azure Speech and Twilio, so calls can run through /media without network.
+
+FakeSpeech patches LowLatencyReceptionist.make_asr/make_tts. Per endpoint name it injects
+synthesis latency ("tts_ms"), recognition latency ("asr_ms"), cancellations ("cancel",
+"asr_cancel") and synthesizers that never return audio ("hang").
+"""
+import asyncio, base64, contextlib, json, logging, threading, time
+
+import ai_receptionist as app_mod
+
+sdk = app_mod.speechsdk.load()
+
+QUIET = b"\xff" * 160  # μ-law silence
+LOUD = b"\x00" * 160   # full-scale μ-law
+
+
+class Sig:
+    def __init__(self): self.cbs = []
+    def connect(self, cb): self.cbs.append(cb)
+    def disconnect_all(self): self.cbs = []
+    def fire(self, evt):
+        for cb in list(self.cbs): cb(evt)
+
+
+class Fut:
+    def __init__(self, fn=None): self.fn = fn
+    def get(self): return self.fn() if self.fn else None
+
+
+class Ev:
+    def __init__(self, **kw): self.__dict__.update(kw)
+
+
+def recognized(text: str) -> Ev:
+    return Ev(result=Ev(reason=sdk.ResultReason.RecognizedSpeech, text=text))
+
+
+class FakeRecognizer:
+    def __init__(self, backend, ep):
+        self.backend, self.speech_endpoint = backend, ep
+        self.recognized, self.recognizing, self.canceled = Sig(), Sig(), Sig()
+    def start_continuous_recognition_async(self): return Fut()
+    def stop_continuous_recognition_async(self): return Fut()
+    def say(self, text: str):
+        """Deliver a final after the endpoint's recognition latency (or cancel, if so configured)."""
+        b = self.backend.behaviour(self.speech_endpoint.name)
+        if b.get("asr_cancel"):
+            self.canceled.fire(Ev(cancellation_details=Ev(reason=sdk.CancellationReason.Error, error_details="fake 1006")))
+            return
+        threading.Timer(b.get("asr_ms", 0) / 1000.0, self.recognized.fire, (recognized(text),)).start()
+
+
+class FakePushStream:
+    def __init__(self, rec): self.rec = rec; self.bytes = 0; self.closed = False
+    def write(self, b): self.bytes += len(b)
+    def close(self): self.closed = True
+
+
+class FakeSynthesizer:
+    def __init__(self, backend, ep):
+        self.backend, self.speech_endpoint = backend, ep
+        self.synthesizing, self.synthesis_completed, self.synthesis_canceled = Sig(), Sig(), Sig()
+        self.spoken = []
+    def speak_ssml_async(self, ssml):
+        b = self.backend.behaviour(self.speech_endpoint.name)
+        self.spoken.append(ssml)
+        chunks = b.get("chunks", 1); audio = b.get("audio", b"\xff" * 800)
+        def run():
+            time.sleep(b.get("tts_ms", 0) / 1000.0)
+            if b.get("cancel"):
+                self.synthesis_canceled.fire(Ev(result=Ev(cancellation_details=Ev(
+                    reason=sdk.CancellationReason.Error, error_details="fake 429"))))
+                return
+            if b.get("hang"): return
+            for _ in range(chunks):
+                self.synthesizing.fire(Ev(result=Ev(audio_data=audio)))
+            self.synthesis_completed.fire(Ev())
+        th = threading.Thread(target=run, daemon=True); th.start()  # like the SDK: starts right away
+        return Fut(lambda: (th.join(), Ev(audio_data=audio * chunks, reason="SynthesizingAudioCompleted"))[1])
+    def stop_speaking_async(self): return Fut()
+
+
+class FakeSpeech:
+    def __init__(self, monkeypatch, **behaviour):
+        self.behaviours = behaviour  # endpoint name -> dict
+        self.recognizers = []
+        backend = self
+        def make_asr(prof, ep=None):
+            ep = ep or app_mod.speech_router.pick("asr")
+            rec = FakeRecognizer(backend, ep); backend.recognizers.append(rec)
+            return rec, FakePushStream(rec)
+        def make_tts(prof, ep=None):
+            return FakeSynthesizer(backend, ep or app_mod.speech_router.pick("tts"))
+        monkeypatch.setattr(app_mod.LowLatencyReceptionist, "make_asr", make_asr)
+        monkeypatch.setattr(app_mod.LowLatencyReceptionist, "make_tts", make_tts)
+
+    def behaviour(self, name: str) -> dict:
+        return self.behaviours.setdefault(name, {})
+
+
+def fake_llm(monkeypatch, replies, delay_s: float = 0.0, calls: list = None):
+    """llm_stream_sentences stand-in: yields the sentences of replies[i] for the i-th request."""
+    state = {"n": 0}
+    async def stream(history, user_text, call_state):
+        i = state["n"]; state["n"] += 1
+        if calls is not None: calls.append([dict(m) for m in history])
+        for sentence in replies[min(i, len(replies) - 1)]:
+            if delay_s: await asyncio.sleep(delay_s)
+            yield sentence
+    monkeypatch.setattr(app_mod, "llm_stream_sentences", stream)
+
+
+class Call:
+    """A Twilio Media Streams client on the Quart test client; acks marks like Twilio does after playout."""
+    def __init__(self, ws, sid: str, mark_delay_s: float = 0.0):
+        self.ws, self.sid, self.mark_delay_s = ws, sid, mark_delay_s
+        self.media_frames = 0; self.closed = False; self.events = []; self.payloads = []
+        self._rx = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def start(cls, ws, sid: str = "1", params: dict = None, mark_delay_s: float = 0.0) -> "Call":
+        await ws.send(json.dumps({"event": "start", "start": {
+            "streamSid": f"MZ{sid}", "callSid": f"CA{sid}", "customParameters": params or {}}}))
+        return cls(ws, sid, mark_delay_s)
+
+    async def _receive(self):
+        try:
+            while True:
+                m = json.loads(await self.ws.receive())
+                self.events.append(m["event"])
+                if m["event"] == "media":
+                    self.media_frames += 1; self.payloads.append(base64.b64decode(m["media"]["payload"]))
+                elif m["event"] == "mark":
+                    name = m["mark"]["name"]
+                    asyncio.get_running_loop().call_later(self.mark_delay_s, lambda name=name: asyncio.ensure_future(
+                        self._send({"event": "mark", "mark": {"name": name}})))
+        except BaseException:
+            self.closed = True
+
+    async def _send(self, msg: dict):
+        try: await self.ws.send(json.dumps(msg))
+        except Exception: pass
+
+    async def media(self, frame: bytes = QUIET, n: int = 1, pace_s: float = 0.0):
+        for _ in range(n):
+            await self._send({"event": "media", "media": {"payload": base64.b64encode(frame).decode()}})
+            if pace_s: await asyncio.sleep(pace_s)
+
+    async def stop(self):
+        await self._send({"event": "stop"})
+        await asyncio.sleep(0.05)
+        self._rx.cancel()
+
+
+def session_for(call_sid: str):
+    return next((s for s in app_mod.SESSIONS.values() if s.call_sid == call_sid), None)
+
+
+async def wait_for(pred, timeout: float = 3.0, step: float = 0.01):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pred(): return True
+        await asyncio.sleep(step)
+    return pred()
+
+
+@contextlib.contextmanager
+def app_handlers_only():
+    """For measurements: pytest's capture handlers format (and keep) every record on the caller's thread."""
+    root = logging.getLogger(); saved = root.handlers[:]
+    root.handlers[:] = [h for h in saved if isinstance(h, app_mod._QueueHandler)]
+    try: yield
+    finally: root.handlers[:] = saved
+
+
+def free_port() -> int:
+    import socket
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """Serve a Quart app on 127.0.0.1 with hypercorn for the duration of an `async with`."""
+    def __init__(self, app):
+        self.app, self.port = app, free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+
+    async def __aenter__(self):
+        import hypercorn.asyncio, hypercorn.config
+        cfg = hypercorn.config.Config(); cfg.bind = [f"127.0.0.1:{self.port}"]; cfg.loglevel = "ERROR"
+        cfg.accesslog = cfg.errorlog = None
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(hypercorn.asyncio.serve(self.app, cfg, shutdown_trigger=self._stop.wait))
+        import httpx
+        async with httpx.AsyncClient() as c:
+            for _ in range(200):
+                try: await c.get(self.url + "/__ping"); break
+                except httpx.HTTPError: await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._stop.set()
+        try: await asyncio.wait_for(self._task, 5)
+        except Exception: self._task.cancel()
+
+
+def fake_openai(behaviour: dict):
+    """
+    Chat-completions SSE endpoint per name: POST /<name>/chat/completions. behaviour[name] is a
+    list consumed per request (the last entry repeats): {"status": 500}, or {"delay": s,
+    "tokens": [...], "gap": s}; "hang": True never sends a token.
+    """
+    from quart import Quart, Response
+    srv = Quart("fake-openai")
+    srv.requests = []
+
+    @srv.get("/<name>/models")
+    async def models(name):
+        return {"data": [{"id": "fake"}]}
+
+    @srv.post("/<name>/chat/completions")
+    async def chat(name):
+        plan = behaviour[name]
+        step = plan.pop(0) if len(plan) > 1 else plan[0]
+        srv.requests.append(name)
+        if step.get("status"):
+            return {"error": "fake"}, step["status"]
+        async def gen():
+            await asyncio.sleep(step.get("delay", 0.0))
+            if step.get("hang"): await asyncio.sleep(3600)
+            for tok in step.get("tokens", ["Hallo ", name, "."]):
+                yield f"data: {json.dumps({'choices': [{'delta': {'content': tok}}]})}\n\n".encode()
+                if step.get("gap"): await asyncio.sleep(step["gap"])
+            yield b"data: [DONE]\n\n"
+        return Response(gen(), content_type="text/event-stream")
+    return srv
+
+
+def fake_twilio(plan: list, delay_s: float = 0.0):
+    """
+    Twilio REST stand-in for live-call updates. Each POST pops the next status code from `plan`
+    (200 once it is empty) after `delay_s`; requests are recorded as (callSid, form, auth user).
+    """
+    from quart import Quart, request
+    srv = Quart("fake-twilio")
+    srv.requests = []
+
+    @srv.post("/2010-04-01/Accounts/<acc>/Calls/<sid>.json")
+    async def update(acc, sid):
+        form = dict(await request.form)
+        auth = request.authorization
+        if delay_s: await asyncio.sleep(delay_s)
+        srv.requests.append((sid, form, auth.username if auth else None))
+        code = plan.pop(0) if plan else 200
+        return {"sid": sid, "status": form.get("Status", "in-progress")}, code
+    return srv
@@ -0,0 +1,59 @@
+"""
+Start-to-first-call benchmark: a fresh interpreter imports the app, runs its startup hooks,
+answers /incoming-call and plays the greeting on a /media stream. Prints one JSON line of
+milliseconds since the OS started the process. Speech and LLM are the local fakes.
+
+    python tests/startup_bench.py
+"""
+import os, socket, sys, tempfile
+
+with socket.socket() as _s:  # the fake OpenAI's port has to be in the env before the app is imported
+    _s.bind(("127.0.0.1", 0)); LLM_PORT = _s.getsockname()[1]
+os.environ.update({
+    "LOG_LEVEL": "WARNING", "SPEECH_POOL_SIZE": "0", "FILLER_ENABLED": "0", "IDLE_REAPER": "off",
+    "LOOP_LAG_INTERVAL_MS": "0", "CALLER_FAST_PATH": "0", "MEDIA_WS_URL": "wss://bench.invalid/media",
+    "AZURE_SPEECH_ENDPOINTS": '[{"name": "a", "host": "ws://fake-a"}]',
+    "PRECOMPILED_DIR": tempfile.mkdtemp(prefix="precompiled-"),
+    "GREETING": "Guten Tag, wie kann ich helfen?",
+    "OPENAI_API_KEY": "bench", "OPENAI_BASE_URL": f"http://127.0.0.1:{LLM_PORT}/primary",
+})
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT); sys.path[:0] = [ROOT, os.path.join(ROOT, "tests")]
+
+import asyncio, json
+
+import ai_receptionist as app_mod
+from fakes import Call, FakeSpeech, LocalServer, fake_llm, fake_openai, wait_for
+
+imported_ms = app_mod._process_age_ms()
+
+
+async def main():
+    from _pytest.monkeypatch import MonkeyPatch
+    mp = MonkeyPatch(); FakeSpeech(mp); fake_llm(mp, [["Gerne."]])
+    out = {"import_ms": round(imported_ms)}
+    llm = LocalServer(fake_openai({"primary": [{}]})); llm.port = LLM_PORT; llm.url = f"http://127.0.0.1:{LLM_PORT}"
+    t0 = app_mod._process_age_ms()
+    async with llm:
+        out["harness_ms"] = round(app_mod._process_age_ms() - t0)  # starting the fake OpenAI server; not the app's
+        await serve(out)
+    mp.undo()
+    print(json.dumps(out))
+
+
+async def serve(out):
+    async with app_mod.app.test_app() as test_app:  # runs before_serving
+        client = test_app.test_client()
+        out["serving_ms"] = round(app_mod._process_age_ms())
+        r = await client.post("/incoming-call", form={"CallSid": "CAbench", "To": "+4989000", "From": "+4917000"})
+        assert r.status_code == 200, r.status_code
+        out["twiml_ms"] = round(app_mod._process_age_ms())
+        async with client.websocket("/media") as ws:
+            call = await Call.start(ws, "bench")
+            assert await wait_for(lambda: call.media_frames > 0, timeout=10), "no greeting audio"
+            out["first_frame_ms"] = round(app_mod._process_age_ms())
+            await call.stop()
+        assert await wait_for(lambda: app_mod.STARTUP["ready_ms"] is not None, timeout=10), app_mod.READINESS
+        out["ready_ms"] = app_mod.STARTUP["ready_ms"]
+
+asyncio.run(main())
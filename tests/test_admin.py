@@ -0,0 +1,72 @@
+import asyncio, re
+
+import httpx
+
+import ai_receptionist as app_mod
+from fakes import LocalServer
+
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+def test_metrics_requires_the_admin_token():
+    async def run():
+        client = app_mod.app.test_client()
+        anon = await client.get("/metrics")
+        wrong = await client.get("/metrics", headers={"Authorization": "Bearer nope"})
+        ok = await client.get("/metrics", headers=AUTH)
+        return anon.status_code, wrong.status_code, ok.status_code, await ok.get_json()
+    anon, wrong, ok, body = asyncio.run(run())
+    assert (anon, wrong, ok) == (404, 404, 200)
+    assert "speech_endpoints" in body and "caller_directory" in body
+
+
+def test_hot_counters_swap_the_originals_back():
+    originals = {name: getattr(app_mod, name) for name in app_mod.HOT_FUNCTIONS}
+
+    async def run():
+        client = app_mod.app.test_client()
+        assert (await client.get("/debug/hot?enable=1")).status_code == 404
+        on = await (await client.get("/debug/hot?enable=1&reset=1", headers=AUTH)).get_json()
+        wrapped = {name: getattr(app_mod, name) for name in app_mod.HOT_FUNCTIONS}
+        app_mod.is_speech_mulaw(b"\x00" * 160)  # calls mulaw_level through the module global
+        counted = await (await client.get("/debug/hot", headers=AUTH)).get_json()
+        off = await (await client.get("/debug/hot?enable=0", headers=AUTH)).get_json()
+        return on, wrapped, counted, off
+
+    on, wrapped, counted, off = asyncio.run(run())
+    assert on["enabled"] and not off["enabled"]
+    assert all(wrapped[n] is not originals[n] and wrapped[n].__wrapped__ is originals[n] for n in originals)
+    assert counted["counters"]["is_speech_mulaw"]["calls"] == 1 and counted["counters"]["mulaw_level"]["calls"] == 1
+    assert all(getattr(app_mod, n) is originals[n] for n in originals)  # the hot path runs the originals again
+
+
+def test_profile_auth_conflict_and_collapsed_stacks(monkeypatch):
+    line = re.compile(r"^(loop|executor)(;[^;]+ \([^():]+:\d+\))+ \d+$")
+
+    async def run():
+        client = app_mod.app.test_client()
+        anon = await client.get("/debug/profile?seconds=0.1")
+        first = asyncio.create_task(client.get("/debug/profile?seconds=0.5&hz=200", headers=AUTH))
+        await asyncio.sleep(0.1)
+        busy = await client.get("/debug/profile?seconds=0.1", headers=AUTH)
+        r = await first
+        body = (await r.get_data()).decode()
+
+        # A client that hangs up mid-run: the sampler keeps the lock until it is done
+        async with LocalServer(app_mod.app) as server, httpx.AsyncClient(base_url=server.url, headers=AUTH) as http:
+            gone = asyncio.create_task(http.get("/debug/profile?seconds=0.6"))
+            await asyncio.sleep(0.15); gone.cancel()
+            await asyncio.sleep(0.1)
+            still_busy = await http.get("/debug/profile?seconds=0.1")
+            await asyncio.sleep(0.6)
+            after = await http.get("/debug/profile?seconds=0.1")
+        return anon.status_code, busy.status_code, r, body, still_busy.status_code, after.status_code
+
+    anon, busy, r, body, still_busy, after = asyncio.run(run())
+    assert (anon, busy, r.status_code, still_busy, after) == (404, 409, 200, 409, 200)
+    assert r.headers["Content-Type"].startswith("text/plain") and int(r.headers["X-Profile-Samples"]) >= 50
+    lines = body.splitlines()
+    assert lines and all(line.match(l) for l in lines), lines[:3]
+    assert any(l.startswith("loop;") for l in lines)
+    counts = [int(l.rsplit(" ", 1)[1]) for l in lines]
+    assert counts == sorted(counts, reverse=True)  # most common first
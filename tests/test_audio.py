@@ -0,0 +1,53 @@
+import base64, random, time, warnings
+
+import ai_receptionist as app_mod
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    import audioop  # the reference G.711 implementation (removed in Python 3.13)
+
+
+def test_decoder_matches_audioop():
+    every_byte = bytes(range(256))
+    assert app_mod.mulaw_to_pcm16(every_byte) == audioop.ulaw2lin(every_byte, 2)
+    rng = random.Random(7)
+    for _ in range(50):
+        frame = bytes(rng.randrange(256) for _ in range(160))
+        pcm = audioop.ulaw2lin(frame, 2)
+        assert app_mod.mulaw_to_pcm16(frame) == pcm
+        samples = memoryview(pcm).cast("h")
+        assert app_mod.mulaw_level(frame) == sum(abs(x) for x in samples) / len(samples)
+    assert app_mod.mulaw_level(b"") == 0.0
+
+
+def _reference_frame(raw: bytes, margin: float = 2.6) -> bool:
+    """Per-sample decode and energy in Python: what a frame costs without the lookup tables."""
+    pcm = [app_mod.mulaw_byte_to_pcm16(b) for b in raw]
+    return app_mod._vad_decide(sum(abs(x) for x in pcm) / len(pcm), margin)
+
+
+def test_inbound_audio_cpu_per_call_minute():
+    """
+    CPU spent on one minute of caller audio (3000 frames of 20 ms) as the /media handler does it:
+    base64 decode, ASR ingest (μ-law as is, or expanded to PCM), energy VAD. Also reports the
+    per-sample reference decode for comparison.
+    """
+    rng = random.Random(1)
+    payloads = [base64.b64encode(bytes(rng.randrange(256) for _ in range(160))).decode() for _ in range(3000)]
+    saved = dict(app_mod._noise_floor)
+
+    def cpu_ms(per_frame) -> float:
+        t0 = time.thread_time()
+        for p in payloads: per_frame(base64.b64decode(p))
+        return (time.thread_time() - t0) * 1000.0
+
+    try:
+        mulaw = min(cpu_ms(lambda raw: (bytes(raw), app_mod.is_speech_mulaw(raw))) for _ in range(3))
+        pcm = min(cpu_ms(lambda raw: (app_mod.mulaw_to_pcm16(raw), app_mod.is_speech_mulaw(raw))) for _ in range(3))
+        reference = cpu_ms(_reference_frame)
+    finally:
+        app_mod._noise_floor.update(saved)
+    print(f"\nCPU per call-minute of inbound audio: mulaw ingest {mulaw:.1f} ms, pcm ingest {pcm:.1f} ms, "
+          f"per-sample reference {reference:.1f} ms")
+    assert mulaw < pcm < reference / 2
+    assert pcm < 100.0
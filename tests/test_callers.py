@@ -0,0 +1,56 @@
+import json, os
+
+import ai_receptionist as app_mod
+
+
+def test_numeric_phone_cells(tmp_path, monkeypatch):
+    openpyxl = app_mod._openpyxl.load()
+    path = tmp_path / "Record.xlsx"
+    wb = openpyxl.Workbook(); ws = wb.active
+    ws.append(["Name", "Number"])
+    ws.append(["Anna Meier", 17612345678])          # typed 0176 1234 5678: Excel dropped the 0
+    ws.append(["Bernd Huber", 4915112345678.0])     # typed +49 151 ...: dropped the +, stored as float
+    ws.append(["Carla Emden", 4921123456])          # 04921 123456 (Emden): national despite the leading 49
+    ws.append(["Dora Wien", 436641234567])          # +43 664 ...: foreign, 12 digits
+    ws.append(["Emil Text", "+49 89 1234567"])      # text cells are taken as they are
+    ws.append(["Kurz", 112])
+    wb.save(path)
+
+    d = app_mod.CallerDirectory(str(path)); d.load()
+    monkeypatch.setattr(app_mod, "CALLER_FAST_PATH", True)
+    assert d.lookup("+4917612345678")["name"] == "Anna Meier"
+    assert d.lookup("+4917612345678")["phone"] == "017612345678"
+    assert d.lookup("+4915112345678")["phone"] == "+4915112345678"
+    assert d.lookup("+494921123456")["name"] == "Carla Emden"
+    assert d.lookup("+436641234567")["name"] == "Dora Wien"
+    assert d.lookup("+49891234567")["name"] == "Emil Text"
+    assert d.stats()["entries"] == 5
+
+
+def test_phone_cell():
+    assert app_mod._phone_cell(17612345678) == "017612345678"
+    assert app_mod._phone_cell(4917612345678.0) == "+4917612345678"
+    assert app_mod._phone_cell(" +49 176 ") == "+49 176"
+    assert app_mod._phone_cell(None) == ""
+
+
+def test_caller_directory_is_per_tenant(tmp_path, monkeypatch):
+    tenants_file = tmp_path / "tenants.json"
+    tenants_file.write_text(json.dumps({"acme": {"numbers": ["+49891"]}, "bolt": {"numbers": ["+49892"]}}))
+    monkeypatch.setattr(app_mod, "TENANT_RELOAD_CHECK_S", 0.0)
+    monkeypatch.setattr(app_mod, "CALLER_DIRECTORY_FILE", str(tmp_path / "Record.xlsx"))
+    monkeypatch.setattr(app_mod, "CALLER_FAST_PATH", True)
+    reg = app_mod.TenantRegistry(str(tenants_file), 4)
+    acme, bolt = reg.get("acme"), reg.get("bolt")
+    assert acme.callers.path == str(tmp_path / "Record-acme.xlsx") and bolt.callers is not acme.callers
+
+    # A lead captured on acme's line is written to acme's file and known to acme only
+    cs = {"contact": {"name": None, "phone": None}, "meta": {}, "profile": acme}
+    app_mod.extract_contact("Mein Name ist Anna Meier, meine Nummer ist 0176 12345678.", cs)
+    assert acme.callers.lookup("+4917612345678")["name"] == "Anna Meier"
+    assert bolt.callers.lookup("+4917612345678") is None
+
+    # What is written is what the directory reads back (after a restart, say)
+    fresh = app_mod.CallerDirectory(acme.callers.path); fresh.load()
+    assert fresh.lookup("+4917612345678")["name"] == "Anna Meier"
+    assert not os.path.exists(tmp_path / "Record.xlsx")
@@ -0,0 +1,81 @@
+import asyncio, time
+
+import ai_receptionist as app_mod
+from fakes import Call, FakeSpeech, fake_llm, session_for, wait_for
+
+
+def test_terminal_utterances():
+    assert app_mod._utterance_terminal("Ja, genau.")
+    assert app_mod._utterance_terminal("Nein danke.")
+    assert app_mod._utterance_terminal("Haben Sie morgen noch etwas frei?")
+    assert not app_mod._utterance_terminal("Ich brauche einen Termin für")
+    assert not app_mod._utterance_terminal("Ich brauche einen Termin für meinen Wagen.")
+    assert not app_mod._utterance_terminal("Ja.", expect_digits=True)
+
+
+def test_terminal_final_skips_the_hold(monkeypatch):
+    monkeypatch.setattr(app_mod, "EOT_MODE", "adaptive")
+    eot = app_mod.EndOfTurnDetector()
+    eot.on_voice(); time.sleep(0.01); eot.on_final()
+    now = time.time() * 1000.0
+    assert eot.hold_seconds("Ja, genau.", now) == 0.0
+    assert eot.hold_seconds("Ich hätte gern einen Termin.", now) > 0.2
+    assert eot.hold_seconds("Ich hätte gern einen Termin und", now) > 1.0
+    eot.on_voice()  # caller still talking after the final: keep holding
+    assert eot.hold_seconds("Ja, genau.", now) > 0.0
+
+
+def test_answer_landing_during_the_hold_is_not_merged(monkeypatch):
+    """
+    A final that arrives while the previous answer is still being generated, but whose hold
+    outlasts that answer, is a turn of its own: the answer stays in history as heard.
+    """
+    monkeypatch.setattr(app_mod, "EOT_MODE", "adaptive")
+    FakeSpeech(monkeypatch)
+    calls = []
+    fake_llm(monkeypatch, [["Gerne, wann passt es Ihnen?"], ["Alles klar."]], delay_s=0.3, calls=calls)
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "eot1")
+            assert await wait_for(lambda: session_for("CAeot1") is not None)
+            s = session_for("CAeot1")
+            rec = s.recognizer
+            rec.say("Ich brauche einen Termin.")
+            assert await wait_for(lambda: s.llm_task is not None)
+            await asyncio.sleep(0.1)
+            rec.say("und zwar für")  # incomplete: held ~1.4 s, the first answer lands meanwhile
+            assert await wait_for(lambda: len(calls) == 2, timeout=4)
+            history = calls[1]
+            await call.stop()
+        return history
+
+    history = asyncio.run(run())
+    assert [m["role"] for m in history] == ["user", "assistant", "user"]
+    assert history[0]["content"] == "Ich brauche einen Termin."
+    assert history[1]["content"] == "Gerne, wann passt es Ihnen?"
+    assert history[2]["content"] == "und zwar für"
+
+
+def test_split_utterance_is_merged_while_the_answer_is_pending(monkeypatch):
+    monkeypatch.setattr(app_mod, "EOT_MODE", "adaptive")
+    FakeSpeech(monkeypatch)
+    calls = []
+    fake_llm(monkeypatch, [["Gerne."], ["Alles klar."]], delay_s=2.0, calls=calls)
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "eot2")
+            assert await wait_for(lambda: session_for("CAeot2") is not None)
+            s = session_for("CAeot2")
+            s.recognizer.say("Ich brauche einen Termin.")
+            assert await wait_for(lambda: s.llm_task is not None)
+            await asyncio.sleep(0.1)
+            s.recognizer.say("Am Freitag.")
+            assert await wait_for(lambda: len(calls) == 2, timeout=4)
+            await call.stop()
+        return calls[1]
+
+    history = asyncio.run(run())
+    assert [m["role"] for m in history] == ["user"]
+    assert history[0]["content"] == "Ich brauche einen Termin. Am Freitag."
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+import ai_receptionist as app_mod
+from fakes import Call, Ev, FakeSpeech, Fut, fake_llm, session_for, wait_for
+
+
+class _Synth:
+    """Synthesizes every phrase except the ones in `fail` (empty audio, like a canceled result)."""
+    def __init__(self, fail): self.fail = fail
+    def speak_ssml_async(self, ssml):
+        bad = any(t in ssml for t in self.fail)
+        return Fut(lambda: Ev(audio_data=b"" if bad else b"\xff" * 800, reason="Canceled" if bad else "SynthesizingAudioCompleted"))
+
+
+def test_load_logs_the_clips_actually_ready(monkeypatch, caplog):
+    monkeypatch.setattr(app_mod, "FILLER_ENABLED", True)
+    monkeypatch.setattr(app_mod, "IDLE_REAPER", "on")
+    monkeypatch.setattr(app_mod, "FILLER_PHRASES", ["Einen Moment, bitte.", "Ich schaue kurz nach."])
+    prof = app_mod.tenants.get(app_mod.DEFAULT_TENANT)
+    monkeypatch.setattr(app_mod.LowLatencyReceptionist, "make_tts", lambda self, ep=None: _Synth(["kurz nach"]))
+    cache = app_mod.FillerCache()
+    cache._load(prof, "test-voice|filler")
+    assert [c.text for c in cache._clips["test-voice|filler"]] == ["Einen Moment, bitte."]
+    assert any(r.getMessage() == "[FILLER] 2/3 clip(s) ready for test-voice|filler" for r in caplog.records)
+
+
+WORD, PAUSE, ANSWER = b"\x20" * 160, b"\x7f" * 160, b"\xff" * 160
+FILLER_AUDIO = (WORD * 5 + PAUSE) * 10  # 60 frames: a pause after every 5 loud frames
+
+
+@pytest.fixture
+def filler(monkeypatch):
+    monkeypatch.setattr(app_mod, "EOT_MODE", "off")
+    monkeypatch.setattr(app_mod, "FILLER_ENABLED", True)
+    monkeypatch.setattr(app_mod, "FILLER_DEADLINE_MS", 100)
+    monkeypatch.setattr(app_mod, "FILLER_MIN_GAP_S", 0.0)
+    speech = FakeSpeech(monkeypatch)
+    for name in ("a", "b"):
+        speech.behaviour(name).update(chunks=10, audio=ANSWER)
+    cache = app_mod.FillerCache()
+    cache._clips[app_mod.tenants.get(app_mod.DEFAULT_TENANT).tts_cache_ns] = [app_mod.FillerClip("Einen Moment, bitte…", FILLER_AUDIO)]
+    monkeypatch.setattr(app_mod, "filler_cache", cache)
+
+
+def _turns(sid: str, said: list, frames_per_turn: int = 10):
+    """Run one call through `said` (one caller final per turn); returns the frames the caller got and the session."""
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, sid, mark_delay_s=0.2)  # acked about when played, like Twilio
+            assert await wait_for(lambda: session_for(f"CA{sid}") is not None)
+            s = session_for(f"CA{sid}")
+            for i, text in enumerate(said, 1):
+                s.recognizer.say(text)
+                assert await wait_for(lambda: call.payloads.count(ANSWER) >= i * frames_per_turn, timeout=5)
+                assert await wait_for(lambda: not s.playback._pending)
+            await call.stop()
+            return call.payloads, s
+    return asyncio.run(run())
+
+
+def test_filler_covers_a_slow_answer_and_is_cut_at_a_pause(filler, monkeypatch):
+    fake_llm(monkeypatch, [["Ihr Termin ist am Dienstag."]], delay_s=0.4)
+    cut_before = app_mod.METRICS.get("filler_cut", 0)
+    frames, s = _turns("fl1", ["Wann ist mein Termin?"])
+    n = frames.index(ANSWER)  # filler frames, then the answer
+    assert all(f in (WORD, PAUSE) for f in frames[:n]) and all(f == ANSWER for f in frames[n:])
+    assert 5 <= n < 60 and n % 6 == 5  # stopped at the start of a pause, not mid-word
+    assert app_mod.METRICS.get("filler_cut", 0) == cut_before + 1
+    assert s.fillers == 1
+    # Only the answer is what the bot said
+    assert [m["content"] for m in s.history if m["role"] == "assistant"] == ["Ihr Termin ist am Dienstag."]
+    assert s.playback.heard_text(s.turn) == "Ihr Termin ist am Dienstag."
+
+
+def test_no_filler_when_the_first_sentence_is_on_time(filler, monkeypatch):
+    fake_llm(monkeypatch, [["Gerne."]], delay_s=0.01)
+    frames, s = _turns("fl2", ["Hallo."])
+    assert frames == [ANSWER] * 10 and s.fillers == 0
+
+
+@pytest.mark.parametrize("limit, gap_s", [(1, 0.0), (3, 60.0)])
+def test_filler_limits_per_call(filler, monkeypatch, limit, gap_s):
+    monkeypatch.setattr(app_mod, "FILLER_MAX_PER_CALL", limit)
+    monkeypatch.setattr(app_mod, "FILLER_MIN_GAP_S", gap_s)
+    fake_llm(monkeypatch, [["Einen Augenblick."]], delay_s=0.3)
+    limited_before = app_mod.METRICS.get("filler_rate_limited", 0)
+    frames, s = _turns("fl3" + str(limit), ["Erste Frage.", "Zweite Frage."])
+    assert s.fillers == 1
+    assert app_mod.METRICS.get("filler_rate_limited", 0) == limited_before + 1
+    first_answer = frames.index(ANSWER)
+    assert not any(f in (WORD, PAUSE) for f in frames[first_answer:])  # second turn: silence, no filler
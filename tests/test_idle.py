@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+import ai_receptionist as app_mod
+from fakes import LOUD, QUIET, Call, FakeSpeech, fake_llm, session_for, wait_for
+
+
+@pytest.fixture
+def idle(monkeypatch):
+    """Reaper with short timers: prompt after 0.3 s of silence, hang up 0.3 s after it, 0.5 s without media."""
+    monkeypatch.setattr(app_mod, "EOT_MODE", "off")
+    monkeypatch.setattr(app_mod, "IDLE_REAPER", "on")
+    monkeypatch.setattr(app_mod, "IDLE_CHECK_S", 0.05)
+    monkeypatch.setattr(app_mod, "IDLE_SILENCE_S", 0.3)
+    monkeypatch.setattr(app_mod, "IDLE_PROMPT_WAIT_S", 0.3)
+    monkeypatch.setattr(app_mod, "IDLE_MEDIA_TIMEOUT_S", 0.5)
+    speech = FakeSpeech(monkeypatch)
+    for name in ("a", "b"):
+        speech.behaviour(name).update(chunks=5, audio=QUIET)
+    fake_llm(monkeypatch, [["Ja, ich höre Sie."]])
+    return monkeypatch
+
+
+def _metric(name: str) -> int:
+    return app_mod.METRICS.get(name, 0)
+
+
+async def _stream(call: Call, frame: bytes = QUIET):
+    """The caller's line: a 20 ms frame every 20 ms (silence unless told otherwise)."""
+    while not call.closed:
+        await call.media(frame); await asyncio.sleep(0.02)
+
+
+def test_silent_caller_is_prompted_then_hung_up(idle):
+    prompted, reaped = _metric("idle_prompted"), _metric("idle_reaped.silent")
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "id1", mark_delay_s=0.01)
+            line = asyncio.create_task(_stream(call))
+            assert await wait_for(lambda: session_for("CAid1") is not None)
+            s = session_for("CAid1")
+            assert await wait_for(lambda: call.media_frames >= 5, timeout=2)  # "Sind Sie noch da?"
+            assert s.history[-1] == {"role": "assistant", "content": app_mod.IDLE_PROMPT_TEXT}
+            assert await wait_for(lambda: call.closed, timeout=2)
+            line.cancel()
+
+    asyncio.run(run())
+    assert _metric("idle_prompted") == prompted + 1 and _metric("idle_reaped.silent") == reaped + 1
+
+
+def test_answered_prompt_keeps_the_call(idle):
+    answered, reaped = _metric("idle_prompt_answered"), _metric("idle_reaped.silent")
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "id2", mark_delay_s=0.01)
+            assert await wait_for(lambda: session_for("CAid2") is not None)
+            s = session_for("CAid2")
+            line = asyncio.create_task(_stream(call))
+            assert await wait_for(lambda: call.media_frames >= 5, timeout=2)  # the prompt played
+            line.cancel()
+            await call.media(LOUD, n=5, pace_s=0.02)                         # "Ja, ich bin noch da"
+            s.recognizer.say("Ja, ich bin noch da.")
+            line = asyncio.create_task(_stream(call))
+            assert await wait_for(lambda: call.media_frames >= 10, timeout=2)  # the answer
+            await asyncio.sleep(0.2)  # past IDLE_PROMPT_WAIT_S since the prompt
+            alive = not call.closed
+            line.cancel(); await call.stop()
+            return alive
+
+    assert asyncio.run(run())
+    assert _metric("idle_prompt_answered") == answered + 1 and _metric("idle_reaped.silent") == reaped
+
+
+def test_no_media_hangs_up_without_a_prompt(idle):
+    prompted, reaped = _metric("idle_prompted"), _metric("idle_reaped.no_media")
+    idle.setattr(app_mod, "IDLE_SILENCE_S", 5.0)
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "id3", mark_delay_s=0.01)  # and then nothing: the stream went dead
+            assert await wait_for(lambda: call.closed, timeout=2)
+            return call.media_frames
+
+    assert asyncio.run(run()) == 0
+    assert _metric("idle_reaped.no_media") == reaped + 1 and _metric("idle_prompted") == prompted
+
+
+def test_observe_mode_only_records_what_could_be_reclaimed(idle):
+    idle.setattr(app_mod, "IDLE_REAPER", "observe")
+    would, reclaimable = _metric("idle_would_reap.silent"), (app_mod.METRICS.get("idle_reclaimable_min") or {}).get("count", 0)
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "id4", mark_delay_s=0.01)
+            line = asyncio.create_task(_stream(call))
+            assert await wait_for(lambda: _metric("idle_would_reap.silent") == would + 1, timeout=2)
+            await asyncio.sleep(0.3)
+            alive, frames = not call.closed, call.media_frames
+            line.cancel(); await call.stop()
+            return alive, frames
+
+    alive, frames = asyncio.run(run())
+    assert alive and frames == 0  # no prompt played, no hangup
+    stat = app_mod.METRICS["idle_reclaimable_min"]
+    assert stat["count"] == reclaimable + 1 and stat["max"] > 0
@@ -0,0 +1,136 @@
+import asyncio, time
+
+import pytest
+
+import ai_receptionist as app_mod
+from fakes import LocalServer, fake_openai
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Point both LLM endpoints at a local fake server; returns (behaviour dict, setup coroutine)."""
+    monkeypatch.setattr(app_mod, "OPENAI_API_KEY", "test")
+    monkeypatch.setattr(app_mod, "_llm_client", None)
+    monkeypatch.setattr(app_mod, "LLM_HEDGE_ENABLED", True)
+    monkeypatch.setattr(app_mod, "LLM_HEDGE_DELAY_MS", "200")
+    monkeypatch.setattr(app_mod, "LLM_FIRST_TOKEN_DEADLINE_S", 1.5)
+    monkeypatch.setattr(app_mod, "LLM_BREAKER_FAILS", 2)
+    monkeypatch.setattr(app_mod, "LLM_BREAKER_COOLDOWN_S", 0.3)
+    behaviour = {"primary": [{}], "hedge": [{}]}
+    srv = fake_openai(behaviour)
+
+    async def run(coro_fn):
+        async with LocalServer(srv) as server:
+            monkeypatch.setattr(app_mod, "LLM_PRIMARY", app_mod.LLMEndpoint("primary", f"{server.url}/primary", "m", "k"))
+            monkeypatch.setattr(app_mod, "LLM_HEDGE", app_mod.LLMEndpoint("hedge", f"{server.url}/hedge", "m", "k"))
+            try:
+                return await coro_fn()
+            finally:
+                if app_mod._llm_client is not None: await app_mod._llm_client.aclose()
+                app_mod._llm_client = None
+    return behaviour, srv, run
+
+
+async def collect(user_text="Hallo"):
+    return [s async for s in app_mod.llm_stream_sentences([], user_text, {"contact": {}, "meta": {}})]
+
+
+def test_slow_primary_start_is_hedged(llm):
+    behaviour, srv, run = llm
+    behaviour["primary"][:] = [{"delay": 1.0}]
+    async def go():
+        t0 = time.perf_counter(); out = await collect(); return out, time.perf_counter() - t0
+    out, took = asyncio.run(run(go))
+    assert out == ["Hallo hedge."]
+    assert took < 0.8
+    # The loser's elapsed time is recorded as a (censored) TTFT sample
+    assert app_mod.LLM_PRIMARY.ttft_s is not None and app_mod.LLM_PRIMARY.ttft_s >= 0.2
+
+
+def test_cancelled_request_records_no_ttft(llm, monkeypatch):
+    behaviour, srv, run = llm
+    monkeypatch.setattr(app_mod, "LLM_HEDGE_ENABLED", False)
+    behaviour["primary"][:] = [{"delay": 1.0}]
+    async def go():
+        task = asyncio.create_task(collect())
+        await asyncio.sleep(0.3)
+        task.cancel()  # barge-in / new final
+        await asyncio.wait({task})
+    asyncio.run(run(go))
+    assert app_mod.LLM_PRIMARY.ttft_s is None
+    assert app_mod.LLM_PRIMARY.consecutive_failures == 0
+
+
+def test_failures_fall_back_and_open_the_breaker(llm, monkeypatch):
+    behaviour, srv, run = llm
+    monkeypatch.setattr(app_mod, "LLM_HEDGE_ENABLED", False)
+    behaviour["primary"][:] = [{"status": 500}, {"status": 500}, {}]
+    async def go():
+        return [await collect(), await collect(), await collect()]
+    outs = asyncio.run(run(go))
+    # The circuit opens, but with no other endpoint the caller's next turn is still sent
+    assert outs == [[app_mod.LLM_FALLBACK_TEXT], [app_mod.LLM_FALLBACK_TEXT], ["Hallo primary."]]
+    assert srv.requests == ["primary"] * 3
+    assert app_mod.LLM_PRIMARY.available() and app_mod.METRICS.get("llm_breaker_bypassed")
+
+
+def test_open_endpoint_is_skipped_when_another_is_available(llm, monkeypatch):
+    behaviour, srv, run = llm
+    monkeypatch.setattr(app_mod, "LLM_HEDGE_DELAY_MS", "2000")
+    behaviour["primary"][:] = [{"status": 500}]
+    async def go():
+        return [await collect() for _ in range(3)]
+    outs = asyncio.run(run(go))
+    assert outs == [["Hallo hedge."]] * 3
+    assert srv.requests == ["primary", "hedge", "primary", "hedge", "hedge"]
+
+
+def test_client_errors_do_not_count_toward_the_breaker(llm, monkeypatch):
+    behaviour, srv, run = llm
+    monkeypatch.setattr(app_mod, "LLM_HEDGE_ENABLED", False)
+    behaviour["primary"][:] = [{"status": 400}, {"status": 401}, {"status": 404}, {"status": 429}]
+    async def go():
+        return [await collect() for _ in range(4)]
+    asyncio.run(run(go))
+    assert app_mod.LLM_PRIMARY.consecutive_failures == 1  # only the 429
+
+
+def test_primary_failure_hedges_at_once(llm):
+    behaviour, srv, run = llm
+    behaviour["primary"][:] = [{"status": 503}]
+    async def go():
+        t0 = time.perf_counter(); out = await collect(); return out, time.perf_counter() - t0
+    out, took = asyncio.run(run(go))
+    assert out == ["Hallo hedge."] and took < 0.2
+
+
+def test_first_token_deadline_counts_toward_the_breaker(llm, monkeypatch):
+    behaviour, srv, run = llm
+    monkeypatch.setattr(app_mod, "LLM_HEDGE_ENABLED", False)
+    monkeypatch.setattr(app_mod, "LLM_FIRST_TOKEN_DEADLINE_S", 0.3)
+    behaviour["primary"][:] = [{"hang": True}]
+    async def go():
+        await collect(); await collect()
+    asyncio.run(run(go))
+    assert app_mod.LLM_PRIMARY.consecutive_failures == 2
+    assert not app_mod.LLM_PRIMARY.available()
+
+
+def test_half_open_admits_a_single_probe(llm, monkeypatch):
+    behaviour, srv, run = llm
+    monkeypatch.setattr(app_mod, "LLM_HEDGE_DELAY_MS", "2000")
+    behaviour["primary"][:] = [{"status": 500}, {"status": 500}, {"delay": 0.3}]
+    async def go():
+        await collect(); await collect()
+        assert not app_mod.LLM_PRIMARY.available()
+        await asyncio.sleep(0.35)  # cooldown over: half-open
+        assert app_mod.LLM_PRIMARY.available()
+        probe = asyncio.create_task(collect())
+        await asyncio.sleep(0.05)
+        other = await collect()  # while the probe is in flight: goes to the hedge only
+        return await probe, other
+    probe_out, other = asyncio.run(run(go))
+    assert probe_out == ["Hallo primary."]
+    assert other == ["Hallo hedge."]
+    assert srv.requests == ["primary", "hedge", "primary", "hedge", "primary", "hedge"]
+    assert app_mod.LLM_PRIMARY.available() and app_mod.LLM_PRIMARY.consecutive_failures == 0
@@ -0,0 +1,101 @@
+import asyncio, logging, statistics, time
+
+import ai_receptionist as app_mod
+from fakes import LOUD, QUIET, Call, FakeSpeech, app_handlers_only, fake_llm, session_for, wait_for
+
+
+def test_logging_module_state_is_left_alone():
+    assert logging._srcfile is not None
+    assert logging.logThreads and logging.logProcesses and logging.logMultiprocessing
+
+
+def test_ring_records_keep_the_state_at_log_time():
+    cl = app_mod.CallLog(); token = app_mod._call_log.set(cl)
+    try:
+        contact = {"name": None}
+        app_mod.logger.info("[MEM] %s", contact)
+        app_mod.logger.debug("[MEM] debug %s", contact)  # below LOG_RING_LEVEL: neither kept nor rendered
+        contact["name"] = "Meier"
+    finally:
+        app_mod._call_log.reset(token)
+    assert [r.getMessage() for r in cl.ring] == ["[MEM] {'name': None}"]
+
+
+def test_flush_writes_only_what_was_not_written(monkeypatch):
+    """The ring holds lines below LOG_LEVEL and rate-limited ones: a flush never prints a line twice."""
+    written = []
+    monkeypatch.setattr(app_mod, "_log_enqueue", lambda rec: written.append(rec.getMessage()))
+    cl = app_mod.CallLog(); cl.call_sid = "CAring"; token = app_mod._call_log.set(cl)
+    try:
+        app_mod.logger.info("[Caller] %s", "Hallo")          # below LOG_LEVEL (WARNING here): ring only
+        app_mod.logger.warning("[Bot] %s", "Guten Tag")      # written by the handler now
+        for i in range(app_mod.LOG_RATE_BURST + 3):
+            app_mod.logger.warning("[ASR] partial %d", i)    # the last 3 are rate-limited
+        app_mod.logger.error("TTS worker error: %s", "boom")
+    finally:
+        app_mod._call_log.reset(token)
+    kept = [r.getMessage() for r in cl.ring]
+    assert kept == ["[Caller] Hallo"] + [f"[ASR] partial {i}" for i in range(app_mod.LOG_RATE_BURST, app_mod.LOG_RATE_BURST + 3)]
+    cl.flush()
+    assert written == kept and not cl.ring
+
+
+async def _lag_sampler(samples: list, interval: float = 0.01):
+    while True:
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - t0 - interval) * 1000.0)
+
+
+def test_loop_lag_with_concurrent_calls(monkeypatch):
+    """
+    Six calls streaming 20 ms frames at real-time pace, each with a few turns (info lines with
+    dict args land in the call's ring), while a sampler measures how late a 10 ms sleep wakes up.
+    """
+    FakeSpeech(monkeypatch)
+    fake_llm(monkeypatch, [["Gerne.", "Wann passt es Ihnen?"]], delay_s=0.05)
+    calls_n, seconds = 6, 2.0
+
+    async def one(client, i):
+        async with client.websocket("/media") as ws:
+            call = await Call.start(ws, f"lag{i}", mark_delay_s=0.05)
+            assert await wait_for(lambda: session_for(f"CAlag{i}") is not None)
+            s = session_for(f"CAlag{i}")
+            frames = int(seconds / 0.02)
+            for n in range(frames):
+                await call.media(LOUD if n % 50 < 10 else QUIET)
+                if n % 50 == 10: s.recognizer.say(f"Ich hätte gern einen Termin, Nummer {n}.")
+                await asyncio.sleep(0.02)
+            await call.stop()
+
+    async def run():
+        samples = []
+        sampler = asyncio.create_task(_lag_sampler(samples))
+        client = app_mod.app.test_client()
+        await asyncio.gather(*(one(client, i) for i in range(calls_n)))
+        sampler.cancel()
+        return samples
+
+    with app_handlers_only():
+        samples = sorted(asyncio.run(run()))
+    p50 = statistics.median(samples); p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"\nloop lag over {len(samples)} samples ({calls_n} calls): p50 {p50:.2f} ms, p99 {p99:.2f} ms, max {samples[-1]:.2f} ms")
+    assert p99 < 25.0
+
+
+def test_filtered_debug_line_costs_nothing_on_the_loop():
+    cl = app_mod.CallLog(); token = app_mod._call_log.set(cl)
+    contact = {"name": "Meier", "address": {"street": "Knollerstraße", "house": "4"}}
+    try:
+        n = 20000
+        with app_handlers_only():
+            t0 = time.perf_counter()
+            for _ in range(n): app_mod.logger.debug("[MEM] %s", contact)
+            debug_us = (time.perf_counter() - t0) / n * 1e6
+            t0 = time.perf_counter()
+            for _ in range(n): app_mod.logger.info("[MEM] %s", contact)
+            info_us = (time.perf_counter() - t0) / n * 1e6
+    finally:
+        app_mod._call_log.reset(token)
+    print(f"\nper line on the loop: debug {debug_us:.2f} us (filtered), info into the ring {info_us:.2f} us")
+    assert debug_us < 3.0 and not any(r.levelno < logging.INFO for r in cl.ring)
@@ -0,0 +1,145 @@
+import asyncio, time
+
+import ai_receptionist as app_mod
+from fakes import LOUD, Call, FakeSpeech, fake_llm, session_for, wait_for
+
+
+def _sent(pb, frames: int, every: int = 10) -> list:
+    """Send `frames` 20 ms frames the way tts_worker does; returns the mark names."""
+    marks = []
+    for i in range(1, frames + 1):
+        pb.on_frame(20.0)
+        if i % every == 0: marks.append(pb.next_mark())
+    if frames % every: marks.append(pb.next_mark())
+    return marks
+
+
+def test_marks_are_numbered_and_follow_the_frames(monkeypatch):
+    monkeypatch.setattr(app_mod, "EOT_MODE", "off")
+    speech = FakeSpeech(monkeypatch)
+    for name in ("a", "b"):
+        speech.behaviour(name).update(chunks=25, audio=b"\xff" * 160)  # 25 frames: marks after 10, 20 and 25
+    fake_llm(monkeypatch, [["Gerne."]])
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "pb1", mark_delay_s=0.01)
+            assert await wait_for(lambda: session_for("CApb1") is not None)
+            s = session_for("CApb1")
+            s.recognizer.say("Hallo.")
+            assert await wait_for(lambda: call.events.count("mark") == 3, timeout=5)
+            assert await wait_for(lambda: not s.playback._pending)
+            events = list(call.events); pb = s.playback
+            await call.stop()
+            return events, pb
+
+    events, pb = asyncio.run(run())
+    media_before = [events[:i].count("media") for i, e in enumerate(events) if e == "mark"]
+    assert media_before == [10, 20, 25]
+    assert pb.seq == 3 and pb.sent_ms == 500 and pb.acked_ms == 500
+
+
+def test_wait_capacity_holds_until_an_ack_or_the_cap():
+    async def run():
+        pb = app_mod.PlaybackTracker()
+        marks = _sent(pb, 50)  # 1 s ahead of real time at once
+        t0 = time.perf_counter(); await pb.wait_capacity(400); capped = time.perf_counter() - t0
+
+        pb = app_mod.PlaybackTracker()
+        marks = _sent(pb, 50)
+        asyncio.get_running_loop().call_later(0.1, pb.on_mark, marks[-1])
+        t0 = time.perf_counter(); await pb.wait_capacity(400); acked = time.perf_counter() - t0
+
+        t0 = time.perf_counter(); await pb.wait_capacity(400); free = time.perf_counter() - t0
+        return capped, acked, free
+
+    capped, acked, free = asyncio.run(run())
+    assert 0.5 <= capped < 0.8      # waits out the excess over the cap (~600 ms) when no ack comes
+    assert 0.08 <= acked < 0.3      # an ack releases the sender early
+    assert free < 0.01              # nothing ahead: no wait
+
+
+def test_acks_after_clear_are_discarded_not_heard():
+    pb = app_mod.PlaybackTracker()
+    pb.begin_segment(1, "eins zwei drei vier fünf sechs sieben acht neun zehn")
+    marks = _sent(pb, 50)  # 1 s of sentence, a mark every 200 ms
+    pb.on_mark(marks[0]); pb.on_mark(marks[1])  # 400 ms played
+    assert pb.on_clear() is True and pb.interrupted == {1}
+    assert pb.heard_text(1) == "eins zwei drei vier …"
+    for name in marks[2:]:
+        pb.on_mark(name)  # Twilio acks the cleared marks right away: not played audio
+    assert pb.heard_text(1) == "eins zwei drei vier …"
+    assert len(pb.barge_stop_ms) == 1 and pb.summary()["barge_ins"] == 1
+    assert pb.ahead_ms() == 0
+
+    pb.on_mark("pb-unknown")  # stale or foreign marks are ignored
+    assert pb.summary()["marks"] == 5
+
+
+def test_heard_text_cuts_by_played_duration():
+    pb = app_mod.PlaybackTracker()
+    pb.begin_segment(7, "Guten Tag.")
+    first = _sent(pb, 10)
+    pb.begin_segment(7, "Ich erkläre Ihnen jetzt alle unsere Leistungen rund um das Auto.")
+    second = _sent(pb, 20)
+    assert pb.heard_text(7) == ""
+    for name in first: pb.on_mark(name)
+    assert pb.heard_text(7) == "Guten Tag."
+    pb.on_mark(second[0])  # half of the second sentence
+    assert pb.heard_text(7) == "Guten Tag. Ich erkläre Ihnen jetzt alle …"
+    pb.on_mark(second[1])
+    assert pb.heard_text(7) == "Guten Tag. Ich erkläre Ihnen jetzt alle unsere Leistungen rund um das Auto."
+
+
+def test_barge_in_trims_history_to_what_was_heard(monkeypatch):
+    monkeypatch.setattr(app_mod, "EOT_MODE", "off")
+    speech = FakeSpeech(monkeypatch)
+    for name in ("a", "b"):
+        speech.behaviour(name).update(chunks=50, audio=b"\xff" * 160)  # 1 s per sentence
+    full = ["Guten Tag.", "Ich erkläre Ihnen jetzt ausführlich alle unsere Leistungen rund um Ihr Auto."]
+    fake_llm(monkeypatch, [full])
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "pb2", mark_delay_s=0.2)  # Twilio acks once played
+            assert await wait_for(lambda: session_for("CApb2") is not None)
+            s = session_for("CApb2")
+            s.recognizer.say("Was machen Sie so?")
+            assert await wait_for(lambda: call.media_frames >= 70, timeout=5)  # well into the second sentence
+            await call.media(LOUD, n=6)
+            assert await wait_for(lambda: "clear" in call.events)
+            assert await wait_for(lambda: s.playback.barge_stop_ms, timeout=2)
+            history, pb = [dict(m) for m in s.history], s.playback
+            await call.stop()
+            return history, pb
+
+    history, pb = asyncio.run(run())
+    said = [m["content"] for m in history if m["role"] == "assistant"]
+    assert len(said) == 1 and said[0].startswith("Guten Tag.") and said[0] != " ".join(full)
+    assert pb.interrupted
+    # Outstanding marks come back ~200 ms after the clear; that is how long the caller still heard us
+    assert 150 <= pb.barge_stop_ms[0] < 1000
+    # Paced by acks: never much more than PLAYBACK_MAX_AHEAD_MS queued at Twilio
+    summary = pb.summary()
+    assert 0 < summary["ahead_avg_ms"] <= summary["ahead_max_ms"] <= app_mod.PLAYBACK_MAX_AHEAD_MS + 100
+
+
+def test_goodbye_hangs_up_after_the_last_mark_is_acked(monkeypatch):
+    monkeypatch.setattr(app_mod, "EOT_MODE", "off")
+    speech = FakeSpeech(monkeypatch)
+    for name in ("a", "b"):
+        speech.behaviour(name).update(chunks=5, audio=b"\xff" * 160)
+    fake_llm(monkeypatch, [["Vielen Dank für Ihren Anruf, auf Wiederhören!"]])
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "pb3", mark_delay_s=0.5)
+            assert await wait_for(lambda: session_for("CApb3") is not None)
+            session_for("CApb3").recognizer.say("Das war alles, danke, tschüss.")
+            assert await wait_for(lambda: "mark" in call.events, timeout=5)
+            t_sent = time.perf_counter()
+            assert await wait_for(lambda: call.closed, timeout=5)
+            return time.perf_counter() - t_sent
+
+    waited = asyncio.run(run())
+    assert 0.4 <= waited < 1.2  # the ack, not the drain timeout (ahead + PLAYBACK_DRAIN_GRACE_S)
@@ -0,0 +1,72 @@
+import asyncio, gc, os, threading
+
+import ai_receptionist as app_mod
+from fakes import LOUD, QUIET, Call, FakeSpeech, app_handlers_only, fake_llm, session_for, wait_for
+
+
+def test_long_sentence_is_played_in_full(monkeypatch):
+    """A burst of synthesized chunks larger than any fixed queue cap still reaches the caller whole."""
+    monkeypatch.setattr(app_mod, "EOT_MODE", "off")
+    speech = FakeSpeech(monkeypatch)
+    for name in ("a", "b"):
+        speech.behaviour(name).update(chunks=600, audio=b"\xff" * 160)  # 600 frames, 12 s of audio
+    fake_llm(monkeypatch, [["Das ist ein sehr langer Satz, den ich Ihnen jetzt vorlese."]])
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "long1", mark_delay_s=0.001)
+            assert await wait_for(lambda: session_for("CAlong1") is not None)
+            session_for("CAlong1").recognizer.say("Lesen Sie mir bitte etwas vor.")
+            assert await wait_for(lambda: call.media_frames >= 600, timeout=10)
+            await asyncio.sleep(0.2)
+            await call.stop()
+            return call.media_frames
+    assert asyncio.run(run()) == 600
+    assert not app_mod.METRICS.get("queue_overflow_audio")
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def test_soak_sessions_are_released(monkeypatch):
+    """
+    Hundreds of short calls through /media (greeting-less, one caller turn, two bot sentences,
+    marks acked): afterwards no session, task or thread is left and RSS stays flat.
+    """
+    monkeypatch.setattr(app_mod, "EOT_MODE", "off")
+    FakeSpeech(monkeypatch)
+    fake_llm(monkeypatch, [["Gerne, ich helfe Ihnen.", "Wann passt es Ihnen?"]], delay_s=0.005)
+    rounds, per_round, conc = 5, 100, 20
+
+    async def one(client, i):
+        async with client.websocket("/media") as ws:
+            call = await Call.start(ws, f"soak{i}", mark_delay_s=0.005)
+            assert await wait_for(lambda: session_for(f"CAsoak{i}") is not None)
+            await call.media(LOUD, n=5)
+            session_for(f"CAsoak{i}").recognizer.say("Ich brauche einen Termin.")
+            await wait_for(lambda: call.media_frames >= 10, timeout=3)
+            await call.media(QUIET, n=5)
+            await call.stop()
+
+    async def run():
+        client = app_mod.app.test_client(); sem = asyncio.Semaphore(conc)
+        async def bounded(i):
+            async with sem: await one(client, i)
+        base_tasks = len(asyncio.all_tasks()); rows = []
+        for r in range(rounds):
+            await asyncio.gather(*(bounded(r * per_round + j) for j in range(per_round)))
+            await asyncio.sleep(0.2); gc.collect()
+            rows.append((_rss_mb(), len(asyncio.all_tasks()) - base_tasks, threading.active_count()))
+        return rows
+
+    with app_handlers_only():
+        rows = asyncio.run(run())
+    gc.collect()
+    print("\nafter each round of %d calls (rss MB, extra tasks, threads): %s" % (per_round, rows))
+    assert not app_mod.SESSIONS
+    assert len(app_mod._closed_sessions) == 0
+    assert all(extra == 0 for _rss, extra, _th in rows)
+    assert rows[-1][2] <= rows[0][2] + 2
+    assert rows[-1][0] - rows[0][0] < 5.0
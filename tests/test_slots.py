@@ -0,0 +1,150 @@
+import asyncio, json, random, time
+from datetime import date, datetime, timedelta, timezone
+
+import ai_receptionist as app_mod
+
+INFO = open("business_info.txt", encoding="utf-8").read()
+
+
+def engine(tmp_path=None):
+    e = app_mod.SlotEngine(INFO)
+    if tmp_path is not None: e.path = str(tmp_path / "bookings.json")
+    return e
+
+
+def test_offset_aware_starts_are_converted_to_local_time():
+    e = engine()
+    local = datetime(2030, 3, 5, 9, 0)  # CET, UTC+1
+    assert app_mod._to_min(datetime(2030, 3, 5, 8, 0, tzinfo=timezone.utc)) == app_mod._to_min(local)
+    assert app_mod._to_min(datetime.fromisoformat("2030-07-02T09:00+02:00")) == app_mod._to_min(datetime(2030, 7, 2, 9, 0))
+    assert e.book(datetime(2030, 3, 5, 8, 0, tzinfo=timezone.utc)) == "Mechanic A"
+    assert e.book(local) == "Mechanic B"  # the same local slot: A is taken
+    assert e.book(local) is None
+
+
+def test_load_bookings_skips_bad_entries(tmp_path, caplog):
+    path = tmp_path / "bookings.json"
+    path.write_text(json.dumps([
+        {"start": "2030-03-05T09:00", "minutes": 60},
+        {"minutes": 30},                                  # no start
+        {"start": "next tuesday"},                        # unparsable
+        {"start": "2030-03-05T10:30", "minutes": "lots"},
+        "2030-03-05T11:00",                               # not an object
+        None,
+        {"start": "2030-03-05T09:00+01:00", "mechanic": "Mechanic B"},
+    ]))
+    e = engine(); e.load_bookings(str(path))
+    assert sum(len(v) for v in e._starts.values()) == 2
+    assert sum("skipping booking" in r.getMessage() for r in caplog.records) == 5
+
+    path.write_text(json.dumps({"start": "2030-03-05T09:00"}))
+    e = engine(); e.load_bookings(str(path))  # not a list: logged, calendar empty
+    assert not any(e._starts.values())
+    path.write_text("[{")
+    engine().load_bookings(str(path))
+
+
+def test_slot_offer_parsing():
+    today = date(2030, 10, 20)
+    assert app_mod._parse_slot_offer("Passt Ihnen Dienstag, 22. Oktober um 9:30 Uhr?", today) == datetime(2030, 10, 22, 9, 30)
+    assert app_mod._parse_slot_offer("Ich trage Sie am 24 October um 09:00 ein.", today) == datetime(2030, 10, 24, 9, 0)
+    assert app_mod._parse_slot_offer("Wie wäre der 3. Januar um 8 Uhr?", today) == datetime(2031, 1, 3, 8, 0)
+    assert app_mod._parse_slot_offer("Am 22. Oktober um 9:00 oder am 23. Oktober um 10:00?", today) is None
+    assert app_mod._parse_slot_offer("Wir haben am Dienstag noch etwas frei.", today) is None
+
+
+def test_confirmed_slot_is_booked_once_across_calls(tmp_path, monkeypatch):
+    prof = app_mod.tenants.get(app_mod.DEFAULT_TENANT)
+    e = engine(tmp_path); monkeypatch.setattr(prof, "slots", e)
+    when = datetime(2030, 3, 5, 9, 0)
+    offer = "Dann trage ich Sie am 5. März 2030 um 9:00 ein, passt das?"
+
+    def call():
+        return {"contact": {}, "meta": {}, "profile": prof}
+
+    async def run():
+        calls = [call() for _ in range(3)]
+        for cs in calls:
+            app_mod.note_slot_offer(offer, cs)
+            app_mod.extract_booking("Ja, passt.", cs)
+        await asyncio.sleep(0.2)  # the bookings file is written off the loop
+        return calls
+
+    a, b, c = asyncio.run(run())
+    assert a["meta"]["bookings"] == [(when, "Mechanic A")]
+    assert b["meta"]["bookings"] == [(when, "Mechanic B")]
+    assert c["meta"]["slot_taken"] == when and "bookings" not in c["meta"]
+    assert "just booked by someone else" in app_mod.build_system_prompt_with_memory(c)
+    assert "Booked in this call: Tuesday 05 March 2030 09:00" in app_mod.build_system_prompt_with_memory(a)
+
+    # Declining or changing the subject books nothing
+    d = call(); app_mod.note_slot_offer("Am 5. März 2030 um 14:00?", d); app_mod.extract_booking("Nein, lieber später.", d)
+    assert "bookings" not in d["meta"] and "slot_offer" not in d["meta"]
+
+    # Persisted: a fresh engine (restart, profile reload) sees both bookings
+    fresh = engine(); fresh.load_bookings(e.path)
+    assert fresh.book(when) is None and fresh.dump()[1] == e.dump()[1]
+
+
+def test_bookings_record_who_is_coming(tmp_path, monkeypatch):
+    prof = app_mod.tenants.get(app_mod.DEFAULT_TENANT)
+    e = engine(tmp_path); monkeypatch.setattr(prof, "slots", e)
+    cs = {"contact": {"name": None, "phone": "+4917612345678"}, "meta": {"call_sid": "CA1"}, "profile": prof}
+
+    async def run():
+        app_mod.note_slot_offer("Dann trage ich Sie am 5. März 2030 um 9:00 ein, passt das?", cs)
+        app_mod.extract_booking("Ja, passt.", cs)
+        cs["contact"]["name"] = "Max Mustermann"  # the name comes later in the call
+        app_mod.annotate_bookings(cs)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(run())
+    saved = json.loads(open(e.path, encoding="utf-8").read())
+    assert saved == [{"start": "2030-03-05T09:00", "minutes": app_mod.SLOT_JOB_MIN, "mechanic": "Mechanic A",
+                      "call_sid": "CA1", "phone": "+4917612345678", "name": "Max Mustermann"}]
+
+    fresh = engine(); fresh.load_bookings(e.path)
+    assert fresh.dump()[1] == e.dump()[1]
+    v = fresh.version; fresh.annotate(datetime(2030, 3, 5, 9, 0), "Mechanic A", name="Max Mustermann")
+    assert fresh.version == v  # nothing new: no rewrite
+    fresh.roll(date(2030, 3, 6))
+    assert fresh._details == {}
+
+
+def test_thousands_of_bookings_match_brute_force():
+    """Interval index vs. a brute-force scan over ~4k bookings; also reports per-query cost."""
+    e = engine(); rng = random.Random(7)
+    day0 = date(2030, 1, 7)
+    days = [day0 + timedelta(days=i) for i in range(600) if (day0 + timedelta(days=i)).weekday() < 5]
+    booked = []  # (mech, start_min, end_min)
+    for _ in range(6000):
+        d = rng.choice(days)
+        t = datetime(d.year, d.month, d.day, rng.choice([7, 8, 9, 10, 13, 14, 15, 16]), rng.choice([0, 30]))
+        minutes = rng.choice([30, 60, 90])
+        mech = e.book(t, minutes)
+        if mech:
+            s = app_mod._to_min(t); booked.append((mech, s, s + minutes + e.buffer_min))
+    assert len(booked) > 3000
+
+    def brute_free(d, minutes=app_mod.SLOT_JOB_MIN):
+        base = app_mod._to_min(datetime(d.year, d.month, d.day)); out = set()
+        for w0, w1 in e.windows:
+            for t in range(base + w0, base + w1 - minutes + 1, app_mod.SLOT_STEP_MIN):
+                for mech in e.mechanics:
+                    if all(not (s < t + minutes + e.buffer_min and t < en) for m, s, en in booked if m == mech):
+                        out.add(t); break
+        return sorted(out)
+
+    for d in rng.sample(days, 25):
+        assert [app_mod._to_min(t) for t, _m in e.free_slots(d)] == brute_free(d)
+
+    t0 = time.perf_counter(); n = 0
+    for d in days:
+        e.free_slots(d); n += 1
+    per_query_us = (time.perf_counter() - t0) / n * 1e6
+    t0 = time.perf_counter()
+    for mech, s, en in booked:
+        e._is_free(mech, s, en)
+    per_check_us = (time.perf_counter() - t0) / len(booked) * 1e6
+    print(f"\n{len(booked)} bookings: free_slots {per_query_us:.1f} us/day, conflict check {per_check_us:.2f} us")
+    assert per_query_us < 500 and per_check_us < 50
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+import ai_receptionist as app_mod
+from fakes import Call, FakeSpeech, fake_llm, session_for, wait_for
+
+
+@pytest.fixture
+def router(monkeypatch):
+    """Fresh endpoints a and b (no latency history, circuits closed), no random exploration."""
+    r = app_mod.SpeechRouter([app_mod.SpeechEndpoint("a", host="ws://fake-a"), app_mod.SpeechEndpoint("b", host="ws://fake-b")])
+    monkeypatch.setattr(app_mod, "speech_router", r)
+    monkeypatch.setattr(app_mod, "SPEECH_EXPLORE", 0.0)
+    monkeypatch.setattr(app_mod, "EOT_MODE", "off")
+    return r
+
+
+def _metric(name: str) -> int:
+    return app_mod.METRICS.get(name, 0)
+
+
+def test_pick_follows_the_lower_score(router):
+    a, b = router.endpoints
+    assert [router.pick("tts").name for _ in range(4)] == ["a", "b", "a", "b"]  # unmeasured: round-robin
+    for _ in range(5):
+        a.record_latency("tts", 400.0); b.record_latency("tts", 150.0)
+        a.record_latency("asr", 200.0); b.record_latency("asr", 600.0)
+    assert router.pick("tts") is b and router.pick("asr") is a  # per kind
+    assert router.pick("tts", exclude=(b,)) is a
+    b.record_failure("tts", "fake 429")  # a recent failure costs 1000 ms of score
+    assert router.pick("tts") is a
+    b.record_success()
+    assert router.pick("tts") is b
+
+
+def test_breaker_opens_after_consecutive_failures(router, monkeypatch):
+    monkeypatch.setattr(app_mod, "SPEECH_BREAKER_COOLDOWN_S", 30.0)
+    a, b = router.endpoints
+    for _ in range(5):
+        a.record_latency("tts", 100.0); b.record_latency("tts", 100.0)
+    opened = _metric("speech_breaker_open.a")
+    for _ in range(app_mod.SPEECH_BREAKER_FAILS - 1):
+        a.record_failure("tts", "fake")
+    assert a.available()
+    a.record_failure("tts", "fake")
+    assert not a.available() and _metric("speech_breaker_open.a") == opened + 1
+    a.consecutive_failures = 0  # even with a good score, an open circuit is skipped
+    assert all(router.pick("tts") is b for _ in range(3))
+    b.record_failure("tts", "fake"); b.open_until = a.open_until  # everything open: still pick something
+    assert router.pick("tts") in (a, b)
+    a.record_success()
+    assert a.available() and router.stats()["a"]["available"]
+
+
+def _tts_starts_on_a(router):
+    router.endpoints[1].record_latency("tts", 500.0)  # a is unmeasured, so it scores better
+
+
+def _call(sid: str, say: str = "Hallo.", frames: int = 5, timeout: float = 5.0):
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, sid, mark_delay_s=0.01)
+            assert await wait_for(lambda: session_for(f"CA{sid}") is not None)
+            s = session_for(f"CA{sid}")
+            if say: s.recognizer.say(say)
+            got = await wait_for(lambda: call.media_frames >= frames, timeout=timeout)
+            await asyncio.sleep(0.1)
+            state = (got, call.media_frames, s.synthesizer.speech_endpoint.name, s.failovers)
+            await call.stop()
+            return state
+    return asyncio.run(run())
+
+
+def test_tts_fails_over_on_synthesis_canceled(router, monkeypatch):
+    _tts_starts_on_a(router)
+    speech = FakeSpeech(monkeypatch, a={"cancel": True}, b={})
+    fake_llm(monkeypatch, [["Guten Tag, was kann ich für Sie tun?"]])
+    before = _metric("speech_failovers_tts")
+    got, frames, tts, failovers = _call("sp1")
+    assert got and frames == 5 and tts == "b" and failovers == 1  # the sentence was said again on b
+    assert _metric("speech_failovers_tts") == before + 1
+    assert router.endpoints[0].consecutive_failures == 1 and router.endpoints[1].lat.get("tts")
+
+
+def test_tts_fails_over_when_no_audio_arrives_in_time(router, monkeypatch):
+    _tts_starts_on_a(router)
+    monkeypatch.setattr(app_mod, "SPEECH_TTFC_TIMEOUT_S", 0.3)
+    FakeSpeech(monkeypatch, a={"hang": True}, b={})
+    fake_llm(monkeypatch, [["Guten Tag, was kann ich für Sie tun?"]])
+    got, frames, tts, failovers = _call("sp2")
+    assert got and frames == 5 and tts == "b" and failovers == 1
+    assert router.endpoints[0].consecutive_failures == 1
+
+
+def test_asr_fails_over_to_the_other_endpoint(router, monkeypatch):
+    speech = FakeSpeech(monkeypatch, a={"asr_cancel": True}, b={})
+    fake_llm(monkeypatch, [["Gerne."]])
+    before = _metric("speech_failovers_asr")
+
+    async def run():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "sp3", mark_delay_s=0.01)
+            assert await wait_for(lambda: session_for("CAsp3") is not None)
+            s = session_for("CAsp3"); first = s.recognizer
+            assert first.speech_endpoint.name == "a"
+            first.say("Hallo?")  # recognizer on a is canceled
+            assert await wait_for(lambda: s.recognizer is not first)
+            assert s.recognizer.speech_endpoint.name == "b" and not first.recognized.cbs  # old one detached
+            s.recognizer.say("Hallo, hören Sie mich?")
+            assert await wait_for(lambda: call.media_frames >= 5)
+            await call.stop()
+
+    asyncio.run(run())
+    assert _metric("speech_failovers_asr") == before + 1
+    assert [r.speech_endpoint.name for r in speech.recognizers] == ["a", "b"]
+
+
+def test_failovers_per_call_are_capped(router, monkeypatch):
+    _tts_starts_on_a(router)
+    monkeypatch.setattr(app_mod, "SPEECH_FAILOVERS_PER_CALL", 1)
+    FakeSpeech(monkeypatch, a={"cancel": True}, b={"cancel": True})
+    fake_llm(monkeypatch, [["Guten Tag."]])
+    refused = _metric("speech_failover_refused_tts")
+    got, frames, tts, failovers = _call("sp4", timeout=1.0)
+    assert not got and frames == 0  # both endpoints failed; no third synthesizer for this call
+    assert tts == "b" and failovers == 1
+    assert _metric("speech_failover_refused_tts") == refused + 1
@@ -0,0 +1,110 @@
+import asyncio, json, os, time
+
+import ai_receptionist as app_mod
+from fakes import wait_for
+
+
+def test_stale_profile_recompiles_off_the_loop(tmp_path, monkeypatch):
+    info = tmp_path / "info.txt"; info.write_text(open("business_info.txt", encoding="utf-8").read())
+    bookings = tmp_path / "bookings.json"
+    tenants_file = tmp_path / "tenants.json"
+    tenants_file.write_text(json.dumps({"acme": {"numbers": ["+49891234"], "business_info_file": str(info),
+                                                 "bookings_file": str(bookings)}}))
+    monkeypatch.setattr(app_mod, "TENANT_RELOAD_CHECK_S", 0.0)
+    reg = app_mod.TenantRegistry(str(tenants_file), 4)
+    compile_ = app_mod.LowLatencyReceptionist._compile
+    def slow_compile(self):
+        time.sleep(0.4); return compile_(self)
+    monkeypatch.setattr(app_mod.LowLatencyReceptionist, "_compile", slow_compile)
+
+    async def run():
+        first = reg.get("acme")
+        assert list(first.sources) == [str(info)]  # our own bookings writes must not trigger reloads
+        st = os.stat(info); os.utime(info, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        # The loop keeps turning while the profile recompiles in a worker
+        ticks = 0
+        async def ticker():
+            nonlocal ticks
+            while True: await asyncio.sleep(0.01); ticks += 1
+        t = asyncio.create_task(ticker())
+        t0 = time.perf_counter(); same = reg.get("acme"); took = time.perf_counter() - t0
+        assert same is first and took < 0.05
+        assert reg.get("acme") is first  # one reload in flight, not one per call
+        assert await wait_for(lambda: reg.get("acme") is not first, timeout=3)
+        t.cancel()
+        assert ticks > 20
+
+        second = reg.get("acme")
+        assert second.slots is first.slots  # the reload kept the live calendar
+        second.slots.book(app_mod.datetime(2030, 3, 5, 9, 0)); second.slots.write(*second.slots.dump())
+        await asyncio.sleep(0.1)
+        assert reg.get("acme") is second and "acme" not in reg._reloading
+        return second
+
+    second = asyncio.run(run())
+    assert json.loads(bookings.read_text())[0]["start"] == "2030-03-05T09:00"
+    assert sum(map(len, second.slots._starts.values())) == 1
+
+
+def test_booking_during_recompile_keeps_the_live_calendar(tmp_path, monkeypatch):
+    info = tmp_path / "info.txt"; info.write_text(open("business_info.txt", encoding="utf-8").read())
+    tenants_file = tmp_path / "tenants.json"
+    tenants_file.write_text(json.dumps({"acme": {"business_info_file": str(info), "bookings_file": str(tmp_path / "b.json")}}))
+    monkeypatch.setattr(app_mod, "TENANT_RELOAD_CHECK_S", 0.0)
+    reg = app_mod.TenantRegistry(str(tenants_file), 4)
+    compile_ = app_mod.LowLatencyReceptionist._compile
+    monkeypatch.setattr(app_mod.LowLatencyReceptionist, "_compile", lambda self: (time.sleep(0.3), compile_(self))[1])
+
+    when = app_mod.datetime(2030, 3, 5, 9, 0)
+
+    async def run():
+        first = reg.get("acme")
+        st = os.stat(info); os.utime(info, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        reg.get("acme")
+        assert first.slots.book(when) == "Mechanic A"  # a call commits a slot meanwhile
+        assert await wait_for(lambda: reg.get("acme") is not first, timeout=3)
+        second = reg.get("acme")
+        # Calls on either generation book into one calendar: no double booking of a mechanic
+        assert second.slots.book(when) == "Mechanic B"
+        assert first.slots.book(when) is None
+        return second
+
+    second = asyncio.run(run())
+    assert sum(map(len, second.slots._starts.values())) == 2
+
+
+def test_rules_change_keeps_the_bookings(tmp_path, monkeypatch):
+    text = open("business_info.txt", encoding="utf-8").read()
+    info = tmp_path / "info.txt"; info.write_text(text)
+    tenants_file = tmp_path / "tenants.json"
+    tenants_file.write_text(json.dumps({"acme": {"business_info_file": str(info), "bookings_file": str(tmp_path / "b.json")}}))
+    monkeypatch.setattr(app_mod, "TENANT_RELOAD_CHECK_S", 0.0)
+    reg = app_mod.TenantRegistry(str(tenants_file), 4)
+    first = reg.get("acme")
+    assert first.slots.book(app_mod.datetime(2030, 3, 5, 9, 0)) == "Mechanic A"
+    info.write_text(text.replace("2 mechanics (Mechanic A, Mechanic B)", "3 mechanics (Mechanic A, Mechanic B, Mechanic C)"))
+    os.utime(info, ns=(0, time.time_ns() + 10**9))
+    reg.get("acme")  # no loop: recompiles inline, this call still gets the old profile
+    second = reg.get("acme")
+    assert second is not first and second.slots is first.slots
+    assert second.slots.mechanics == ["Mechanic A", "Mechanic B", "Mechanic C"]
+    assert second.slots.book(app_mod.datetime(2030, 3, 5, 9, 0)) == "Mechanic B"
+
+
+def test_each_tenant_gets_its_own_bookings_file(tmp_path, monkeypatch, caplog):
+    tenants_file = tmp_path / "tenants.json"
+    tenants_file.write_text(json.dumps({"acme": {"numbers": ["+49891"]}, "bolt": {"numbers": ["+49892"]}}))
+    monkeypatch.setattr(app_mod, "TENANT_RELOAD_CHECK_S", 0.0)
+    monkeypatch.setenv("SLOT_BOOKINGS_FILE", str(tmp_path / "bookings.json"))
+    reg = app_mod.TenantRegistry(str(tenants_file), 4)
+    paths = {k: reg.get(k).slots.path for k in ("acme", "bolt", app_mod.DEFAULT_TENANT)}
+    assert paths == {"acme": str(tmp_path / "bookings-acme.json"), "bolt": str(tmp_path / "bookings-bolt.json"),
+                     app_mod.DEFAULT_TENANT: str(tmp_path / "bookings.json")}
+    assert reg.get("acme").slots is not reg.get("bolt").slots
+
+    # Two tenants pointed at one file would fork its calendar: the tenants file is refused
+    tenants_file.write_text(json.dumps({"acme": {"numbers": ["+49891"]}, "bolt": {"numbers": ["+49892"], "bookings_file": paths["acme"]}}))
+    os.utime(tenants_file, ns=(0, time.time_ns() + 10**9))
+    assert reg.resolve("+49892") == "bolt"
+    assert any("both use" in r.getMessage() for r in caplog.records)
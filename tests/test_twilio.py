@@ -0,0 +1,73 @@
+import asyncio, time
+
+import pytest
+
+import ai_receptionist as app_mod
+from fakes import Call, FakeSpeech, LocalServer, fake_llm, fake_twilio, session_for, wait_for
+
+
+@pytest.fixture
+def twilio(monkeypatch):
+    monkeypatch.setenv("TWILIO_ACCOUNT_SID", "ACtest")
+    monkeypatch.setenv("TWILIO_AUTH_TOKEN", "secret")
+    monkeypatch.setattr(app_mod, "TWILIO_CTRL_RETRIES", 3)
+    ctrl = app_mod.TwilioControl()
+    monkeypatch.setattr(app_mod, "twilio_control", ctrl)
+    return ctrl
+
+
+def _run(srv, ctrl, coro_fn, monkeypatch):
+    async def go():
+        async with LocalServer(srv) as server:
+            monkeypatch.setattr(app_mod, "TWILIO_API_BASE", server.url)
+            try:
+                return await coro_fn()
+            finally:
+                await ctrl.aclose()
+    return asyncio.run(go())
+
+
+@pytest.mark.parametrize("plan, ok, forms", [
+    ([200], True, ["completed"]),
+    ([400, 200], True, ["completed", "redirect"]),              # direct hangup refused: <Hangup/> redirect
+    ([503, 503, 500, 200], True, ["completed", "redirect", "completed", "redirect"]),  # transient: retried
+    ([400, 400], False, ["completed", "redirect"]),             # final 4xx: not retried
+    ([500] * 6, False, ["completed", "redirect"] * 3),          # gives up after TWILIO_CTRL_RETRIES
+])
+def test_hangup_retries_and_falls_back(twilio, monkeypatch, plan, ok, forms):
+    srv = fake_twilio(list(plan))
+    result = _run(srv, twilio, lambda: twilio.submit_hangup("CA1", "https://app.example"), monkeypatch)
+    assert result is ok
+    assert [("completed" if f.get("Status") == "completed" else "redirect") for _sid, f, _u in srv.requests] == forms
+    assert all(sid == "CA1" and user == "ACtest" for sid, _f, user in srv.requests)
+    redirects = [f for _sid, f, _u in srv.requests if "Url" in f]
+    assert all(f["Url"] == "https://app.example/hangup-twiml" for f in redirects)
+    assert app_mod.METRICS.get(f"twilio_jobs_{'ok' if ok else 'failed'}.hangup")
+
+
+def test_transfer_redirects_to_transfer_twiml(twilio, monkeypatch):
+    srv = fake_twilio([])
+    assert _run(srv, twilio, lambda: twilio.transfer("CA2", "https://app.example"), monkeypatch)
+    assert srv.requests == [("CA2", {"Url": "https://app.example/transfer-twiml", "Method": "GET"}, "ACtest")]
+
+
+def test_goodbye_closes_the_stream_without_waiting_for_twilio(twilio, monkeypatch):
+    """The farewell ends the media stream at once; the slow REST hangup completes in the background."""
+    FakeSpeech(monkeypatch)
+    fake_llm(monkeypatch, [["Vielen Dank für Ihren Anruf, auf Wiederhören!"]])
+    srv = fake_twilio([], delay_s=1.0)
+
+    async def go():
+        async with app_mod.app.test_client().websocket("/media") as ws:
+            call = await Call.start(ws, "tw1")
+            assert await wait_for(lambda: session_for("CAtw1") is not None)
+            session_for("CAtw1").recognizer.say("Das war alles, danke, tschüss.")
+            assert await wait_for(lambda: call.closed, timeout=5)
+            closed_at = time.perf_counter()
+            assert not srv.requests  # Twilio hasn't answered yet
+            assert await wait_for(lambda: srv.requests, timeout=5)
+            return time.perf_counter() - closed_at
+
+    waited = _run(srv, twilio, go, monkeypatch)
+    assert waited > 0.5
+    assert srv.requests == [("CAtw1", {"Status": "completed"}, "ACtest")]